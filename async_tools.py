@@ -0,0 +1,188 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Callable
+
+from book_helpers import BookTools
+from models import Book
+from storage import BaseStorage, JsonStorage
+
+
+class AsyncBookTools:
+    """  Асинхронный интерфейс BookTools для сервисов на asyncio: загрузка, сохранение, поиск и изменения - корутины.
+        Все корутины одного экземпляра работают с одним каталогом в памяти.
+
+        - Работа с диском (загрузка, сохранение, запросы SqliteStorage) выполняется в отдельном потоке, цикл событий
+        при этом не блокируется. Поток один, поэтому хранилище никогда не используется из двух потоков сразу
+        (кроме чтения каталога JsonStorage во время сохранения - оба потока его только читают).
+        - Каталог JsonStorage находится в памяти, поэтому поиск и изменения выполняются сразу в цикле событий.
+        - Хранилище работает в режиме отложенной записи. Сохранение откладывается до паузы в изменениях
+        save_delay секунд, но не дольше max_save_delay секунд от первого несохранённого изменения.
+        - Изменения ждут окончания идущего сохранения, чтение - нет. На время загрузки ждут все.
+        - Каталог и страницы каталога проверяют, не изменён ли файл извне, в общем пуле потоков (обращение к диску
+        не выполняется в цикле событий и не ждёт сохранения в потоке работы с диском). Изменённый файл
+        перезагружается через load().
+
+        Использование:
+            book_tools = await AsyncBookTools.open(storage=storage)
+            ...
+            await book_tools.close()
+    """
+    def __init__(self, book_tools: BookTools, executor: ThreadPoolExecutor, save_delay: float = 0.5,
+                 max_save_delay: float = 5.0) -> None:
+        """ Инициализация. Создаётся через AsyncBookTools.open().
+
+            :param book_tools: загруженные инструменты каталога
+            :param executor: поток для работы с диском
+            :param save_delay: пауза в изменениях, после которой они сохраняются, в секундах
+            :param max_save_delay: максимальная задержка сохранения первого изменения, в секундах
+        """
+        self.book_tools = book_tools
+        self.storage = book_tools.storage
+        self.executor = executor
+        self.save_delay = save_delay
+        self.max_save_delay = max_save_delay
+        # Каталог JsonStorage в памяти - к нему можно обращаться из цикла событий без потока
+        self.in_memory = isinstance(self.storage, JsonStorage)
+        self.write_lock = asyncio.Lock()
+        self.ready = asyncio.Event()
+        self.ready.set()
+        self.pending = 0
+        self.saves = 0
+        self.last_change = 0.0
+        self.save_task = None
+
+    @classmethod
+    async def open(cls, storage: BaseStorage | None = None, journal: bool = False, cache_size: int = 128,
+                   save_delay: float = 0.5, max_save_delay: float = 5.0) -> 'AsyncBookTools':
+        """  Создание и загрузка каталога в потоке работы с диском.
+
+            :param storage: хранилище книг, по умолчанию JsonStorage с файлом data.json
+            :param journal: если True - JsonStorage пишет изменения в журнал data.journal
+            :param cache_size: количество запоминаемых результатов поиска, 0 - без кэша
+            :param save_delay: пауза в изменениях, после которой они сохраняются, в секундах
+            :param max_save_delay: максимальная задержка сохранения первого изменения, в секундах
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="book-tools-io")
+
+        def open_tools() -> BookTools:
+            book_tools = BookTools(storage=storage, journal=journal, cache_size=cache_size)
+            # Файл дочитывается сразу: потоковая загрузка меняет каталог при чтении
+            book_tools.storage.count()
+            book_tools.storage.deferred = True
+            return book_tools
+
+        book_tools = await asyncio.get_running_loop().run_in_executor(executor, open_tools)
+        return cls(book_tools, executor, save_delay=save_delay, max_save_delay=max_save_delay)
+
+    async def run_io(self, func: Callable, *args) -> Any:
+        """  Вызов функции в потоке работы с диском. """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def read(self, func: Callable, *args) -> Any:
+        """  Чтение: сразу в цикле событий для каталога в памяти, иначе в потоке работы с диском. """
+        await self.ready.wait()
+        if self.in_memory:
+            return func(*args)
+        return await self.run_io(func, *args)
+
+    async def write(self, func: Callable, *args) -> Any:
+        """  Изменение каталога с отложенным сохранением. Ждёт окончания идущего сохранения. """
+        await self.ready.wait()
+        async with self.write_lock:
+            result = func(*args) if self.in_memory else await self.run_io(func, *args)
+            self.pending += 1
+            self.last_change = asyncio.get_running_loop().time()
+        if self.save_task is None or self.save_task.done():
+            self.save_task = asyncio.create_task(self.delayed_save())
+        return result
+
+    async def delayed_save(self) -> None:
+        """  Сохранение после паузы в изменениях save_delay, но не позже max_save_delay от первого изменения. """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_save_delay
+        while (wait := min(self.last_change + self.save_delay, deadline) - loop.time()) > 0:
+            await asyncio.sleep(wait)
+        await self.save()
+
+    async def save(self) -> None:
+        """  Сохранение всех изменений в потоке работы с диском. """
+        async with self.write_lock:
+            if not self.pending:
+                return
+            self.pending = 0
+            await self.run_io(self.storage.save)
+            self.saves += 1
+
+    async def load(self) -> None:
+        """  Повторная загрузка каталога с диска. Несохранённые изменения теряются. """
+        async with self.write_lock:
+            self.ready.clear()
+            try:
+                def reload() -> None:
+                    self.book_tools.reload()
+                    self.storage.count()
+                    self.storage.deferred = True
+
+                await self.run_io(reload)
+                self.pending = 0
+            finally:
+                self.ready.set()
+
+    async def close(self) -> None:
+        """  Сохранение оставшихся изменений и остановка потока работы с диском. """
+        if self.save_task is not None and not self.save_task.done():
+            self.save_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.save_task
+        await self.save()
+        self.storage.deferred = False
+        self.executor.shutdown()
+
+    async def check_changes(self) -> None:
+        """  Перезагрузка каталога, если файл изменён извне. """
+        if await asyncio.to_thread(self.storage.is_changed):
+            await self.load()
+
+    async def get_catalog(self) -> list[Book]:
+        """  Каталог. Если файл изменён извне - сначала перезагружается. """
+        await self.check_changes()
+        return await self.read(self.storage.get_books)
+
+    async def get_page(self, page: int, page_size: int) -> tuple[list[Book], bool]:
+        """  Страница каталога. Если файл изменён извне - сначала перезагружается. """
+        await self.check_changes()
+        return await self.read(self.book_tools.read_page, page, page_size)
+
+    async def get_book(self, book_id: int) -> Book | None:
+        return await self.read(self.book_tools.get_book, book_id)
+
+    async def search_books(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book] | None:
+        return await self.read(self.book_tools.search_books, query, search_fields, strong)
+
+    async def search_range(self, field: str, low=None, high=None) -> list[Book]:
+        return await self.read(self.book_tools.search_range, field, low, high)
+
+    async def search_prefix(self, field: str, prefix: str) -> list[Book]:
+        return await self.read(self.book_tools.search_prefix, field, prefix)
+
+    async def search_fuzzy(self, query: str, limit: int = 20) -> list[Book]:
+        return await self.read(self.book_tools.search_fuzzy, query, limit)
+
+    async def get_status_counts(self) -> dict[str, int]:
+        return await self.read(self.book_tools.get_status_counts)
+
+    async def get_books_by_status(self, status: str) -> list[Book]:
+        return await self.read(self.book_tools.get_books_by_status, status)
+
+    async def add_book(self, title: str, author: str, year: str) -> Book:
+        return await self.write(self.book_tools.add_book, title, author, year)
+
+    async def add_books(self, book_values: list[tuple[str, str, str, str]]) -> int:
+        return await self.write(self.book_tools.add_books, book_values)
+
+    async def remove_book(self, book_id: int) -> None:
+        await self.write(self.book_tools.remove_book, book_id)
+
+    async def update_book(self, book_object: Book, field: str, value: str) -> None:
+        await self.write(self.book_tools.update_book, book_object, field, value)
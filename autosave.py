@@ -0,0 +1,119 @@
+import atexit
+import os
+import signal
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Импорт для проверки типов
+    from book_helpers import BookTools
+
+FLUSH_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+class AutoSaver:
+    """  Автосохранение изменений BookTools. Сохраняются только изменения с прошлого сохранения
+        (BookTools.flush_changes), поэтому частое сохранение не требует перезаписи всего файла данных.
+
+        Изменения сохраняются:
+        - каждые interval секунд, если они есть (фоновый поток)
+        - после every изменений (в потоке, который сделал изменение)
+        - при завершении интерпретатора (atexit), в том числе по сигналам SIGINT (Ctrl+C) и SIGTERM
+
+        Обработчик сигнала ничего не сохраняет: сигнал мог прервать изменение каталога или чтение хранилища.
+        Он передаёт сигнал прежнему обработчику (для SIGINT - KeyboardInterrupt), а SIGTERM по умолчанию
+        превращает в SystemExit, чтобы сработал atexit; процесс затем завершается сигналом, как без автосохранения.
+        Если сигнал пришёл во время изменения (BookTools.changing), он обрабатывается после изменения.
+    """
+    def __init__(self, book_tools: 'BookTools', interval: float = 0.0, every: int = 0) -> None:
+        """ Инициализация.
+
+            :param book_tools: инструменты каталога
+            :param interval: период сохранения в секундах, 0 - без фонового потока
+            :param every: количество изменений, после которого они сохраняются, 0 - без ограничения
+        """
+        self.book_tools = book_tools
+        self.interval = interval
+        self.every = every
+        self.saves = 0
+        self.last_error = None
+        self.stopped = threading.Event()
+        self.thread = None
+        self.previous_handlers = {}
+        # Сигнал, ожидающий конца изменения каталога, и сигнал, которым завершится процесс после сохранения
+        self.pending_signal = None
+        self.exit_signal = None
+
+    def start(self) -> None:
+        """  Запуск фонового потока и установка обработчиков сигналов и atexit. """
+        if self.interval > 0:
+            self.thread = threading.Thread(target=self.save_loop, name="book-tools-autosave", daemon=True)
+            self.thread.start()
+        # Обработчики сигналов можно установить только из главного потока
+        if threading.current_thread() is threading.main_thread():
+            for signal_number in FLUSH_SIGNALS:
+                self.previous_handlers[signal_number] = signal.signal(signal_number, self.handle_signal)
+        atexit.register(self.flush_on_exit)
+
+    def stop(self) -> None:
+        """  Остановка фонового потока, снятие обработчиков и сохранение оставшихся изменений. """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        for signal_number, handler in self.previous_handlers.items():
+            signal.signal(signal_number, handler)
+        self.previous_handlers.clear()
+        atexit.unregister(self.flush_on_exit)
+        self.flush()
+
+    def save_loop(self) -> None:
+        """  Фоновый поток: сохранение изменений каждые interval секунд. Ошибка сохранения не останавливает поток:
+        она выводится в stderr, изменения останутся несохранёнными до следующей попытки.
+        """
+        while not self.stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as error:
+                self.last_error = error
+                print(f"Ошибка автосохранения: {error!r}", file=sys.stderr)
+
+    def notify_change(self) -> None:
+        """  Вызывается BookTools после каждого изменения. """
+        if self.every and self.book_tools.changes >= self.every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.book_tools.flush_changes():
+            self.saves += 1
+
+    def flush_on_exit(self) -> None:
+        """  Сохранение изменений при завершении интерпретатора. Если завершение вызвано сигналом SIGTERM
+        с обработкой по умолчанию, процесс затем завершается этим сигналом.
+        """
+        self.flush()
+        if self.exit_signal is not None:
+            signal.signal(self.exit_signal, signal.SIG_DFL)
+            os.kill(os.getpid(), self.exit_signal)
+
+    def handle_signal(self, signal_number: int, frame) -> None:
+        """  Обработчик SIGINT и SIGTERM: сигнал обрабатывается сразу или, если главный поток изменяет каталог,
+        после изменения (raise_signal).
+        """
+        self.pending_signal = signal_number
+        if not self.book_tools.is_changing():
+            self.raise_signal()
+
+    def raise_signal(self) -> None:
+        """  Обработка отложенного сигнала прежним обработчиком. Вызывается только вне изменения каталога. """
+        signal_number = self.pending_signal
+        if signal_number is None or threading.current_thread() is not threading.main_thread():
+            return
+        self.pending_signal = None
+        previous = self.previous_handlers.get(signal_number, signal.SIG_DFL)
+        if callable(previous):
+            previous(signal_number, None)
+        elif previous == signal.SIG_DFL:
+            # Изменения сохранит flush_on_exit, он же завершит процесс сигналом
+            self.exit_signal = signal_number
+            raise SystemExit(128 + signal_number)
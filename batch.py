@@ -0,0 +1,158 @@
+import time
+from typing import Iterable, Iterator, TextIO
+
+from book_helpers import BookTools, Book
+from bulk_io import SCALAR_TYPES, iter_records
+from models import STATUSES
+from validators import validate_form_fields
+
+# Поля книги, которые можно менять командой update. id не меняется: на него ссылаются следующие команды
+UPDATE_FIELDS = ("title", "author", "year", "status")
+SEARCH_FIELDS = ["title", "author", "year"]
+
+
+def iter_commands(command_file: TextIO, file_format: str = "jsonl") -> Iterator[tuple[int, dict | str]]:
+    """  Потоковое чтение команд пакетного режима. Отдаёт пары (номер строки, команда). Если строку не удалось
+    разобрать, вместо команды отдаётся текст ошибки, чтобы пакет продолжил выполнение.
+
+        Форматы:
+        - jsonl: одна команда на строку, например {"op": "add", "title": "...", "author": "...", "year": "1999"}
+        - csv: первая строка - заголовок с колонками op, id, title, author, year, field, value, query, fields, strong.
+        Пустые ячейки не учитываются, поля поиска в колонке fields перечисляются через ';'
+
+        :param command_file: открытый текстовый файл команд
+        :param file_format: формат файла: jsonl или csv
+    """
+    for line_number, command in iter_records(command_file, file_format):
+        if file_format == "csv" and not isinstance(command, str) and "fields" in command:
+            command["fields"] = command["fields"].split(";")
+        yield line_number, command
+
+
+class BatchReport:
+    """  Итоги выполнения пакета команд.
+
+        Атрибуты:
+            operations: количество выполненных команд
+            errors: список пар (номер строки, текст ошибки) невыполненных команд
+            elapsed: время выполнения в секундах
+    """
+    def __init__(self) -> None:
+        self.operations = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (f"Выполнено команд: {self.operations}, ошибок: {len(self.errors)}, "
+                f"время: {self.elapsed:.2f} с, {self.ops_per_second:.0f} оп/с")
+
+
+class BatchRunner:
+    """  Пакетный режим: команды add / update / remove / search применяются напрямую через BookTools, без экранов.
+
+        Данные проверяются теми же правилами validate_form_fields, что и формы приложения. Запись в хранилище
+        откладывается: изменения сохраняются один раз в конце пакета или каждые save_every команд.
+    """
+    def __init__(self, book_tools: BookTools, save_every: int = 0, output: TextIO | None = None) -> None:
+        """ Инициализация пакетного режима.
+
+            :param book_tools: инструменты для работы с книгами
+            :param save_every: сохранять изменения каждые N команд, 0 - только в конце пакета
+            :param output: файл для вывода результатов поиска, None - результаты не выводятся
+        """
+        self.book_tools = book_tools
+        self.save_every = save_every
+        self.output = output
+
+    def run(self, commands: Iterable[tuple[int, dict | str]]) -> BatchReport:
+        """  Выполнение пакета команд. Ошибочная команда пропускается и попадает в отчёт.
+
+            :param commands: пары (номер строки, команда или текст ошибки разбора), см. iter_commands()
+        """
+        report = BatchReport()
+        start = time.perf_counter()
+        with self.book_tools.storage.deferred_writes():
+            for line_number, command in commands:
+                try:
+                    if isinstance(command, str):
+                        raise ValueError(command)
+                    self.apply(command, line_number)
+                except ValueError as error:
+                    report.errors.append((line_number, str(error)))
+                    continue
+
+                report.operations += 1
+                if self.save_every and report.operations % self.save_every == 0:
+                    self.book_tools.save_book_list()
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def apply(self, command: dict, line_number: int = 0) -> None:
+        """  Выполнение одной команды. Ошибки данных - ValueError с текстом для отчёта.
+
+            :param command: команда
+            :param line_number: номер строки команды, выводится с результатами поиска
+        """
+        match command.get("op"):
+            case "add":
+                values = [self.get_value(command, field) for field in ("title", "author", "year")]
+                self.book_tools.add_book(*values)
+            case "update":
+                book = self.get_book(command)
+                field = command.get("field")
+                if field not in UPDATE_FIELDS:
+                    raise ValueError(f"поле для обновления должно быть одним из: {', '.join(UPDATE_FIELDS)}")
+                value = self.get_value(command, "value", field)
+                if field == "status" and value not in STATUSES:
+                    raise ValueError(f"статус должен быть одним из: {', '.join(STATUSES)}")
+                self.book_tools.update_book(book, field, value)
+            case "remove":
+                self.book_tools.remove_book(self.get_book(command).id)
+            case "search":
+                search_fields = command.get("fields", SEARCH_FIELDS)
+                if (not isinstance(search_fields, list) or not all(isinstance(field, str) for field in search_fields)
+                        or not set(search_fields) <= set(Book.fields)):
+                    raise ValueError(f"поля поиска должны быть списком из: {', '.join(Book.fields)}")
+                result = self.book_tools.search_books(self.get_value(command, "query"), search_fields,
+                                                      strong=str(command.get("strong", "")).lower() in ("1", "true"))
+                self.print_result(line_number, result or [])
+            case op:
+                raise ValueError(f"неизвестная команда: {op}")
+
+    @staticmethod
+    def get_value(command: dict, key: str, field: str | None = None) -> str:
+        """  Значение из команды, проверенное правилами формы.
+
+            :param command: команда
+            :param key: ключ значения в команде
+            :param field: поле формы для проверки, по умолчанию совпадает с ключом
+        """
+        if key not in command:
+            raise ValueError(f"не указано значение {key}")
+        # null и вложенные значения не превращаются в строки "None" и "[...]"
+        if type(command[key]) not in SCALAR_TYPES:
+            raise ValueError(f"значение {key} должно быть строкой или числом")
+        value = str(command[key])
+        success, error = validate_form_fields(field or key, value)
+        if not success:
+            raise ValueError(error.strip("\n -"))
+        return value
+
+    def get_book(self, command: dict) -> Book:
+        """  Книга по id из команды. """
+        book_id = int(self.get_value(command, "id"))
+        book = self.book_tools.get_book(book_id)
+        if book is None:
+            raise ValueError(f"книга с id {book_id} не найдена")
+        return book
+
+    def print_result(self, line_number: int, book_list: list[Book]) -> None:
+        """  Вывод результатов поиска одной записью. """
+        if self.output is None:
+            return
+        lines = [f"[{line_number}] Найдено книг: {len(book_list)}", *(f"  {book!r}" for book in book_list)]
+        self.output.write("\n".join(lines) + "\n")
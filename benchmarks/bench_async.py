@@ -0,0 +1,67 @@
+""" Бенчмарк AsyncBookTools: пропускная способность поиска при разном количестве одновременных клиентов-корутин,
+    работающих с одним каталогом в памяти, в том числе при доле изменений с отложенным сохранением.
+
+    Кэш результатов поиска отключён, чтобы измерять сам поиск.
+
+    Запуск:
+        python -m benchmarks.bench_async
+        python -m benchmarks.bench_async --size 100000 --clients 1 10 100 1000 --write-ratio 0.05
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from async_tools import AsyncBookTools
+from benchmarks.catalog import make_books
+from storage import JsonStorage
+
+QUERIES = ["толстой", "Анна", "dick", "мастер маргарита", "lem", "не найдено"]
+FIELDS = ["title", "author", "year"]
+
+
+async def run_clients(book_tools: AsyncBookTools, clients: int, requests: int, write_ratio: float) -> float:
+    """  Запуск клиентов, каждый выполняет свою долю запросов. Возвращает запросы в секунду. """
+    async def client(number: int) -> None:
+        rnd = random.Random(number)
+        for _ in range(requests // clients):
+            if rnd.random() < write_ratio:
+                await book_tools.add_book(f"Книга клиента {number}", "Автор", "2000")
+            else:
+                await book_tools.search_books(rnd.choice(QUERIES), FIELDS)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    return requests // clients * clients / (time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace, file_path: str) -> None:
+    JsonStorage.write_snapshot([book.to_dict() for book in make_books(args.size)], file_path)
+    book_tools = await AsyncBookTools.open(storage=JsonStorage(file_path), cache_size=0, save_delay=0.05)
+
+    print(f"Книг: {args.size}, запросов: {args.requests}, доля изменений: {args.write_ratio}")
+    print(f"{'клиентов':>9} {'запросов/с':>11}")
+    for clients in args.clients:
+        throughput = await run_clients(book_tools, clients, args.requests, args.write_ratio)
+        print(f"{clients:>9} {throughput:>11.0f}")
+
+    await book_tools.close()
+    print(f"Сохранений: {book_tools.saves}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asyncio.run(run(args, os.path.join(temp_dir, "data.json")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+""" Бенчмарк повторного рендера каталога: чтение data.json на каждый рендер против кэша BookTools.get_catalog.
+
+    Запуск:
+        python -m benchmarks.bench_catalog
+        python -m benchmarks.bench_catalog --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.catalog import make_books
+from book_helpers import BookTools
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--renders", type=int, default=20)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    print(f"{'книг':>10} {'размер, КБ':>11} {'чтение файла, мс':>17} {'кэш, мс':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            for size in args.sizes:
+                book_tools = BookTools()
+                book_tools.storage.set_books(make_books(size))
+                book_tools.save_book_list()
+
+                # Исходный рендер каталога: два полных чтения data.json
+                start = time.perf_counter()
+                for _ in range(args.renders):
+                    book_tools.get_book_list()
+                    book_tools.get_book_list()
+                file_time = (time.perf_counter() - start) / args.renders * 1000
+
+                start = time.perf_counter()
+                for _ in range(args.renders):
+                    book_tools.get_catalog()
+                cache_time = (time.perf_counter() - start) / args.renders * 1000
+
+                file_size = os.path.getsize("data.json") // 1024
+                print(f"{size:>10} {file_size:>11} {file_time:>17.2f} {cache_time:>9.4f}")
+                os.remove("data.json")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
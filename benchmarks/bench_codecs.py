@@ -0,0 +1,77 @@
+""" Бенчмарк форматов data.json: размер файла, время загрузки и сохранения для отступов и компактного JSON,
+    без сжатия, с gzip и lzma.
+
+    Загрузка - JsonStorage.load() и дочитывание всего файла (count), первая страница - загрузка до первых 20 книг,
+    сохранение - полная перезапись JsonStorage.save(). Берётся лучшее время из --repeat запусков, файлы читаются
+    из кэша ОС, поэтому выигрыш от меньшего файла на медленном диске или сетевой папке будет больше.
+
+    Запуск:
+        python -m benchmarks.bench_codecs
+        python -m benchmarks.bench_codecs --sizes 10000 100000 1000000 --repeat 1
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.catalog import write_catalog
+from storage import JsonStorage
+
+# Имя файла и компактный JSON
+CODECS = [
+    ("data.json", False),
+    ("data.json", True),
+    ("data.json.gz", False),
+    ("data.json.gz", True),
+    ("data.json.xz", False),
+    ("data.json.xz", True),
+]
+
+
+def best_time(action, repeat: int) -> float:
+    """  Лучшее время action() в миллисекундах из repeat запусков. """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def load_storage(file_path: str, page_only: bool = False) -> JsonStorage:
+    storage = JsonStorage(file_path)
+    storage.load()
+    if page_only:
+        storage.get_page(0, 20)
+    else:
+        storage.count()
+    return storage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'книг':>9} {'файл':>13} {'компактный':>11} {'размер, МБ':>11} {'1 стр., мс':>11} "
+          f"{'загрузка, мс':>13} {'сохранение, мс':>15}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for file_name, compact in CODECS:
+                file_path = os.path.join(temp_dir, file_name)
+                write_catalog(file_path, size, compact=compact)
+                first_page = best_time(lambda: load_storage(file_path, page_only=True), args.repeat)
+                load_time = best_time(lambda: load_storage(file_path), args.repeat)
+
+                storage = load_storage(file_path)
+                storage.compact = compact
+                save_time = best_time(storage.save, args.repeat)
+                print(f"{size:>9} {file_name:>13} {'да' if compact else 'нет':>11} "
+                      f"{os.path.getsize(file_path) / 2 ** 20:>11.2f} {first_page:>11.2f} {load_time:>13.1f} "
+                      f"{save_time:>15.1f}")
+                os.remove(file_path)
+
+
+if __name__ == "__main__":
+    main()
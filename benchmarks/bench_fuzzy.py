@@ -0,0 +1,42 @@
+""" Бенчмарк нечёткого поиска FuzzyIndex: время построения индекса и задержка запросов с опечатками
+    на каталогах разного размера.
+
+    Запуск:
+        python -m benchmarks.bench_fuzzy
+        python -m benchmarks.bench_fuzzy --sizes 10000 100000
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_books
+from fuzzy_index import FuzzyIndex
+
+QUERIES = ["толстй", "Достаевский", "маргарито", "шекспир", "dikens", "мастер маргарита 12", "не найдено"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'книг':>10} {'индексация, с':>14} {'среднее, мс':>12} {'максимум, мс':>13}")
+    for size in args.sizes:
+        book_list = make_books(size)
+
+        start = time.perf_counter()
+        index = FuzzyIndex(book_list)
+        build_time = time.perf_counter() - start
+
+        timings = []
+        for query in QUERIES:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                index.search(query)
+            timings.append((time.perf_counter() - start) / args.repeat * 1000)
+
+        print(f"{size:>10} {build_time:>14.2f} {sum(timings) / len(timings):>12.2f} {max(timings):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+""" Бенчмарк потокового импорта: скорость в строках в секунду и пиковая память (RSS) при импорте файла JSON-lines.
+
+    Режимы - хранилище, в которое идёт импорт:
+    - sqlite: SqliteStorage, каталог не держится в памяти - память не зависит от размера файла
+    - columnar: JsonStorage --columnar, в памяти остаётся только компактный каталог
+    - json: JsonStorage, каталог объектами Book с полным индексом поиска (около 3 КБ на книгу, на 1 млн книг
+    нужно несколько ГБ памяти, поэтому по умолчанию не запускается)
+
+    Генерация файла и каждый режим запускаются в отдельных процессах, чтобы пиковая память не смешивалась.
+
+    Запуск:
+        python -m benchmarks.bench_import
+        python -m benchmarks.bench_import --size 100000 --modes sqlite columnar json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.catalog import make_books
+from book_helpers import BookTools
+from bulk_io import import_books
+from storage import JsonStorage, SqliteStorage
+
+MODES = ["sqlite", "columnar", "json"]
+
+
+def write_records(file_path: str, size: int) -> None:
+    """  Запись синтетического файла импорта в формате JSON-lines. """
+    with open(file_path, "w", encoding="utf-8") as record_file:
+        for book in make_books(size):
+            record_file.write(json.dumps({"title": book.title, "author": book.author, "year": book.year,
+                                          "status": book.status}, ensure_ascii=False) + "\n")
+
+
+def run_mode(mode: str, file_path: str, temp_dir: str) -> None:
+    """  Импорт файла в хранилище выбранного режима. Печатает JSON с отчётом импорта и пиковым RSS. """
+    if mode == "sqlite":
+        storage = SqliteStorage(os.path.join(temp_dir, "data.db"))
+    else:
+        storage = JsonStorage(os.path.join(temp_dir, f"data_{mode}.json"), columnar=mode == "columnar")
+    book_tools = BookTools(storage=storage)
+    with open(file_path, "r", encoding="utf-8") as record_file:
+        report = import_books(book_tools, record_file)
+
+    assert not report.errors
+    print(json.dumps({"imported": report.imported, "rows_per_second": report.rows_per_second,
+                      "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["sqlite", "columnar"])
+    parser.add_argument("--mode", choices=MODES + ["write"], help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == "write":
+        write_records(args.file, args.size)
+        return
+    if args.mode:
+        run_mode(args.mode, args.file, os.path.dirname(args.file))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "import.jsonl")
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_import", "--mode", "write", "--file", file_path,
+                        "--size", str(args.size)], check=True)
+        print(f"Строк: {args.size}, размер файла: {os.path.getsize(file_path) // (1 << 20)} МБ")
+        print(f"{'режим':>10} {'строк/с':>10} {'пиковый RSS, МБ':>16}")
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_import", "--mode", mode, "--file", file_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:>10} {result['rows_per_second']:>10.0f} {result['max_rss_kb'] // 1024:>16}")
+
+
+if __name__ == "__main__":
+    main()
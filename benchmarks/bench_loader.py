@@ -0,0 +1,91 @@
+""" Бенчмарк загрузки большого data.json: время до первой страницы каталога и пиковая память (RSS).
+
+    Сравниваются:
+    - json.load: исходная загрузка через json.load и создание всех объектов Book
+    - stream: потоковая ленивая загрузка JsonStorage, читается только первая страница
+    - stream-full: потоковая загрузка всего файла с построением индексов
+
+    Генерация файла и каждый режим запускаются в отдельных процессах, чтобы пиковая память не смешивалась.
+
+    Запуск:
+        python -m benchmarks.bench_loader
+        python -m benchmarks.bench_loader --size 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.catalog import make_books
+from models import Book
+from storage import JsonStorage
+
+MODES = ["json.load", "stream", "stream-full"]
+PAGE_SIZE = 20
+
+
+def write_catalog(file_path: str, size: int) -> None:
+    """  Запись синтетического каталога в формате data.json. """
+    with open(file_path, "w", encoding="utf-8") as json_file:
+        json_file.write("[\n")
+        for book in make_books(size):
+            if book.id > 1:
+                json_file.write(",\n")
+            json_file.write(json.dumps(book.to_dict(), indent=4, ensure_ascii=False))
+        json_file.write("\n]")
+
+
+def run_mode(mode: str, file_path: str) -> None:
+    """  Загрузка каталога в выбранном режиме. Печатает JSON с временем до первой страницы и пиковым RSS. """
+    start = time.perf_counter()
+    if mode == "json.load":
+        with open(file_path, "r", encoding="utf-8") as json_file:
+            book_list = [Book(**item) for item in json.load(json_file)]
+        page = book_list[:PAGE_SIZE]
+    else:
+        storage = JsonStorage(file_path)
+        storage.load()
+        if mode == "stream-full":
+            storage.count()
+        page = storage.get_page(0, PAGE_SIZE)
+    elapsed = time.perf_counter() - start
+
+    assert len(page) == PAGE_SIZE
+    print(json.dumps({"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=MODES + ["write"], help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == "write":
+        write_catalog(args.file, args.size)
+        return
+    if args.mode:
+        run_mode(args.mode, args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "data.json")
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_loader", "--mode", "write", "--file", file_path,
+                        "--size", str(args.size)], check=True)
+        print(f"Книг: {args.size}, размер файла: {os.path.getsize(file_path) // (1 << 20)} МБ")
+        print(f"{'режим':>12} {'первая страница, с':>19} {'пиковый RSS, МБ':>16}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_loader", "--mode", mode, "--file", file_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:>12} {result['seconds']:>19.3f} {result['max_rss_kb'] // 1024:>16}")
+
+
+if __name__ == "__main__":
+    main()
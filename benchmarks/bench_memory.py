@@ -0,0 +1,88 @@
+""" Бенчмарк памяти на одну книгу: объект с __dict__ (исходный Book), Book со __slots__ и ColumnarCatalog,
+    а также всё хранилище JsonStorage с индексами в обычном режиме и в режиме --columnar.
+
+    Учитывается вся память каталога, включая строки. Память считается через tracemalloc.
+
+    Запуск:
+        python -m benchmarks.bench_memory
+        python -m benchmarks.bench_memory --size 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks.catalog import make_books
+from models import Book, ColumnarCatalog
+from storage import JsonStorage
+
+
+class DictBook:
+    """  Исходное представление книги: обычный класс со словарём атрибутов. """
+    def __init__(self, id: int, title: str, author: str, year: str, status: str = "В наличии") -> None:
+        self.id = id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = status
+
+
+def load_catalog(kind: str, json_content: list[dict]):
+    """  Построение каталога id -> книга выбранного вида из данных data.json. """
+    if kind == "dict":
+        return {item["id"]: DictBook(**item) for item in json_content}
+    if kind == "slots":
+        return {item["id"]: Book(**item) for item in json_content}
+    return ColumnarCatalog(Book(**item) for item in json_content)
+
+
+def measure_storage(columnar: bool, json_text: str) -> int:
+    """  Память загруженного хранилища JsonStorage в байтах: каталог, индекс по id и индекс поиска. """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "data.json")
+        with open(file_path, "w", encoding="utf-8") as json_file:
+            json_file.write(json_text)
+        gc.collect()
+        tracemalloc.start()
+        storage = JsonStorage(file_path, columnar=columnar)
+        storage.load()
+        storage.ensure_loaded()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del storage
+    return size
+
+
+def measure(kind: str, json_text: str) -> int:
+    """  Память каталога в байтах. Строки разбираются из JSON заново, как при загрузке data.json. """
+    gc.collect()
+    tracemalloc.start()
+    json_content = json.loads(json_text)
+    catalog = load_catalog(kind, json_content)
+    del json_content
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del catalog
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    json_text = json.dumps([book.to_dict() for book in make_books(args.size)], ensure_ascii=False)
+    print(f"Книг: {args.size}")
+    print(f"{'представление':>16} {'байт на книгу':>14}")
+    for kind in ("dict", "slots", "columnar"):
+        print(f"{kind:>16} {measure(kind, json_text) / args.size:>14.1f}")
+    for kind, columnar in (("storage", False), ("storage-columnar", True)):
+        print(f"{kind:>16} {measure_storage(columnar, json_text) / args.size:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+""" Бенчмарк поиска по вхождению: полный перебор против инвертированного индекса SearchIndex.
+
+    Запуск:
+        python -m benchmarks.bench_search
+        python -m benchmarks.bench_search --sizes 10000 100000
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_books
+from models import Book
+from search_index import SearchIndex
+
+QUERIES = ["толстой", "Анна", "dick", "19", "мастер маргарита", "lem", "не найдено"]
+FIELDS = ["title", "author", "year"]
+
+
+def linear_search(book_list: list[Book], query: str, search_fields: list[str]) -> list[Book]:
+    """  Поиск по вхождению полным перебором (исходная реализация BookTools.search_books). """
+    return [item for item in book_list
+            if any(query.lower() in str(getattr(item, field)).lower() for field in search_fields)]
+
+
+def measure(func, repeat: int) -> float:
+    """  Среднее время вызова функции в миллисекундах. """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'книг':>10} {'индексация, с':>14} {'перебор, мс':>12} {'индекс, мс':>11} {'ускорение':>10}")
+    for size in args.sizes:
+        book_list = make_books(size)
+
+        start = time.perf_counter()
+        index = SearchIndex()
+        for book in book_list:
+            index.add_book(book)
+        build_time = time.perf_counter() - start
+
+        linear_time = indexed_time = 0.0
+        for query in QUERIES:
+            expected = [book.id for book in linear_search(book_list, query, FIELDS)]
+            assert index.search(query, FIELDS) == expected, query
+            linear_time += measure(lambda: linear_search(book_list, query, FIELDS), args.repeat)
+            indexed_time += measure(lambda: index.search(query, FIELDS), args.repeat)
+
+        linear_time /= len(QUERIES)
+        indexed_time /= len(QUERIES)
+        print(f"{size:>10} {build_time:>14.2f} {linear_time:>12.2f} {indexed_time:>11.2f} "
+              f"{linear_time / indexed_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+""" Бенчмарк бинарного снимка (BinaryStorage) против data.json (JsonStorage): холодный старт и случайный доступ.
+
+    Холодный старт - время от создания хранилища до ответа: первая страница каталога, книга со случайным id
+    (для data.json файл разбирается до этой книги) и подсчёт всех книг. Случайный доступ - среднее время get_book
+    по случайным id и чтения страницы из середины каталога на уже открытом хранилище. Файлы читаются из кэша ОС.
+
+    Запуск:
+        python -m benchmarks.bench_snapshot
+        python -m benchmarks.bench_snapshot --sizes 10000 100000 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.catalog import write_catalog
+from binary_snapshot import write_binary_snapshot
+from storage import BaseStorage, BinaryStorage, JsonStorage
+
+
+def cold_start(make_storage, action) -> float:
+    """  Время в миллисекундах от создания и загрузки хранилища до результата action(storage). """
+    # Освобождение хранилищ прошлых замеров не должно попасть в замер
+    gc.collect()
+    start = time.perf_counter()
+    storage = make_storage()
+    storage.load()
+    action(storage)
+    return (time.perf_counter() - start) * 1000
+
+
+def random_access(storage: BaseStorage, book_ids: list[int], size: int, page_size: int = 20) -> tuple[float, float]:
+    """  Среднее время get_book и чтения страницы из середины каталога в миллисекундах. """
+    start = time.perf_counter()
+    for book_id in book_ids:
+        storage.get_book(book_id)
+    get_time = (time.perf_counter() - start) / len(book_ids) * 1000
+
+    start = time.perf_counter()
+    for _ in range(100):
+        storage.get_page(size // 2, page_size)
+    page_time = (time.perf_counter() - start) / 100 * 1000
+    return get_time, page_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'книг':>9} {'формат':>7} {'файл, МБ':>9} {'1 стр., мс':>11} {'книга, мс':>10} {'все, мс':>9} "
+          f"{'get_book, мкс':>14} {'стр. в середине, мс':>20}")
+    for size in args.sizes:
+        rnd = random.Random(size)
+        book_ids = [rnd.randint(1, size) for _ in range(args.lookups)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = os.path.join(temp_dir, "data.json")
+            binary_path = os.path.join(temp_dir, "data.bin")
+            write_catalog(json_path, size)
+            write_binary_snapshot(JsonStorage(json_path).iter_file_books(), binary_path)
+
+            for name, file_path, storage_class in (("json", json_path, JsonStorage),
+                                                   ("binary", binary_path, BinaryStorage)):
+                make_storage = lambda: storage_class(file_path)
+                first_page = cold_start(make_storage, lambda storage: storage.get_page(0, 20))
+                one_book = cold_start(make_storage, lambda storage: storage.get_book(book_ids[0]))
+                all_books = cold_start(make_storage, lambda storage: storage.count())
+
+                storage = make_storage()
+                storage.load()
+                storage.count()
+                get_time, page_time = random_access(storage, book_ids, size)
+                print(f"{size:>9} {name:>7} {os.path.getsize(file_path) / 2 ** 20:>9.1f} {first_page:>11.2f} "
+                      f"{one_book:>10.1f} {all_books:>9.1f} {get_time * 1000:>14.2f} {page_time:>20.3f}")
+                del storage
+
+
+if __name__ == "__main__":
+    main()
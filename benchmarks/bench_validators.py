@@ -0,0 +1,88 @@
+""" Микробенчмарк валидации полей книги: исходная функция с цепочкой if, валидатор по схеме
+    (FormValidator.validate на каждое значение) и проверка целыми колонками (FormValidator.validate_columns).
+
+    Проверяются поля title, author, year синтетического каталога, в том числе с некорректными значениями.
+
+    Запуск:
+        python -m benchmarks.bench_validators
+        python -m benchmarks.bench_validators --size 1000000
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_books
+from validators import FormValidator
+
+FIELDS = ("title", "author", "year")
+
+
+def legacy_validate_form_fields(field: str, value: str) -> tuple[bool, str]:
+    """  Исходная реализация валидации: цепочка сравнений названия поля, несколько вызовов isdigit() и int(). """
+    error = ""
+
+    if field == "id":
+        if not value.isdigit() or int(value) <= 0:
+            error = "\n--- Некорректный ввод: ID должен быть числом > 0 ---\n"
+            return False, error
+
+    if field == "title" or field == "author":
+        if len(value) < 3:
+            error = "\n--- Некорректный ввод: строка должна быть больше 2-х символов ---\n"
+            return False, error
+
+    if field == "year":
+        if not value.isdigit() or int(value) < 0 or int(value) > 2024:
+            error = "\n--- Некорректный ввод: год должен быть числом больше нуля, меньше 2025 ---\n"
+            return False, error
+
+    return True, error
+
+
+def make_columns(size: int) -> dict[str, list[str]]:
+    """  Колонки значений полей, каждое десятое значение некорректно. """
+    columns = {field: [] for field in FIELDS}
+    for book in make_books(size):
+        invalid = book.id % 10 == 0
+        columns["title"].append("Ab" if invalid else book.title)
+        columns["author"].append(book.author)
+        columns["year"].append("19x0" if invalid else book.year)
+    return columns
+
+
+def measure(function, columns: dict[str, list[str]]) -> float:
+    """  Время проверки всех колонок в секундах. """
+    start = time.perf_counter()
+    function(columns)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    columns = make_columns(args.size)
+    validator = FormValidator(max_year=2024)
+    variants = {
+        "legacy": lambda data: [[not legacy_validate_form_fields(field, value)[0] for value in values]
+                                for field, values in data.items()],
+        "schema": lambda data: [[not validator.validate(field, value)[0] for value in values]
+                                for field, values in data.items()],
+        "columns": validator.validate_columns,
+    }
+
+    # Проверяем что все варианты находят одни и те же ошибки
+    masks = [list(variant(columns).values()) if name == "columns" else variant(columns)
+             for name, variant in variants.items()]
+    assert all(mask == masks[0] for mask in masks)
+
+    values = args.size * len(FIELDS)
+    print(f"Значений: {values}")
+    print(f"{'вариант':>8} {'время, с':>9} {'нс на значение':>15}")
+    for name, variant in variants.items():
+        elapsed = min(measure(variant, columns) for _ in range(3))
+        print(f"{name:>8} {elapsed:>9.3f} {elapsed / values * 1e9:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
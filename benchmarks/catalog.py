@@ -0,0 +1,142 @@
+""" Синтетический каталог для бенчмарков: воспроизводимые по зерну книги с названиями и авторами на кириллице и
+    латинице, годами и статусами.
+
+    Генерация файла каталога (формат - по расширению: .json - как data.json, в том числе сжатый .json.gz или .json.xz,
+    .jsonl или .csv - для импорта):
+        python -m benchmarks.catalog --size 1000000 --output catalog.json
+        python -m benchmarks.catalog --size 1000000 --compact --output catalog.json.gz
+        python -m benchmarks.catalog --size 10000 --seed 1 --output books.csv
+"""
+import argparse
+import csv
+import json
+import os
+import random
+from typing import Iterator
+
+from models import Book, STATUSES
+from storage import JsonStorage, get_compression
+
+TITLE_WORDS = ["Война", "мир", "Преступление", "наказание", "Идиот", "Мастер", "Маргарита", "Тихий", "Дон", "Отцы",
+               "дети", "Мёртвые", "души", "Анна", "Каренина", "Great", "Expectations", "Pride", "Prejudice", "Moby",
+               "Dick", "Ulysses", "Odyssey", "Hamlet", "Dune", "Solaris", "Foundation", "Brave", "New", "World"]
+AUTHORS = ["Лев Толстой", "Фёдор Достоевский", "Михаил Булгаков", "Михаил Шолохов", "Иван Тургенев",
+           "Николай Гоголь", "Антон Чехов", "Charles Dickens", "Jane Austen", "Herman Melville", "James Joyce",
+           "Homer", "William Shakespeare", "Frank Herbert", "Stanisław Lem", "Isaac Asimov", "Aldous Huxley"]
+
+# Словари для названий и авторов, которых нет в списках выше
+CYRILLIC = {
+    "adjectives": ["Тихий", "Белая", "Старый", "Последний", "Тёмные", "Золотой", "Долгая", "Красное", "Северный",
+                   "Забытые", "Горячий", "Морская", "Дальний", "Весенние", "Чужая"],
+    "nouns": ["сад", "дорога", "город", "ночь", "берег", "дом", "зима", "река", "письма", "остров", "вечер",
+              "степь", "песня", "аллеи", "звезда"],
+    "first_names": ["Александр", "Мария", "Сергей", "Анна", "Дмитрий", "Ольга", "Николай", "Елена", "Андрей",
+                    "Татьяна", "Владимир", "Ирина", "Павел", "Наталья", "Юрий"],
+    "last_names": ["Иванов", "Смирнова", "Кузнецов", "Попова", "Соколов", "Лебедева", "Козлов", "Новикова",
+                   "Морозов", "Волкова", "Зайцев", "Павлова", "Семёнов", "Голубева", "Виноградов"],
+    "joins": ["и", "над", "за"],
+}
+LATIN = {
+    "adjectives": ["Silent", "White", "Old", "Last", "Dark", "Golden", "Long", "Red", "Northern", "Forgotten",
+                   "Hidden", "Broken", "Distant", "Quiet", "Wild"],
+    "nouns": ["Garden", "Road", "City", "Night", "Shore", "House", "Winter", "River", "Letters", "Island",
+              "Evening", "Field", "Song", "Mirror", "Star"],
+    "first_names": ["John", "Emily", "Michael", "Sarah", "David", "Laura", "Peter", "Anna", "Thomas", "Claire",
+                    "Robert", "Julia", "George", "Helen", "Mark"],
+    "last_names": ["Smith", "Johnson", "Brown", "Taylor", "Miller", "Wilson", "Moore", "Clark", "Walker", "Hall",
+                   "Young", "King", "Wright", "Green", "Baker"],
+    "joins": ["and", "of", "beyond"],
+}
+
+
+def make_title(rnd: random.Random, words: dict[str, list[str]]) -> str:
+    """  Название книги по одному из шаблонов. """
+    template = rnd.randrange(4)
+    if template == 0:
+        return f"{rnd.choice(words['adjectives'])} {rnd.choice(words['nouns'])}"
+    if template == 1:
+        return f"{rnd.choice(words['nouns']).capitalize()} {rnd.choice(words['joins'])} {rnd.choice(words['nouns'])}"
+    if template == 2:
+        return " ".join(rnd.choices(TITLE_WORDS, k=rnd.randint(1, 4)))
+    return rnd.choice(words['nouns']).capitalize()
+
+
+def iter_books(count: int, seed: int = 0, latin_share: float = 0.3) -> Iterator[Book]:
+    """  Потоковая генерация синтетического каталога: книги с id от 1 до count.
+
+        :param count: количество книг
+        :param seed: зерно генератора случайных чисел
+        :param latin_share: доля книг с названием и автором на латинице
+    """
+    rnd = random.Random(seed)
+    for book_id in range(1, count + 1):
+        words = LATIN if rnd.random() < latin_share else CYRILLIC
+        if rnd.random() < 0.2:
+            # Часть книг - известных авторов, по ним удобно проверять поиск
+            author = rnd.choice(AUTHORS)
+        else:
+            author = f"{rnd.choice(words['first_names'])} {rnd.choice(words['last_names'])}"
+        yield Book(
+            book_id,
+            f"{make_title(rnd, words)} {rnd.randint(1, 999)}",
+            author,
+            # Новых книг в каталоге больше, чем старых
+            str(round(2024 - rnd.triangular(0, 224, 0))),
+            # Выдана примерно каждая пятая книга
+            STATUSES[0] if rnd.random() < 0.8 else STATUSES[1],
+        )
+
+
+def make_books(count: int, seed: int = 0) -> list[Book]:
+    """  Синтетический каталог для бенчмарков.
+
+        :param count: количество книг
+        :param seed: зерно генератора случайных чисел
+    """
+    return list(iter_books(count, seed))
+
+
+def write_catalog(file_path: str, count: int, seed: int = 0, latin_share: float = 0.3, compact: bool = False) -> None:
+    """  Потоковая запись синтетического каталога в файл. Формат - по расширению: .json - массив в формате data.json
+    (.json.gz, .json.xz - сжатый), .csv - с заголовком title, author, year, status, иначе - JSON-lines.
+
+        :param file_path: путь к файлу
+        :param count: количество книг
+        :param seed: зерно генератора случайных чисел
+        :param latin_share: доля книг с названием и автором на латинице
+        :param compact: если True - data.json пишется компактным JSON
+    """
+    books = iter_books(count, seed, latin_share)
+    data_path = file_path[:len(file_path) - len(get_compression(file_path))]
+    if os.path.splitext(data_path)[1] == ".json":
+        JsonStorage.write_snapshot((book.to_dict() for book in books), file_path, compact)
+        return
+    with open(file_path, "w", encoding="utf-8", newline="") as catalog_file:
+        if file_path.endswith(".csv"):
+            writer = csv.writer(catalog_file)
+            writer.writerow(["title", "author", "year", "status"])
+            writer.writerows((book.title, book.author, book.year, book.status) for book in books)
+        else:
+            for book in books:
+                catalog_file.write(json.dumps(book.to_dict(), ensure_ascii=False) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latin-share", type=float, default=0.3)
+    parser.add_argument("--compact", action="store_true", help="data.json без отступов")
+    parser.add_argument("--output", default="catalog.json")
+    args = parser.parse_args()
+    if args.size < 0:
+        parser.error("--size не может быть отрицательным")
+    if not 0 <= args.latin_share <= 1:
+        parser.error("--latin-share должен быть от 0 до 1")
+
+    write_catalog(args.output, args.size, args.seed, args.latin_share, args.compact)
+    print(f"Записано книг: {args.size} в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+""" Воспроизводимый набор бенчмарков BookTools на синтетических каталогах разного размера.
+
+    Замеряется время операций приложения: get_book_list (чтение каталога с диска), save_book_list, search_books
+    (точный поиск, поиск по вхождению и поиск по id), add_book, remove_book и update_book. Каталог генерируется по
+    зерну, кэш результатов поиска отключён. Для каждой операции сохраняются минимум, медиана и среднее времени одного
+    вызова в миллисекундах.
+
+    Изменения замеряются так, как их выполняет приложение: в JsonStorage add_book и remove_book перезаписывают
+    data.json. С --deferred изменения выполняются в режиме отложенной записи - замеряется только работа в памяти.
+
+    Результаты выводятся таблицей и записываются в JSON (--output). Команда compare сравнивает два прогона по
+    медианам и отмечает регрессии - операции, ставшие медленнее на долю --threshold; при регрессиях код выхода 1.
+
+    Запуск:
+        python -m benchmarks.suite run --sizes 1000 10000 100000 --output results.json
+        python -m benchmarks.suite run --storage sqlite --sizes 1000000 --output sqlite.json
+        python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from benchmarks.catalog import write_catalog
+from book_helpers import BookTools
+from storage import BaseStorage, JsonStorage, SqliteStorage
+
+SEARCH_FIELDS = ["title", "author", "year"]
+STRICT_QUERIES = ["Лев Толстой", "Jane Austen", "1999", "Тихий сад 12", "не найдено"]
+QUERIES = ["толстой", "сад", "river", "19", "мастер маргарита", "не найдено"]
+
+
+def measure(func: Callable[[int], object], repeat: int) -> dict[str, float]:
+    """  Время одного вызова в миллисекундах: минимум, медиана и среднее по repeat вызовам.
+
+        :param func: замеряемая функция, получает номер вызова
+        :param repeat: количество вызовов
+    """
+    times = []
+    for number in range(repeat):
+        start = time.perf_counter()
+        func(number)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"runs": repeat, "min_ms": min(times), "median_ms": statistics.median(times),
+            "mean_ms": statistics.fmean(times)}
+
+
+def open_storage(storage_type: str, file_path: str, size: int, seed: int) -> BaseStorage:
+    """  Хранилище с синтетическим каталогом из size книг. """
+    json_path = f"{file_path}.json"
+    write_catalog(json_path, size, seed)
+    if storage_type == "json":
+        return JsonStorage(json_path)
+
+    storage = SqliteStorage(f"{file_path}.db")
+    storage.load()
+    storage.add_books((book.title, book.author, book.year, book.status)
+                      for book in JsonStorage(json_path).iter_file_books())
+    return storage
+
+
+def run_size(storage_type: str, size: int, repeat: int, seed: int, deferred: bool, temp_dir: str
+             ) -> dict[str, dict[str, float]]:
+    """  Замеры всех операций на каталоге из size книг. """
+    storage = open_storage(storage_type, os.path.join(temp_dir, f"catalog_{size}"), size, seed)
+    book_tools = BookTools(storage=storage, cache_size=0)
+    # Файл дочитывается сразу, чтобы потоковая загрузка не попала в замеры первых операций
+    storage.count()
+    storage.deferred = deferred
+    rnd = random.Random(seed)
+    book_ids = [rnd.randint(1, size) for _ in range(repeat)]
+
+    results = {
+        "get_book_list": measure(lambda number: book_tools.get_book_list(), repeat),
+        "save_book_list": measure(lambda number: book_tools.save_book_list(), repeat),
+        "search_books[strong]": measure(lambda number: book_tools.search_books(
+            STRICT_QUERIES[number % len(STRICT_QUERIES)], SEARCH_FIELDS, strong=True), repeat),
+        "search_books": measure(lambda number: book_tools.search_books(
+            QUERIES[number % len(QUERIES)], SEARCH_FIELDS), repeat),
+        "search_books[id]": measure(lambda number: book_tools.search_books(
+            str(book_ids[number]), ["id"], strong=True), repeat),
+    }
+
+    added = []
+    results["add_book"] = measure(lambda number: added.append(
+        book_tools.add_book(f"Новая книга {number}", "Автор Бенчмарка", "2024")), repeat)
+
+    def update(number: int) -> None:
+        book = book_tools.get_book(added[number].id)
+        book_tools.update_book(book, "status", "Выдана" if book.status == "В наличии" else "В наличии")
+
+    results["update_book"] = measure(update, repeat)
+    results["remove_book"] = measure(lambda number: book_tools.remove_book(added[number].id), repeat)
+    storage.deferred = False
+    return results
+
+
+def run(args: argparse.Namespace) -> int:
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "storage": args.storage,
+            "deferred": args.deferred,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": [],
+    }
+
+    print(f"{'книг':>9} {'операция':<22} {'минимум, мс':>12} {'медиана, мс':>12} {'среднее, мс':>12}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = run_size(args.storage, size, args.repeat, args.seed, args.deferred, temp_dir)
+        for operation, timing in results.items():
+            report["results"].append({"size": size, "operation": operation, **timing})
+            print(f"{size:>9} {operation:<22} {timing['min_ms']:>12.3f} {timing['median_ms']:>12.3f} "
+                  f"{timing['mean_ms']:>12.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=4, ensure_ascii=False)
+        print(f"Результаты записаны в {args.output}")
+    return 0
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2, min_delta_ms: float = 0.05
+                    ) -> list[dict]:
+    """  Сравнение двух прогонов по медианам: [{size, operation, baseline_ms, current_ms, ratio, regression}]
+    для операций, замеренных в обоих прогонах.
+
+        :param baseline: результаты прежнего прогона
+        :param current: результаты нового прогона
+        :param threshold: доля замедления, с которой операция считается регрессией
+        :param min_delta_ms: меньшие замедления в миллисекундах не считаются регрессией - это шум измерений
+    """
+    baseline_times = {(item["size"], item["operation"]): item["median_ms"] for item in baseline["results"]}
+    rows = []
+    for item in current["results"]:
+        key = (item["size"], item["operation"])
+        if key not in baseline_times:
+            continue
+        old, new = baseline_times[key], item["median_ms"]
+        if old:
+            ratio = new / old
+        else:
+            ratio = float("inf") if new else 1.0
+        rows.append({"size": key[0], "operation": key[1], "baseline_ms": old, "current_ms": new, "ratio": ratio,
+                     "regression": ratio > 1 + threshold and new - old > min_delta_ms})
+    return rows
+
+
+def compare(args: argparse.Namespace) -> int:
+    reports = []
+    for file_path in (args.baseline, args.current):
+        with open(file_path, "r", encoding="utf-8") as report_file:
+            reports.append(json.load(report_file))
+    baseline, current = reports
+    for field in ("python", "platform", "storage", "deferred"):
+        if baseline["meta"].get(field) != current["meta"].get(field):
+            print(f"Внимание: прогоны отличаются ({field}): {baseline['meta'].get(field)} и "
+                  f"{current['meta'].get(field)}")
+
+    rows = compare_results(baseline, current, args.threshold)
+    print(f"{'книг':>9} {'операция':<22} {'было, мс':>10} {'стало, мс':>10} {'изменение':>10}")
+    for row in rows:
+        mark = "  РЕГРЕССИЯ" if row["regression"] else ""
+        print(f"{row['size']:>9} {row['operation']:<22} {row['baseline_ms']:>10.3f} {row['current_ms']:>10.3f} "
+              f"{row['ratio'] - 1:>+10.1%}{mark}")
+
+    regressions = sum(row["regression"] for row in rows)
+    print(f"Регрессий: {regressions}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", metavar="команда", required=True)
+    run_parser = subparsers.add_parser("run", help="замерить операции и записать результаты в JSON")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    run_parser.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--deferred", action="store_true",
+                            help="изменения в режиме отложенной записи, без сохранения после каждого")
+    run_parser.add_argument("--output", help="файл для результатов в JSON")
+    compare_parser = subparsers.add_parser("compare", help="сравнить два прогона и отметить регрессии")
+    compare_parser.add_argument("baseline", help="результаты прежнего прогона")
+    compare_parser.add_argument("current", help="результаты нового прогона")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="доля замедления медианы, с которой операция считается регрессией")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.repeat < 1:
+            parser.error("--repeat должен быть не меньше 1")
+        if min(args.sizes) < 1:
+            parser.error("--sizes должны быть не меньше 1")
+        sys.exit(run(args))
+    sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from models import Book
+
+MAGIC = b"BOOKSNAP"
+FORMAT_VERSION = 1
+# Заголовок: сигнатура, версия формата, количество книг, смещения таблицы порядка, таблицы id и таблицы позиций
+HEADER = struct.Struct("<8sI4xQQQQ")
+RECORD_LENGTH = struct.Struct("<I")
+STRING_LENGTH = struct.Struct("<I")
+INTEGER = struct.Struct("<q")
+# Типы значений полей записи: строка, целое число, любое другое значение JSON
+STRING_TAG, INTEGER_TAG, JSON_TAG = b"s", b"i", b"j"
+
+
+def encode_record(book: Book) -> bytes:
+    """  Запись книги: длина записи и поля Book.fields по порядку - байт типа и значение. Строка и значение JSON -
+    длина и UTF-8, целое число - 8 байт. Типы значений сохраняются, поэтому преобразование в data.json и обратно
+    выполняется без потерь.
+
+        :param book: книга
+    """
+    parts = []
+    for field in Book.fields:
+        value = getattr(book, field)
+        if type(value) is str:
+            encoded = value.encode("utf-8")
+            parts += (STRING_TAG, STRING_LENGTH.pack(len(encoded)), encoded)
+        elif type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            parts += (INTEGER_TAG, INTEGER.pack(value))
+        else:
+            encoded = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            parts += (JSON_TAG, STRING_LENGTH.pack(len(encoded)), encoded)
+    payload = b"".join(parts)
+    return RECORD_LENGTH.pack(len(payload)) + payload
+
+
+def write_table(binary_file, table: array) -> None:
+    """  Запись таблицы чисел в порядке байтов little-endian. """
+    if sys.byteorder != "little":
+        table = array(table.typecode, table)
+        table.byteswap()
+    table.tofile(binary_file)
+
+
+def write_binary_snapshot(books: Iterable[Book], file_path: str) -> int:
+    """  Потоковая атомарная запись бинарного снимка каталога. Возвращает количество книг.
+
+        Формат файла:
+        - заголовок HEADER
+        - записи книг (encode_record) в порядке каталога
+        - таблица порядка: смещения записей в порядке каталога, по 8 байт
+        - таблица id: id книг по возрастанию, по 8 байт
+        - таблица позиций: номер записи в порядке каталога для каждого id таблицы id, по 4 байта
+        Таблицы выровнены по 8 байтам, все числа - little-endian.
+
+        :param books: книги в порядке каталога
+        :param file_path: путь к файлу снимка
+    """
+    offsets = array("Q")
+    ids = array("q")
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "wb") as binary_file:
+        binary_file.write(bytes(HEADER.size))
+        position = HEADER.size
+        for book in books:
+            if type(book.id) is not int:
+                raise ValueError(f"id книги должен быть целым числом: {book.id!r}")
+            record = encode_record(book)
+            offsets.append(position)
+            ids.append(book.id)
+            binary_file.write(record)
+            position += len(record)
+
+        padding = -position % 8
+        binary_file.write(bytes(padding))
+        order_offset = position + padding
+        write_table(binary_file, offsets)
+
+        positions = array("I", sorted(range(len(ids)), key=ids.__getitem__))
+        ids_offset = order_offset + len(offsets) * offsets.itemsize
+        write_table(binary_file, array("q", (ids[number] for number in positions)))
+        positions_offset = ids_offset + len(ids) * ids.itemsize
+        write_table(binary_file, positions)
+
+        binary_file.seek(0)
+        binary_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(ids), order_offset, ids_offset, positions_offset))
+        binary_file.flush()
+        os.fsync(binary_file.fileno())
+    os.replace(temp_path, file_path)
+    return len(ids)
+
+
+class BinarySnapshot:
+    """  Бинарный снимок каталога, открытый через mmap. Файл не копируется в память: таблицы читаются прямо из
+        отображения, а записи книг декодируются только при обращении к ним.
+
+        - get(position): книга по номеру в порядке каталога - O(1)
+        - find(book_id): номер книги по id двоичным поиском в таблице id - O(log N)
+
+        Использование:
+            with BinarySnapshot("data.bin") as snapshot:
+                book = snapshot.get_book(1)
+    """
+    def __init__(self, file_path: str) -> None:
+        """ Открытие снимка.
+
+            :param file_path: путь к файлу снимка
+        """
+        self.file_path = file_path
+        with open(file_path, "rb") as binary_file:
+            self.map = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = []
+        try:
+            magic, version, self.count, order_offset, ids_offset, positions_offset = HEADER.unpack_from(self.map)
+        except struct.error:
+            magic, version = b"", 0
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{file_path} не является бинарным снимком каталога версии {FORMAT_VERSION}")
+        self.offsets = self.get_table(order_offset, "Q")
+        self.ids = self.get_table(ids_offset, "q")
+        self.positions = self.get_table(positions_offset, "I")
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Book]:
+        return map(self.get, range(self.count))
+
+    def get_table(self, offset: int, typecode: str) -> memoryview | array:
+        """  Таблица чисел из отображения файла без копирования. На big-endian платформе - копия с разворотом байтов.
+
+            :param offset: смещение таблицы
+            :param typecode: тип чисел таблицы
+        """
+        size = array(typecode).itemsize * self.count
+        view = memoryview(self.map)[offset:offset + size]
+        self.views.append(view)
+        if sys.byteorder == "little":
+            table = view.cast(typecode)
+            self.views.append(table)
+            return table
+        table = array(typecode, view.tobytes())
+        table.byteswap()
+        return table
+
+    def get(self, position: int) -> Book:
+        """  Декодирование книги по номеру в порядке каталога. """
+        offset = self.offsets[position] + RECORD_LENGTH.size
+        values = []
+        for _ in Book.fields:
+            tag = self.map[offset:offset + 1]
+            offset += 1
+            if tag == INTEGER_TAG:
+                values.append(INTEGER.unpack_from(self.map, offset)[0])
+                offset += INTEGER.size
+                continue
+            length = STRING_LENGTH.unpack_from(self.map, offset)[0]
+            offset += STRING_LENGTH.size
+            text = self.map[offset:offset + length].decode("utf-8")
+            offset += length
+            values.append(text if tag == STRING_TAG else json.loads(text))
+        return Book(*values)
+
+    def find(self, book_id: int) -> int | None:
+        """  Номер книги с id в порядке каталога. None - если книги нет. """
+        index = bisect_left(self.ids, book_id)
+        if index < self.count and self.ids[index] == book_id:
+            return self.positions[index]
+        return None
+
+    def get_book(self, book_id: int) -> Book | None:
+        position = self.find(book_id)
+        return None if position is None else self.get(position)
+
+    def get_max_id(self) -> int:
+        return self.ids[-1] if self.count else 0
+
+    def close(self) -> None:
+        """  Закрытие отображения. Представления таблиц освобождаются первыми, иначе mmap не закрыть. """
+        for view in reversed(self.views):
+            view.release()
+        self.views.clear()
+        self.map.close()
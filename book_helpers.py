@@ -1,67 +1,160 @@
-import json
-import os
-import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
 
+from autosave import AutoSaver
+from models import Book, STATUSES
+from storage import BaseStorage, JsonStorage
 from validators import validate_form_fields
 
 
-class Book:
-    """  Класс для репрезентации объекта книги. """
-    def __init__(self, id: int, title: str, author: str, year: str, status: str = "В наличии") -> None:
-        """ Инициализация объекта книги.
-
-            :param id: идентификатор книги
-            :param title: название книги
-            :param author: автор книги
-            :param year: год издания книги
-            :param status: статус книги, по умолчанию 'В наличии'
-        """
-        self.id = id
-        self.title = title
-        self.author = author
-        self.year = year
-        self.status = status
-
-    def __repr__(self) -> str:
-        return f"{self.id}. {self.title}, {self.author}, {self.year}, {self.status}"
-
-    def full_repr(self) -> str:
-        return f" id: {self.id}\n Название: {self.title}\n Автор: {self.author}\n Год издания: {self.year}\n Статус: {self.status}"
-
-
 class BookTools:
-    """  Класс с методами для работы с книгами.
+    """  Класс с методами для работы с книгами. Данные хранятся в хранилище (storage.py): по умолчанию JsonStorage
+        с файлом data.json, либо SqliteStorage.
 
         Методы:
-        - :get_book_list(): возвращает книги из data.json
-        - :search_books(): поиск книг по названию, автору, году
-        - :add_book(): добавление новой книги
+        - :get_book_list(): возвращает книги из хранилища, прочитанные с диска
+        - :get_catalog(): возвращает каталог из памяти, перечитывая data.json только при его изменении
+        - :get_page(): страница каталога, загружаются и создаются только её книги
+        - :get_book(): получение книги по id за O(1)
+        - :search_books(): поиск книг по названию, автору, году через инвертированный индекс, с кэшем результатов
+        - :search_range(): книги с годом / автором / названием в диапазоне через отсортированный индекс
+        - :search_prefix(): книги, у которых автор / название начинается с префикса
+        - :search_fuzzy(): книги, похожие на запрос по названию и автору, с допуском опечаток
+        - :add_book(): добавление новой книги
+        - :add_books(): массовое добавление книг (импорт)
         - :remove_book(): удаление книги
         - :update_book(): обновление книги
         - :save_book_list(): сохранение изменений в data.json
+        - :flush_changes(): сохранение только изменённых с прошлого сохранения книг (автосохранение)
+        - :get_cache_stats(): статистика кэша результатов поиска
+        - :get_status_counts(): количество книг по статусам за O(1)
+        - :get_books_by_status(): книги с заданным статусом за O(k)
         - :validate_form_fields(): валидация полей формы
     """
-    def __init__(self) -> None:
-        self.check_data_file()
-        self.book_list = self.get_book_list()
-
-    @staticmethod
-    def get_book_list() -> list[Book]:
-        """  Получение списка книг из data.json. """
-        with open("data.json", "r") as json_file:
-            json_content = json.load(json_file)
-            return [Book(**item) for item in json_content]
-
-    @staticmethod
-    def check_data_file(file_path: str = "data.json") -> None:
-        """  Проверка наличия файла. Если нет - создаем его с пустым списком.
-
-            :param file_path: путь к файлу
-         """
-        if not os.path.exists(file_path):
-            with open(file_path, 'w') as file:
-                json.dump([], file)
-            # print(f"Создан файл данных: {file_path}")  # debug
+    def __init__(self, storage: BaseStorage | None = None, journal: bool = False,
+                 compact_threshold: int = 1000, cache_size: int = 128, autosave_interval: float = 0.0,
+                 autosave_every: int = 0) -> None:
+        """ Инициализация инструментов и загрузка каталога.
+
+            :param storage: хранилище книг, по умолчанию JsonStorage с файлом data.json
+            :param journal: если True - JsonStorage пишет изменения в журнал data.journal
+            :param compact_threshold: количество записей журнала, после которого он сжимается в фоне
+            :param cache_size: количество запоминаемых результатов поиска, 0 - без кэша
+            :param autosave_interval: период автосохранения изменений в секундах, 0 - без таймера
+            :param autosave_every: количество изменений, после которого они сохраняются, 0 - без ограничения
+        """
+        self.storage = storage or JsonStorage(journal=journal, compact_threshold=compact_threshold)
+        self.storage.load()
+
+        # Кэш результатов поиска: (запрос, поля, strong) -> список книг, в порядке последнего обращения.
+        # Любое изменение каталога увеличивает поколение и сбрасывает кэш
+        self.cache_size = cache_size
+        self.search_cache = OrderedDict()
+        self.generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
+        # Индекс статусов: статус -> множество id книг. Строится при первом запросе, затем обновляется при каждом
+        # изменении книг, поэтому количество книг со статусом - длина множества
+        self.status_index = None
+        self.status_load_count = 0
+
+        # Автосохранение: хранилище работает в режиме отложенной записи, изменённые книги отмечаются и
+        # сохраняются только они (AutoSaver). dirty - id изменённых, добавленных и удалённых книг,
+        # full_save - нужна полная запись хранилища, changes - количество несохранённых изменений
+        self.dirty = set()
+        self.full_save = False
+        self.changes = 0
+        # Изменения и сохранение из потока автосохранения не выполняются одновременно
+        self.dirty_lock = threading.RLock()
+        # Глубина вложенности changing() в текущем потоке: сигнал, пришедший во время изменения, обрабатывается
+        # после него (AutoSaver.handle_signal)
+        self.change_depth = threading.local()
+        self.autosaver = None
+        if autosave_interval > 0 or autosave_every > 0:
+            if getattr(self.storage, "shared_state", None) is not None:
+                raise ValueError("Автосохранение несовместимо с режимом shared: он сохраняет каждое изменение сразу")
+            self.storage.deferred = True
+            self.autosaver = AutoSaver(self, interval=autosave_interval, every=autosave_every)
+            self.autosaver.start()
+
+    @property
+    def book_list(self) -> list[Book]:
+        """  Список книг каталога. Изменять его напрямую нельзя. """
+        return self.storage.get_books()
+
+    def get_book_list(self) -> list[Book]:
+        """  Получение списка книг из хранилища с диска. """
+        return self.storage.read_books()
+
+    def get_catalog(self) -> list[Book]:
+        """  Каталог для вывода на экран. Отдаётся из памяти, data.json перечитывается, только если он изменён
+        извне (поменялось время изменения или размер). Несохранённые изменения при этом теряются.
+        """
+        self.check_changes()
+        return self.storage.get_books()
+
+    def get_page(self, page: int, page_size: int) -> tuple[list[Book], bool]:
+        """  Страница каталога для вывода на экран и признак наличия следующей страницы.
+
+            :param page: номер страницы, начиная с 1
+            :param page_size: количество книг на странице
+        """
+        self.check_changes()
+        return self.read_page(page, page_size)
+
+    def read_page(self, page: int, page_size: int) -> tuple[list[Book], bool]:
+        """  Страница каталога без проверки внешних изменений - для вызывающего кода, который проверяет их сам.
+
+            :param page: номер страницы, начиная с 1
+            :param page_size: количество книг на странице
+        """
+        # Запрашиваем на одну книгу больше, чтобы узнать о следующей странице без подсчёта всего каталога
+        book_list = self.storage.get_page((page - 1) * page_size, page_size + 1)
+        return book_list[:page_size], len(book_list) > page_size
+
+    @contextmanager
+    def changing(self) -> Iterator[None]:
+        """  Изменение или сохранение каталога под dirty_lock. Сигнал SIGINT или SIGTERM, пришедший во время
+        изменения, обрабатывается после выхода из внешнего блока, а не посреди изменения.
+        """
+        with self.dirty_lock:
+            self.change_depth.value = getattr(self.change_depth, "value", 0) + 1
+            try:
+                yield
+            finally:
+                self.change_depth.value -= 1
+        if self.autosaver is not None and not self.is_changing():
+            self.autosaver.raise_signal()
+
+    def is_changing(self) -> bool:
+        """  Текущий поток изменяет или сохраняет каталог (находится внутри changing()). """
+        return getattr(self.change_depth, "value", 0) > 0
+
+    def check_changes(self) -> None:
+        """  Перезагрузка хранилища, если оно изменено извне. """
+        if self.storage.is_changed():
+            self.reload()
+
+    def reload(self) -> None:
+        """  Повторная загрузка хранилища, изменённого извне, со сбросом кэша поиска и индекса статусов.
+        Несохранённые изменения теряются.
+        """
+        with self.changing():
+            self.storage.load()
+            self.clear_changes()
+        self.invalidate_cache()
+        self.status_index = None
+
+    def get_book(self, book_id: int) -> Book | None:
+        """  Получение книги по id через индекс, без перебора каталога.
+
+            :param book_id: идентификатор книги
+        """
+        return self.storage.get_book(book_id)
 
     def search_books(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book] | None:
         """  Поиск книг по номеру, названию, автору, году.
@@ -75,38 +168,149 @@ class BookTools:
             if not success:
                 return None
 
-        result = []
-        for item in self.book_list:
+            # Поиск по id - точное совпадение номера через индекс
             if strong:
-                if all(query in str(getattr(item, field)) for field in search_fields):
-                    result.append(item)
-            else:
-                if any(query.lower() in str(getattr(item, field)).lower() for field in search_fields):
-                    result.append(item)
+                book = self.get_book(int(query))
+                return [book] if book else []
+
+        key = (query, tuple(search_fields), strong)
+        result = self.get_cached(key)
+        if result is None:
+            result = self.storage.search(query, search_fields, strong)
+            self.put_cached(key, result)
         return result
 
-    def add_book(self, title: str, author: str, year: str) -> None:
-        """  Добавление новой книги.
+    def get_cached(self, key: tuple) -> list[Book] | None:
+        """  Результат поиска из кэша с учётом попадания или промаха. None - результата нет в кэше. """
+        result = self.search_cache.get(key)
+        if result is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self.search_cache.move_to_end(key)
+        return result
+
+    def put_cached(self, key: tuple, result: list[Book]) -> None:
+        """  Запоминание результата поиска, самый давно не использованный результат вытесняется. """
+        if self.cache_size <= 0:
+            return
+        self.search_cache[key] = result
+        if len(self.search_cache) > self.cache_size:
+            self.search_cache.popitem(last=False)
+            self.cache_evictions += 1
+
+    def invalidate_cache(self) -> None:
+        """  Сброс кэша результатов поиска при изменении каталога. """
+        self.generation += 1
+        self.search_cache.clear()
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """  Статистика кэша результатов поиска: попадания, промахи, вытеснения, размер и поколение каталога. """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+            "size": len(self.search_cache),
+            "capacity": self.cache_size,
+            "generation": self.generation,
+        }
+
+    def search_range(self, field: str, low=None, high=None) -> list[Book]:
+        """  Книги со значением поля в диапазоне [low, high] в порядке значения, например годы 1900..1950.
+        Для строк верхняя граница включает все строки, начинающиеся с неё. Регистр строк не учитывается.
+
+            :param field: поле: year, author или title
+            :param low: нижняя граница, None - без границы
+            :param high: верхняя граница, None - без границы
+        """
+        return self.storage.get_range(field, low, high)
+
+    def search_prefix(self, field: str, prefix: str) -> list[Book]:
+        """  Книги, у которых значение поля начинается с prefix без учёта регистра, в порядке значения.
+
+            :param field: поле: author или title
+            :param prefix: начало строки
+        """
+        return self.storage.get_prefix(field, prefix)
+
+    def search_fuzzy(self, query: str, limit: int = 20) -> list[Book]:
+        """  Нечёткий поиск по названию и автору с допуском опечаток: не больше limit книг по убыванию сходства.
+
+            :param query: строка поиска
+            :param limit: максимальное количество книг
+        """
+        return self.storage.fuzzy_search(query, limit)
+
+    def get_status_index(self) -> dict[str, set[int]]:
+        """  Индекс статусов, при первом обращении строится одним проходом по каталогу. """
+        if self.get_built_status_index() is None:
+            self.status_index = {status: set() for status in STATUSES}
+            self.status_load_count = self.storage.load_count
+            for book in self.storage.iter_books():
+                self.status_index.setdefault(book.status, set()).add(book.id)
+        return self.status_index
+
+    def get_built_status_index(self) -> dict[str, set[int]] | None:
+        """  Индекс статусов, если он построен и хранилище с тех пор не перечитывало каталог (например, перед
+        изменением в режиме shared). None - индекс нужно строить заново.
+        """
+        if self.status_index is not None and self.status_load_count != self.storage.load_count:
+            self.status_index = None
+        return self.status_index
+
+    def get_status_counts(self) -> dict[str, int]:
+        """  Количество книг по статусам, без обхода каталога. """
+        return {status: len(book_ids) for status, book_ids in self.get_status_index().items()}
+
+    def get_books_by_status(self, status: str) -> list[Book]:
+        """  Книги с заданным статусом в порядке id. Читаются только эти книги - O(k), а не весь каталог.
+
+            :param status: статус книги
+        """
+        book_ids = sorted(self.get_status_index().get(status, ()))
+        return [book for book in map(self.get_book, book_ids) if book is not None]
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        """  Добавление новой книги. Возвращает созданную книгу.
 
             :param title: название книги
             :param author: автор книги
             :param year: год издания книги
         """
-        last_id = self.book_list[-1].id if self.book_list else 0
-        self.book_list.append(Book(last_id + 1, title, author, year))
-        self.save_book_list()
-        print("Книга успешно добавлена!")
-        time.sleep(1)  # Чтобы пользователь успел увидеть сообщение
+        self.invalidate_cache()
+        with self.changing():
+            book = self.storage.add_book(title, author, year)
+            self.mark_changed(book.id)
+        if self.get_built_status_index() is not None:
+            self.status_index.setdefault(book.status, set()).add(book.id)
+        return book
+
+    def add_books(self, book_values: list[tuple[str, str, str, str]]) -> int:
+        """  Массовое добавление книг с назначением id подряд. Возвращает количество добавленных книг.
+
+            :param book_values: данные книг: (название, автор, год, статус)
+        """
+        self.invalidate_cache()
+        # id новых книг назначает хранилище - индекс статусов перестроится при следующем запросе
+        self.status_index = None
+        with self.changing():
+            count = self.storage.add_books(book_values)
+            # id новых книг назначает хранилище - сохраняем его целиком
+            self.mark_changed()
+        return count
 
     def remove_book(self, book_id: int) -> None:
         """  Удаление книги.
 
             :param book_id: идентификатор книги
         """
-        self.book_list = [item for item in self.book_list if item.id != book_id]
-        print("Книга успешно удалена!")
-        self.save_book_list()
-        time.sleep(1)  # Чтобы пользователь успел увидеть сообщение
+        self.invalidate_cache()
+        book = self.get_book(book_id) if self.get_built_status_index() is not None else None
+        with self.changing():
+            self.storage.remove_book(book_id)
+            self.mark_changed(book_id)
+        if book is not None and self.get_built_status_index() is not None:
+            self.status_index.get(book.status, set()).discard(book_id)
 
     def update_book(self, book_object: Book, field: str, value: str) -> None:
         """  Обновление книги.
@@ -115,12 +319,52 @@ class BookTools:
             :param field: атрибут для обновления
             :param value: новое значение
         """
-        setattr(book_object, field, value)
-        # self.save_book_list()  # Отключено для скорости, сохранение происходит при выходе из приложения
-        print("Книга успешно обновлена!")
-        time.sleep(1)  # Чтобы пользователь успел увидеть сообщение
+        # JsonStorage не сохраняет обновления для скорости: они сохраняются автосохранением или при выходе
+        self.invalidate_cache()
+        old_id, old_status = book_object.id, book_object.status
+        with self.changing():
+            self.storage.update_book(book_object, field, value)
+            self.mark_changed(old_id, book_object.id)
+        if self.get_built_status_index() is not None and field in ("id", "status"):
+            self.status_index.get(old_status, set()).discard(old_id)
+            self.status_index.setdefault(book_object.status, set()).add(book_object.id)
 
     def save_book_list(self) -> None:
-        """  Сохранение списка книг в JSON-файл. Полная перезапись. """
-        with open("data.json", "w", encoding="utf-8") as json_file:
-            json.dump([item.__dict__ for item in self.book_list], json_file, indent=4, ensure_ascii=False)
\ No newline at end of file
+        """  Сохранение всех изменений в хранилище. """
+        with self.changing():
+            self.storage.save()
+            self.clear_changes()
+
+    def mark_changed(self, *book_ids: int) -> None:
+        """  Учёт несохранённого изменения для автосохранения. Вызывается под dirty_lock.
+
+            :param book_ids: id изменённых книг; без id - при сохранении хранилище записывается целиком
+        """
+        if self.autosaver is None:
+            return
+        if book_ids:
+            self.dirty.update(book_ids)
+        else:
+            self.full_save = True
+        self.changes += 1
+        self.autosaver.notify_change()
+
+    def clear_changes(self) -> None:
+        self.dirty.clear()
+        self.full_save = False
+        self.changes = 0
+
+    def flush_changes(self) -> int:
+        """  Сохранение изменений с прошлого сохранения: хранилище записывает только изменённые книги
+        (storage.save_changes). Возвращает количество сохранённых изменений.
+        """
+        with self.changing():
+            changes = self.changes
+            if not changes:
+                return 0
+            if self.full_save:
+                self.storage.save()
+            else:
+                self.storage.save_changes({book_id: self.storage.get_book(book_id) for book_id in sorted(self.dirty)})
+            self.clear_changes()
+        return changes
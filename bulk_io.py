@@ -0,0 +1,157 @@
+import csv
+import json
+import time
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from book_helpers import BookTools, Book
+from models import STATUSES
+from validators import form_validator
+
+IMPORT_FIELDS = ("title", "author", "year")
+# Значения полей импорта: строки и числа, null, списки и объекты считаются ошибкой записи
+SCALAR_TYPES = (str, int, float)
+
+
+def get_file_format(file_path: str, file_format: str | None = None) -> str:
+    """  Формат файла: указанный явно или по расширению файла (.csv - csv, иначе jsonl). """
+    return file_format or ("csv" if file_path.endswith(".csv") else "jsonl")
+
+
+def iter_records(record_file: TextIO, file_format: str = "jsonl") -> Iterator[tuple[int, dict | str]]:
+    """  Потоковое чтение записей из JSON-lines или CSV. Отдаёт пары (номер строки, запись). Если строку не удалось
+    разобрать, вместо записи отдаётся текст ошибки, чтобы чтение продолжилось.
+
+        - jsonl: один объект JSON на строку, пустые строки пропускаются
+        - csv: первая строка - заголовок с названиями колонок, пустые ячейки не учитываются
+
+        :param record_file: открытый текстовый файл
+        :param file_format: формат файла: jsonl или csv
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(record_file)
+        for record in reader:
+            yield reader.line_num, {key: value for key, value in record.items() if key and value not in (None, "")}
+        return
+
+    for line_number, line in enumerate(record_file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield line_number, f"некорректный JSON: {error.msg}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "запись должна быть объектом JSON"
+
+
+def iter_chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """  Разбиение потока на списки по chunk_size элементов. """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def validate_chunk(chunk: list[tuple[int, dict | str]]
+                   ) -> tuple[list[tuple[str, str, str, str]], list[tuple[int, str]]]:
+    """  Проверка пачки записей импорта правилами формы добавления книги: значения собираются в колонки и
+    проверяются по колонкам за один проход на поле. Возвращает данные корректных книг (название, автор, год, статус)
+    и ошибки (номер строки, текст ошибки).
+
+        :param chunk: пары (номер строки, запись или текст ошибки разбора)
+    """
+    errors = [(line_number, record) for line_number, record in chunk if isinstance(record, str)]
+    rows = [(line_number, record) for line_number, record in chunk if not isinstance(record, str)]
+    defaults = {"title": "", "author": "", "year": "", "status": STATUSES[0]}
+    values = {field: [record.get(field, default) for line_number, record in rows]
+              for field, default in defaults.items()}
+    # null и вложенные значения не превращаются в строки "None" и "[...]", а отмечаются ошибкой поля
+    invalid = {field: [type(value) not in SCALAR_TYPES for value in column] for field, column in values.items()}
+    columns = {field: [str(value) if type(value) in SCALAR_TYPES else "" for value in column]
+               for field, column in values.items()}
+    masks = form_validator.validate_columns({field: columns[field] for field in IMPORT_FIELDS})
+    masks["status"] = [status not in STATUSES for status in columns["status"]]
+    messages = {field: form_validator.get_error(field).strip("\n -") for field in IMPORT_FIELDS}
+    messages["status"] = f"статус должен быть одним из: {', '.join(STATUSES)}"
+
+    book_values = []
+    for row, (line_number, record) in enumerate(rows):
+        invalid_field = next((field for field in defaults if invalid[field][row]), None)
+        if invalid_field is not None:
+            errors.append((line_number, f"{invalid_field}: значение должно быть строкой или числом"))
+            continue
+        for field, mask in masks.items():
+            if mask[row]:
+                errors.append((line_number, f"{field}: {messages[field]}"))
+                break
+        else:
+            book_values.append(tuple(columns[field][row] for field in (*IMPORT_FIELDS, "status")))
+    errors.sort()
+    return book_values, errors
+
+
+class ImportReport:
+    """  Итоги импорта.
+
+        Атрибуты:
+            imported: количество добавленных книг
+            errors: список пар (номер строки, текст ошибки) пропущенных записей
+            elapsed: время импорта в секундах
+    """
+    def __init__(self) -> None:
+        self.imported = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + len(self.errors)) / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (f"Импортировано книг: {self.imported}, ошибок: {len(self.errors)}, "
+                f"время: {self.elapsed:.2f} с, {self.rows_per_second:.0f} строк/с")
+
+
+def import_books(book_tools: BookTools, record_file: TextIO, file_format: str = "jsonl",
+                 chunk_size: int = 10_000) -> ImportReport:
+    """  Потоковый импорт книг. Файл читается и проверяется пачками по chunk_size строк, книги пачки добавляются
+    с назначением id подряд, хранилище сохраняется один раз в конце. id из файла не переносится: книги получают
+    новые id, статус берётся из колонки status, если она есть.
+
+        :param book_tools: инструменты для работы с книгами
+        :param record_file: открытый текстовый файл с книгами: колонки title, author, year и необязательная status
+        :param file_format: формат файла: jsonl или csv
+        :param chunk_size: количество строк в пачке
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+    with book_tools.storage.deferred_writes():
+        for chunk in iter_chunks(iter_records(record_file, file_format), chunk_size):
+            book_values, errors = validate_chunk(chunk)
+            report.imported += book_tools.add_books(book_values)
+            report.errors.extend(errors)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def export_books(book_tools: BookTools, record_file: TextIO, file_format: str = "jsonl") -> int:
+    """  Потоковый экспорт каталога: книги пишутся по одной, по мере чтения из хранилища.
+    Возвращает количество выгруженных книг.
+
+        :param book_tools: инструменты для работы с книгами
+        :param record_file: открытый на запись текстовый файл
+        :param file_format: формат файла: jsonl или csv
+    """
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(record_file)
+        writer.writerow(Book.fields)
+        for book in book_tools.storage.iter_books():
+            writer.writerow([getattr(book, field) for field in Book.fields])
+            count += 1
+        return count
+
+    for book in book_tools.storage.iter_books():
+        record_file.write(json.dumps(book.to_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
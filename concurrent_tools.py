@@ -0,0 +1,281 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from book_helpers import BookTools
+from models import Book
+from storage import BaseStorage
+
+
+class ReadWriteLock:
+    """  Блокировка читателей-писателя: читать могут несколько потоков одновременно, писать - только один поток и
+        только когда нет читателей. Чтение и запись чередуются: ожидающий писатель не пропускает вперёд новых
+        читателей, а после записи сначала входят читатели, которые её ждали. Поэтому ни поток изменений, ни
+        запросы не голодают при постоянной нагрузке другой стороны.
+    """
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.waiting_readers = 0
+        self.waiting_writers = 0
+        # Очередь читателей, дождавшихся окончания записи
+        self.readers_turn = False
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        with self.condition:
+            self.waiting_readers += 1
+            while self.writer or (self.waiting_writers and not self.readers_turn):
+                self.condition.wait()
+            self.waiting_readers -= 1
+            self.readers += 1
+            if not self.waiting_readers and self.readers_turn:
+                self.readers_turn = False
+                self.condition.notify_all()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers or self.readers_turn:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.readers_turn = self.waiting_readers > 0
+                self.condition.notify_all()
+
+
+class ConcurrentBookTools(BookTools):
+    """  BookTools для использования из нескольких потоков.
+
+        - Чтение (поиск, получение книг, статистика) выполняется под общей блокировкой чтения, параллельно с другими
+        чтениями. Изменения - под блокировкой записи, они только меняют каталог и индексы в памяти и не ждут диска.
+        - Индексы, которые хранилище строит лениво, строятся при первом запросе под блокировкой записи, дальше такие
+        запросы выполняются как обычное чтение.
+        - Хранилище работает в режиме отложенной записи. Фоновый поток собирает изменения за flush_interval секунд
+        и сохраняет их одним вызовом storage.save(). close() останавливает поток и сохраняет оставшиеся изменения.
+
+        Использование:
+            with ConcurrentBookTools(storage=storage) as book_tools:
+                ...
+    """
+    def __init__(self, storage: BaseStorage | None = None, journal: bool = False, compact_threshold: int = 1000,
+                 cache_size: int = 128, flush_interval: float = 0.5) -> None:
+        """ Инициализация, загрузка каталога целиком и запуск фонового потока записи.
+
+            :param storage: хранилище книг, по умолчанию JsonStorage с файлом data.json
+            :param journal: если True - JsonStorage пишет изменения в журнал data.journal
+            :param compact_threshold: количество записей журнала, после которого он сжимается в фоне
+            :param cache_size: количество запоминаемых результатов поиска, 0 - без кэша
+            :param flush_interval: сколько секунд копить изменения перед сохранением
+        """
+        super().__init__(storage=storage, journal=journal, compact_threshold=compact_threshold,
+                         cache_size=cache_size)
+        self.lock = ReadWriteLock()
+        # Глубина вложенных блокировок потока: методы BookTools вызывают друг друга, повторно блокировка не берётся
+        self.local = threading.local()
+        # Кэш результатов поиска меняется и при чтении (порядок LRU), поэтому у него своя блокировка
+        self.cache_lock = threading.Lock()
+        self.prepared = set()
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self.saves = 0
+        self.flush_lock = threading.Lock()
+        self.pending_event = threading.Event()
+        self.stopped = threading.Event()
+
+        # Файл дочитывается сразу: потоковая загрузка меняет каталог при чтении
+        self.storage.count()
+        self.storage.deferred = True
+        self.writer_thread = threading.Thread(target=self.write_loop, name="book-tools-writer", daemon=True)
+        self.writer_thread.start()
+
+    def __enter__(self) -> 'ConcurrentBookTools':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def is_locked(self) -> bool:
+        """  Держит ли текущий поток блокировку чтения или записи. """
+        return getattr(self.local, "depth", 0) > 0
+
+    @contextmanager
+    def locked(self, lock_context) -> Iterator[None]:
+        """  Вход в блокировку, если поток её ещё не держит. """
+        if self.is_locked():
+            self.local.depth += 1
+            lock_context = None
+        else:
+            lock_context.__enter__()
+            self.local.depth = 1
+        try:
+            yield
+        finally:
+            self.local.depth -= 1
+            if lock_context is not None:
+                lock_context.__exit__(None, None, None)
+
+    @contextmanager
+    def read_locked(self, lazy_key: tuple | None = None) -> Iterator[None]:
+        """  Блокировка чтения. Запрос, который при первом вызове строит ленивый индекс (lazy_key), в первый раз
+        выполняется под блокировкой записи.
+
+            :param lazy_key: ключ ленивого индекса, который строит запрос
+        """
+        if lazy_key is None or lazy_key in self.prepared:
+            with self.locked(self.lock.read_locked()):
+                yield
+            return
+        with self.write_locked():
+            yield
+            self.prepared.add(lazy_key)
+
+    def write_locked(self):
+        """  Блокировка записи. """
+        return self.locked(self.lock.write_locked())
+
+    def check_changes(self) -> None:
+        """  Перезагрузка хранилища, изменённого извне, под блокировкой записи. Вызывается до входа в блокировку
+        чтения; внутри блокировки изменение будет учтено при следующем запросе.
+        """
+        if self.is_locked() or not self.storage.is_changed():
+            return
+        with self.write_locked():
+            if self.storage.is_changed():
+                self.reload()
+                self.prepared.clear()
+
+    def get_catalog(self) -> list[Book]:
+        self.check_changes()
+        with self.read_locked():
+            return super().get_catalog()
+
+    def get_page(self, page: int, page_size: int) -> tuple[list[Book], bool]:
+        self.check_changes()
+        with self.read_locked():
+            return super().get_page(page, page_size)
+
+    def get_book(self, book_id: int) -> Book | None:
+        with self.read_locked():
+            return super().get_book(book_id)
+
+    def search_books(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book] | None:
+        with self.read_locked():
+            return super().search_books(query, search_fields, strong)
+
+    def get_cached(self, key: tuple) -> list[Book] | None:
+        with self.cache_lock:
+            return super().get_cached(key)
+
+    def put_cached(self, key: tuple, result: list[Book]) -> None:
+        with self.cache_lock:
+            super().put_cached(key, result)
+
+    def search_range(self, field: str, low=None, high=None) -> list[Book]:
+        with self.read_locked(("range", field)):
+            return super().search_range(field, low, high)
+
+    def search_prefix(self, field: str, prefix: str) -> list[Book]:
+        with self.read_locked(("range", field)):
+            return super().search_prefix(field, prefix)
+
+    def search_fuzzy(self, query: str, limit: int = 20) -> list[Book]:
+        with self.read_locked(("fuzzy",)):
+            return super().search_fuzzy(query, limit)
+
+    def get_status_counts(self) -> dict[str, int]:
+        with self.read_locked(("status",)):
+            return super().get_status_counts()
+
+    def get_books_by_status(self, status: str) -> list[Book]:
+        with self.read_locked(("status",)):
+            return super().get_books_by_status(status)
+
+    def invalidate_cache(self) -> None:
+        with self.cache_lock:
+            super().invalidate_cache()
+
+    def reload(self) -> None:
+        super().reload()
+        self.storage.count()
+        self.storage.deferred = True
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        with self.write_locked():
+            book = super().add_book(title, author, year)
+            self.mark_pending()
+        return book
+
+    def add_books(self, book_values: list[tuple[str, str, str, str]]) -> int:
+        with self.write_locked():
+            count = super().add_books(book_values)
+            # Массовое добавление сбрасывает индекс статусов
+            self.prepared.discard(("status",))
+            self.mark_pending()
+        return count
+
+    def remove_book(self, book_id: int) -> None:
+        with self.write_locked():
+            super().remove_book(book_id)
+            self.mark_pending()
+
+    def update_book(self, book_object: Book, field: str, value: str) -> None:
+        with self.write_locked():
+            super().update_book(book_object, field, value)
+            self.mark_pending()
+
+    def mark_pending(self) -> None:
+        """  Учёт изменения для фонового потока записи. Вызывается под блокировкой записи. """
+        self.pending += 1
+        self.pending_event.set()
+
+    def write_loop(self) -> None:
+        """  Фоновый поток записи: ждёт первое изменение, копит следующие flush_interval секунд и сохраняет все
+        одним вызовом storage.save().
+        """
+        while not self.stopped.is_set():
+            self.pending_event.wait()
+            self.stopped.wait(self.flush_interval)
+            self.flush()
+
+    def flush(self, force: bool = False) -> None:
+        """  Сохранение накопленных изменений. Выполняется под блокировкой чтения: поиск продолжает работать,
+        изменения ждут окончания записи.
+
+            :param force: сохранить, даже если изменений не было
+        """
+        with self.read_locked(), self.flush_lock:
+            self.pending_event.clear()
+            if not self.pending and not force:
+                return
+            self.pending = 0
+            self.storage.save()
+            self.saves += 1
+
+    def save_book_list(self) -> None:
+        """  Немедленное сохранение всех изменений. """
+        self.flush(force=True)
+
+    def close(self) -> None:
+        """  Остановка фонового потока и сохранение оставшихся изменений. """
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        self.pending_event.set()
+        self.writer_thread.join()
+        self.flush()
+        self.storage.deferred = False
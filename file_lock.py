@@ -0,0 +1,86 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl есть только в Unix. Без него блокировка между процессами не выполняется
+    fcntl = None
+
+
+class SharedFileState:
+    """  Общее состояние нескольких процессов, работающих с одним файлом данных, в файле блокировки <имя>.lock.
+
+        Файл хранит JSON {"last_id": ..., "version": ...}:
+        - last_id - последний выданный id книги. id выдаются под блокировкой и растут монотонно во всех процессах,
+        в том числе после удаления книг
+        - version - номер версии файла данных, увеличивается при каждой записи. Процесс сравнивает его с версией,
+        которую он загрузил, и перед записью перечитывает файл, изменённый другим процессом
+
+        Блокировка - рекомендательная fcntl.flock на файле <имя>.lock, её соблюдают только процессы, которые её берут.
+    """
+    def __init__(self, file_path: str) -> None:
+        """ Инициализация.
+
+            :param file_path: путь к файлу блокировки
+        """
+        self.file_path = file_path
+        self.lock_file = None
+        self.state = None
+        self.locked_state = None
+
+    def read(self) -> dict[str, int]:
+        """  Текущее состояние без блокировки. """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as lock_file:
+                return self.parse(lock_file.read())
+        except FileNotFoundError:
+            return self.parse("")
+
+    @staticmethod
+    def parse(content: str) -> dict[str, int]:
+        state = json.loads(content) if content.strip() else {}
+        return {"last_id": state.get("last_id", 0), "version": state.get("version", 0)}
+
+    def is_locked(self) -> bool:
+        return self.lock_file is not None
+
+    def acquire(self) -> dict[str, int]:
+        """  Взятие блокировки, ждёт пока её отпустит другой процесс. Возвращает состояние, его изменения
+        записываются при release().
+        """
+        self.lock_file = open(self.file_path, "a+", encoding="utf-8")
+        if fcntl is not None:
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX)
+        self.lock_file.seek(0)
+        self.state = self.parse(self.lock_file.read())
+        self.locked_state = dict(self.state)
+        return self.state
+
+    def release(self) -> None:
+        """  Запись состояния и освобождение блокировки. """
+        if self.lock_file is None:
+            return
+        try:
+            if self.state != self.locked_state:
+                self.lock_file.seek(0)
+                self.lock_file.truncate()
+                self.lock_file.write(json.dumps(self.state))
+                self.lock_file.flush()
+                os.fsync(self.lock_file.fileno())
+        finally:
+            # Закрытие файла снимает flock
+            self.lock_file.close()
+            self.lock_file = None
+            self.state = None
+
+    @contextmanager
+    def locked(self) -> Iterator[dict[str, int]]:
+        """  Блок под блокировкой: with state.locked() as state: ... """
+        state = self.acquire()
+        try:
+            yield state
+        finally:
+            self.release()
@@ -0,0 +1,142 @@
+import re
+from collections import Counter
+from heapq import nlargest
+from typing import Iterable
+
+from models import Book
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class FuzzyIndex:
+    """  Индекс нечёткого поиска с допуском опечаток по словам названия и автора.
+
+        Слова индексируются после casefold. Для каждого слова словаря хранятся его триграммы (с пробелами по краям,
+        чтобы учитывались начало и конец слова) и множество id книг, где оно встречается. Сходство слова запроса со
+        словом словаря - коэффициент Жаккара по триграммам: одна опечатка в слове из 7 букв даёт около 0.5.
+
+        Кандидаты ищутся по словарю, а не по книгам: число различных слов намного меньше числа книг. Время поиска
+        ограничено: на каждое слово запроса берутся не больше max_words самых похожих слов словаря, а оценивается не
+        больше max_candidates книг.
+    """
+    gram_size = 3
+
+    def __init__(self, book_list: Iterable[Book] = (), fields: tuple[str, ...] = ("title", "author")) -> None:
+        """ Инициализация и индексация книг.
+
+            :param book_list: книги каталога
+            :param fields: индексируемые поля книги
+        """
+        self.fields = fields
+        self.book_words = {}
+        self.word_books = {}
+        self.word_grams = {}
+        self.gram_words = {}
+        for book in book_list:
+            self.add_book(book)
+
+    @classmethod
+    def get_grams(cls, word: str) -> frozenset[str]:
+        """  Множество триграмм слова с пробелами по краям. """
+        word = f"  {word} "
+        return frozenset(word[i:i + cls.gram_size] for i in range(len(word) - cls.gram_size + 1))
+
+    @staticmethod
+    def get_words(text: str) -> list[str]:
+        """  Слова строки после casefold. """
+        return WORD_PATTERN.findall(text.casefold())
+
+    def add_book(self, book: Book) -> None:
+        words = frozenset(word for field in self.fields for word in self.get_words(str(getattr(book, field))))
+        self.book_words[book.id] = words
+        for word in words:
+            book_ids = self.word_books.get(word)
+            if book_ids is None:
+                # Новое слово словаря
+                book_ids = self.word_books[word] = set()
+                grams = self.word_grams[word] = self.get_grams(word)
+                for gram in grams:
+                    self.gram_words.setdefault(gram, set()).add(word)
+            book_ids.add(book.id)
+
+    def remove_book(self, book_id: int) -> None:
+        for word in self.book_words.pop(book_id, ()):
+            book_ids = self.word_books[word]
+            book_ids.discard(book_id)
+            if book_ids:
+                continue
+            # Слово больше не встречается в каталоге - удаляем его из словаря
+            del self.word_books[word]
+            for gram in self.word_grams.pop(word):
+                gram_words = self.gram_words[gram]
+                gram_words.discard(word)
+                if not gram_words:
+                    del self.gram_words[gram]
+
+    def update_book(self, book: Book, old_id: int | None = None) -> None:
+        """  Переиндексация книги после изменения её полей.
+
+            :param book: объект книги с новыми значениями
+            :param old_id: прежний id книги, если он изменился
+        """
+        self.remove_book(book.id if old_id is None else old_id)
+        self.add_book(book)
+
+    def match_word(self, word: str, threshold: float, max_words: int) -> list[tuple[str, float]]:
+        """  Самые похожие слова словаря: [(слово, сходство)] по убыванию сходства.
+
+            :param word: слово запроса
+            :param threshold: минимальное сходство
+            :param max_words: максимальное количество слов
+        """
+        grams = self.get_grams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.gram_words.get(gram, ()))
+
+        matches = []
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(self.word_grams[candidate]) - count)
+            if similarity >= threshold:
+                matches.append((candidate, similarity))
+        return nlargest(max_words, matches, key=lambda match: match[1])
+
+    def search(self, query: str, limit: int = 20, threshold: float = 0.3, max_words: int = 50,
+               max_candidates: int = 10_000) -> list[tuple[int, float]]:
+        """  Нечёткий поиск: [(id книги, оценка)] по убыванию оценки, при равенстве - по id. Оценка книги - среднее
+        по словам запроса сходство с самым похожим словом книги, от 0 до 1.
+
+            :param query: строка поиска
+            :param limit: количество результатов
+            :param threshold: минимальное сходство слова запроса со словом книги
+            :param max_words: количество похожих слов словаря на слово запроса
+            :param max_candidates: максимальное количество оцениваемых книг
+        """
+        query_words = list(dict.fromkeys(self.get_words(query)))
+        if not query_words:
+            return []
+
+        scores = {}
+        for query_word in query_words:
+            # Лучшее сходство каждой книги с этим словом запроса
+            best = {}
+            for word, similarity in self.match_word(query_word, threshold, max_words):
+                book_ids = self.word_books[word]
+                if len(scores) + len(best) >= max_candidates:
+                    # Слова идут по убыванию сходства, поэтому новые книги уже хуже набранных: обновляем только
+                    # оценки набранных кандидатов, обходя меньшее из двух множеств
+                    for book_id in (scores if len(scores) < len(book_ids) else book_ids):
+                        if book_id in scores and book_id in book_ids and book_id not in best:
+                            best[book_id] = similarity
+                    continue
+                for book_id in book_ids:
+                    if book_id not in best:
+                        best[book_id] = similarity
+                        if book_id not in scores and len(scores) + len(best) >= max_candidates:
+                            break
+            for book_id, similarity in best.items():
+                scores[book_id] = scores.get(book_id, 0.0) + similarity
+
+        count = len(query_words)
+        top = nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(book_id, score / count) for book_id, score in top]
@@ -0,0 +1,164 @@
+import cProfile
+import os
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    # Импорт для проверки типов
+    from main import Router
+
+# Переменные окружения, включающие замеры и профилирование без флагов командной строки
+INSTRUMENT_ENV = "LIBRARY_INSTRUMENT"
+PROFILE_ENV = "LIBRARY_PROFILE"
+TRACE_MEMORY_ENV = "LIBRARY_TRACE_MEMORY"
+
+# Верхние границы корзин гистограммы в миллисекундах: 0.01, 0.02, 0.05, 0.1 ... 50000
+BUCKET_BOUNDS_MS = tuple(mantissa * 10.0 ** exponent for exponent in range(-2, 5) for mantissa in (1, 2, 5))
+
+BOOK_TOOLS_METHODS = ("get_book_list", "get_catalog", "get_page", "get_book", "search_books", "search_range",
+                      "search_prefix", "search_fuzzy", "get_status_counts", "get_books_by_status", "add_book",
+                      "add_books", "remove_book", "update_book", "save_book_list", "reload")
+STORAGE_METHODS = ("load", "load_until", "ensure_loaded", "save", "search", "compact_journal")
+
+
+def is_enabled(flag: bool = False) -> bool:
+    """  Включены ли замеры: флагом командной строки или переменной окружения LIBRARY_INSTRUMENT. """
+    return flag or os.environ.get(INSTRUMENT_ENV, "") not in ("", "0")
+
+
+class OperationStats:
+    """  Количество вызовов и гистограмма задержек одной операции. Память не зависит от количества вызовов. """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+
+    def percentile(self, share: float) -> float:
+        """  Оценка перцентиля по гистограмме: верхняя граница корзины, но не больше максимума.
+
+            :param share: доля вызовов от 0 до 1, например 0.95
+        """
+        rank = share * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Instrumentation:
+    """  Замеры задержек операций BookTools, хранилища и роутера.
+
+        instrument() подменяет методы конкретного объекта обёртками с замером, классы не меняются. Поэтому без
+        замеров накладных расходов нет: объекты не обёрнуты, а экран выхода только проверяет, что замеры выключены.
+
+        Время ожидания ввода пользователя (BasePage.read_input) записывается отдельной операцией и вычитается из
+        времени всех операций, внутри которых оно прошло, - время render - это работа приложения, а не пользователя.
+    """
+    def __init__(self) -> None:
+        self.stats = {}
+        # Суммарное время ожидания ввода, вычитается из вложенных замеров
+        self.excluded = 0.0
+
+    def wrap(self, name: str, func: Callable, excluded: bool = False) -> Callable:
+        """  Обёртка функции с записью задержки в операцию name.
+
+            :param name: название операции
+            :param func: функция
+            :param excluded: время функции не входит во время охватывающих операций
+        """
+        stats = self.stats.setdefault(name, OperationStats())
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            excluded_before = self.excluded
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                if excluded:
+                    self.excluded += duration
+                else:
+                    duration -= self.excluded - excluded_before
+                stats.record(duration * 1000)
+        return wrapper
+
+    def instrument(self, obj: object, method_names: tuple[str, ...], prefix: str, excluded: bool = False) -> None:
+        """  Подмена методов объекта обёртками с замером. Отсутствующие у объекта методы пропускаются.
+
+            :param obj: объект
+            :param method_names: названия методов
+            :param prefix: префикс названий операций
+            :param excluded: время методов не входит во время охватывающих операций
+        """
+        for method_name in method_names:
+            method = getattr(obj, method_name, None)
+            if method is not None:
+                setattr(obj, method_name, self.wrap(f"{prefix}.{method_name}", method, excluded))
+
+    def instrument_router(self, router: 'Router') -> None:
+        """  Замеры BookTools и его хранилища, переходов роутера и рендера каждой страницы. """
+        self.instrument(router.book_tools, BOOK_TOOLS_METHODS, "BookTools")
+        self.instrument(router.book_tools.storage, STORAGE_METHODS, type(router.book_tools.storage).__name__)
+        self.instrument(router, ("redirect_to",), "Router")
+        for screen in router.screens.values():
+            self.instrument(screen, ("render",), type(screen).__name__)
+            # Ожидание ввода всех страниц - одна операция
+            screen.read_input = self.wrap("input", screen.read_input, excluded=True)
+
+    def get_summary_lines(self) -> list[str]:
+        """  Таблица вызванных операций по убыванию суммарного времени. """
+        stats = {name: operation for name, operation in self.stats.items() if operation.count}
+        lines = [f"{'операция':<32} {'вызовов':>8} {'всего, мс':>10} {'среднее':>9} {'p50':>9} {'p95':>9} {'макс':>9}"]
+        for name, operation in sorted(stats.items(), key=lambda item: item[1].total, reverse=True):
+            lines.append(f"{name:<32} {operation.count:>8} {operation.total:>10.1f} "
+                         f"{operation.total / operation.count:>9.3f} {operation.percentile(0.5):>9.3f} "
+                         f"{operation.percentile(0.95):>9.3f} {operation.max:>9.3f}")
+        return lines
+
+
+@contextmanager
+def profile_session(profile_path: str | None = None, memory_path: str | None = None, memory_top: int = 30
+                    ) -> Iterator[None]:
+    """  Профилирование блока: cProfile пишет статистику в profile_path (формат pstats, смотреть через
+    python -m pstats), tracemalloc - самые крупные места выделения памяти в текстовый memory_path. Пути по умолчанию
+    берутся из переменных окружения LIBRARY_PROFILE и LIBRARY_TRACE_MEMORY; если путей нет - блок выполняется как есть.
+
+        :param profile_path: файл статистики cProfile
+        :param memory_path: файл отчёта tracemalloc
+        :param memory_top: количество мест выделения памяти в отчёте
+    """
+    profile_path = profile_path or os.environ.get(PROFILE_ENV)
+    memory_path = memory_path or os.environ.get(TRACE_MEMORY_ENV)
+    profiler = cProfile.Profile() if profile_path else None
+    if memory_path:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        if memory_path:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(memory_path, "w", encoding="utf-8") as memory_file:
+                memory_file.write(f"Текущая память: {current / 2 ** 20:.1f} МБ, пик: {peak / 2 ** 20:.1f} МБ\n")
+                for statistic in snapshot.statistics("lineno")[:memory_top]:
+                    memory_file.write(f"{statistic}\n")
@@ -1,5 +1,17 @@
+import argparse
+import itertools
+import os
+import sys
+
+from batch import BatchRunner, iter_commands
 from book_helpers import BookTools, Book
-from screen_renders import HomePage, CatalogPage, ExitPage, SearchPage, AddBookPage, BookPage, UpdateBookPage, RemoveBookPage
+from bulk_io import get_file_format, import_books, export_books
+from instrumentation import Instrumentation, INSTRUMENT_ENV, PROFILE_ENV, TRACE_MEMORY_ENV, is_enabled, \
+    profile_session
+from binary_snapshot import BinarySnapshot, write_binary_snapshot
+from storage import BaseStorage, BinaryStorage, JsonStorage, SqliteStorage
+from screen_renders import Transition, HomePage, CatalogPage, ExitPage, SearchPage, AddBookPage, BookPage, UpdateBookPage, RemoveBookPage, \
+    StatsPage, IssuedBooksPage
 
 
 class Router:
@@ -7,14 +19,26 @@ class Router:
 
         Атрибуты:
         - self.book_tools: экземпляр BookTools
+        - self.page_size: количество книг на странице каталога и результатов поиска
         - self.screens: словарь зарегистрированных экземпляров страниц
+        - self.messages: сообщения для пользователя, которые будут показаны на следующем экране
+        - self.instrumentation: замеры задержек операций или None, если замеры выключены
+        - self.run(): цикл приложения, показывает страницы до выхода
         - self.redirect_to(): метод перенаправления пользователя на другую страницу
+        - self.flash(): метод добавления сообщения для следующего экрана
 
     """
 
-    def __init__(self, test_mode: bool = False) -> None:
+    def __init__(self, test_mode: bool = False, journal: bool = False, storage: BaseStorage | None = None,
+                 page_size: int = 20, cache_size: int = 128, instrumentation: Instrumentation | None = None,
+                 autosave_interval: float = 0.0, autosave_every: int = 0) -> None:
+        if page_size < 1:
+            raise ValueError("Размер страницы должен быть не меньше 1")
         self.test_mode = test_mode
-        self.book_tools = BookTools()
+        self.page_size = page_size
+        self.messages = []
+        self.book_tools = BookTools(storage=storage, journal=journal, cache_size=cache_size,
+                                    autosave_interval=autosave_interval, autosave_every=autosave_every)
         self.screens = {
             "h": HomePage(self),
             "c": CatalogPage(self),
@@ -23,19 +47,206 @@ class Router:
             "b": BookPage(self),
             "r": RemoveBookPage(self),
             "u": UpdateBookPage(self),
+            "i": StatsPage(self),
+            "v": IssuedBooksPage(self),
             "q": ExitPage(self)
         }
-        self.redirect_to("h")  # slug for HomePage
+        for slug, screen in self.screens.items():
+            screen.slug = slug
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument_router(self)
+        if not self.test_mode:
+            self.run("h")  # slug for HomePage
 
-    def redirect_to(self, screen_slug: str, **kwargs: dict[str, 'Book']) -> None:
-        """  Метод перенаправления пользователя на другую страницу.
+    def run(self, screen_slug: str, **kwargs: dict[str, 'Book']) -> None:
+        """  Цикл приложения. Страница возвращает переход на следующую страницу вместо того, чтобы вызвать её сама,
+        поэтому глубина стека не растёт с каждым экраном. Цикл завершается, когда страница вернёт None (выход).
+
+            :param screen_slug: slug первой страницы
+            :param kwargs: полезные данные
+        """
+        transition = (screen_slug, kwargs)
+        while transition is not None:
+            screen_slug, kwargs = transition
+            transition = self.screens[screen_slug].render(**kwargs)
+
+    def redirect_to(self, screen_slug: str, **kwargs: dict[str, 'Book']) -> Transition:
+        """  Метод перенаправления пользователя на другую страницу. Возвращает переход, который выполнит self.run().
 
             :param screen_slug: slug страницы
             :param kwargs: полезные данные
         """
-        if not self.test_mode:
-            self.screens[screen_slug].render(**kwargs)
+        return screen_slug, kwargs
+
+    def flash(self, message: str) -> None:
+        """  Сообщение пользователю, которое будет показано в начале следующего экрана. Вместо паузы после
+        действия, чтобы пользователь успел прочитать сообщение, - ничего не блокирует.
+
+            :param message: текст сообщения
+        """
+        self.messages.append(message)
+
+
+def get_storage(args: argparse.Namespace) -> BaseStorage:
+    """  Хранилище книг по аргументам командной строки. """
+    if args.storage == "sqlite":
+        return SqliteStorage(args.data_file or "data.db")
+    if args.storage == "binary":
+        return BinaryStorage(args.data_file or "data.bin")
+    return JsonStorage(args.data_file or "data.json", journal=args.journal, columnar=args.columnar,
+                       shared=args.shared, compact=args.compact)
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """  Пакетный режим: выполнение команд из файла без экранов приложения и вывод отчёта. """
+    file_format = get_file_format(args.commands, args.format)
+    runner = BatchRunner(BookTools(storage=get_storage(args)), save_every=args.save_every, output=sys.stdout)
+    if args.commands == "-":
+        report = runner.run(iter_commands(sys.stdin, file_format))
+    else:
+        with open(args.commands, "r", encoding="utf-8", newline="") as command_file:
+            report = runner.run(iter_commands(command_file, file_format))
+
+    for line_number, error in report.errors:
+        print(f"Строка {line_number}: {error}", file=sys.stderr)
+    print(report)
+
+
+def run_import(args: argparse.Namespace) -> None:
+    """  Потоковый импорт книг из файла с выводом ошибок по строкам и отчёта. """
+    book_tools = BookTools(storage=get_storage(args))
+    file_format = get_file_format(args.file, args.format)
+    if args.file == "-":
+        report = import_books(book_tools, sys.stdin, file_format, chunk_size=args.chunk_size)
+    else:
+        with open(args.file, "r", encoding="utf-8", newline="") as record_file:
+            report = import_books(book_tools, record_file, file_format, chunk_size=args.chunk_size)
+
+    for line_number, error in report.errors:
+        print(f"Строка {line_number}: {error}", file=sys.stderr)
+    print(report)
+
+
+def run_export(args: argparse.Namespace) -> None:
+    """  Потоковый экспорт каталога в файл. """
+    book_tools = BookTools(storage=get_storage(args))
+    file_format = get_file_format(args.file, args.format)
+    if args.file == "-":
+        export_books(book_tools, sys.stdout, file_format)
+        return
+    with open(args.file, "w", encoding="utf-8", newline="") as record_file:
+        count = export_books(book_tools, record_file, file_format)
+    print(f"Выгружено книг: {count}")
+
+
+def run_convert(args: argparse.Namespace) -> None:
+    """  Преобразование каталога без потерь между data.json и бинарным снимком .bin, по расширениям файлов, а также
+    между вариантами data.json: сжатие по расширению (.gz, .xz, .lzma) и компактный JSON (--compact).
+    """
+    if args.source.endswith(".bin"):
+        with BinarySnapshot(args.source) as snapshot:
+            JsonStorage.write_snapshot((book.to_dict() for book in snapshot), args.target, args.compact)
+            converted = len(snapshot)
+    else:
+        storage = JsonStorage(args.source)
+        # Журнал прошлой сессии применяется к снимку, иначе книги читаются из файла потоково
+        books = storage.read_books() if storage.has_journal() else storage.iter_file_books()
+        if args.target.endswith(".bin"):
+            converted = write_binary_snapshot(books, args.target)
+        else:
+            # Счётчик продвигается вместе с книгами: после записи следующее значение - количество книг
+            counter = itertools.count()
+            JsonStorage.write_snapshot((book.to_dict() for book, _ in zip(books, counter)), args.target, args.compact)
+            converted = next(counter)
+    print(f"Преобразовано книг: {converted}")
 
 
 if __name__ == "__main__":
-    Router()
+    parser = argparse.ArgumentParser(description="Консольное приложение для управления библиотекой книг")
+    parser.add_argument("--storage", choices=["json", "sqlite", "binary"], default="json", help="хранилище книг")
+    parser.add_argument("--data-file", help="путь к файлу данных (по умолчанию data.json / data.db / data.bin)")
+    parser.add_argument("--page-size", type=int, default=20,
+                        help="количество книг на странице каталога и результатов поиска")
+    parser.add_argument("--cache-size", type=int, default=128,
+                        help="количество запоминаемых результатов поиска, 0 - без кэша")
+    parser.add_argument("--columnar", action="store_true",
+                        help="хранить каталог data.json в памяти по колонкам, экономя память")
+    parser.add_argument("--journal", action="store_true",
+                        help="писать изменения в журнал data.journal вместо полной перезаписи data.json")
+    parser.add_argument("--compact", action="store_true",
+                        help="писать data.json компактным JSON без отступов (сжатие - по расширению .gz / .xz)")
+    parser.add_argument("--shared", action="store_true",
+                        help="data.json используется несколькими процессами: блокировка файла и общий счётчик id")
+    parser.add_argument("--autosave-interval", type=float, default=5.0,
+                        help="сохранять изменённые книги каждые N секунд, 0 - выключить (по умолчанию 5)")
+    parser.add_argument("--autosave-every", type=int, default=20,
+                        help="сохранять изменённые книги после N изменений, 0 - выключить (по умолчанию 20)")
+    parser.add_argument("--instrument", action="store_true",
+                        help=f"замерять задержки операций и вывести сводку при выходе (или {INSTRUMENT_ENV}=1)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help=f"записать профиль cProfile сессии в файл (или {PROFILE_ENV}=FILE)")
+    parser.add_argument("--trace-memory", metavar="FILE",
+                        help=f"записать отчёт tracemalloc о выделениях памяти в файл (или {TRACE_MEMORY_ENV}=FILE)")
+    subparsers = parser.add_subparsers(dest="command", metavar="команда",
+                                       help="без команды запускается интерактивное приложение")
+    batch_parser = subparsers.add_parser("batch", help="выполнить команды add / update / remove / search из файла")
+    batch_parser.add_argument("commands", help="файл команд в формате JSON-lines или CSV, '-' - стандартный ввод")
+    batch_parser.add_argument("--format", choices=["jsonl", "csv"],
+                              help="формат файла команд (по умолчанию - по расширению файла)")
+    batch_parser.add_argument("--save-every", type=int, default=0,
+                              help="сохранять изменения каждые N команд (по умолчанию - один раз в конце)")
+    import_parser = subparsers.add_parser("import", help="импортировать книги из файла JSON-lines или CSV")
+    import_parser.add_argument("file", help="файл с колонками title, author, year, status; '-' - стандартный ввод")
+    import_parser.add_argument("--format", choices=["jsonl", "csv"],
+                               help="формат файла (по умолчанию - по расширению файла)")
+    import_parser.add_argument("--chunk-size", type=int, default=10_000,
+                               help="количество строк, проверяемых и добавляемых одной пачкой")
+    export_parser = subparsers.add_parser("export", help="выгрузить каталог в файл JSON-lines или CSV")
+    export_parser.add_argument("file", help="файл для выгрузки, '-' - стандартный вывод")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"],
+                               help="формат файла (по умолчанию - по расширению файла)")
+    convert_parser = subparsers.add_parser("convert", help="преобразовать data.json в бинарный снимок .bin, обратно "
+                                                           "или в сжатый data.json.gz / data.json.xz")
+    convert_parser.add_argument("source", help="исходный файл: data.json (в том числе сжатый) или снимок .bin")
+    convert_parser.add_argument("target", help="файл результата: снимок .bin или data.json (в том числе сжатый)")
+    args = parser.parse_args()
+    if args.page_size < 1:
+        parser.error("--page-size должен быть не меньше 1")
+    if args.cache_size < 0:
+        parser.error("--cache-size не может быть отрицательным")
+    if args.storage != "json" and (args.journal or args.columnar or args.shared or args.compact):
+        parser.error("--journal, --columnar, --shared и --compact применимы только к хранилищу json")
+    if args.shared and args.journal:
+        parser.error("--shared несовместим с --journal")
+    if args.autosave_interval < 0 or args.autosave_every < 0:
+        parser.error("--autosave-interval и --autosave-every не могут быть отрицательными")
+
+    if args.command == "batch" and args.save_every < 0:
+        parser.error("--save-every не может быть отрицательным")
+    if args.command == "import" and args.chunk_size < 1:
+        parser.error("--chunk-size должен быть не меньше 1")
+    if args.command == "convert":
+        if args.source.endswith(".bin") and args.target.endswith(".bin"):
+            parser.error("хотя бы один из файлов convert должен быть data.json")
+        if os.path.abspath(args.source) == os.path.abspath(args.target):
+            parser.error("файл результата convert должен отличаться от исходного")
+        if not os.path.exists(args.source):
+            parser.error(f"файл {args.source} не найден")
+
+    with profile_session(args.profile, args.trace_memory):
+        if args.command == "batch":
+            run_batch(args)
+        elif args.command == "import":
+            run_import(args)
+        elif args.command == "export":
+            run_export(args)
+        elif args.command == "convert":
+            run_convert(args)
+        else:
+            instrumentation = Instrumentation() if is_enabled(args.instrument) else None
+            # В режиме shared каждое изменение и так сохраняется сразу
+            autosave = not args.shared
+            Router(storage=get_storage(args), page_size=args.page_size, cache_size=args.cache_size,
+                   instrumentation=instrumentation, autosave_interval=args.autosave_interval if autosave else 0,
+                   autosave_every=args.autosave_every if autosave else 0)
@@ -0,0 +1,225 @@
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterator
+
+STATUSES = ["В наличии", "Выдана"]
+
+
+class Book:
+    """  Класс для репрезентации объекта книги. Атрибуты хранятся в __slots__, без словаря __dict__ у каждой книги. """
+    __slots__ = ("id", "title", "author", "year", "status")
+    fields = __slots__
+
+    def __init__(self, id: int, title: str, author: str, year: str, status: str = "В наличии") -> None:
+        """ Инициализация объекта книги.
+
+            :param id: идентификатор книги
+            :param title: название книги
+            :param author: автор книги
+            :param year: год издания книги
+            :param status: статус книги, по умолчанию 'В наличии'
+        """
+        self.id = id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = status
+
+    def __repr__(self) -> str:
+        return f"{self.id}. {self.title}, {self.author}, {self.year}, {self.status}"
+
+    def full_repr(self) -> str:
+        return f" id: {self.id}\n Название: {self.title}\n Автор: {self.author}\n Год издания: {self.year}\n Статус: {self.status}"
+
+    def to_dict(self) -> dict:
+        """  Словарь полей книги для сериализации в JSON. """
+        return {field: getattr(self, field) for field in self.fields}
+
+
+class ColumnarCatalog:
+    """  Компактное хранение каталога по колонкам вместо отдельного объекта на каждую книгу.
+
+        - id - array('I'), год - array('H'), статус - код в array('B') по таблице статусов
+        - названия и авторы - списки интернированных строк, повторяющиеся значения хранятся один раз
+        - объекты Book создаются по запросу и не хранятся. Изменения объекта нужно записать обратно
+        через catalog[book.id] = book
+        - при удалении строка помечается удалённой, колонки перестраиваются, когда удалённых строк больше половины
+        - книга ищется по id двоичным поиском, пока id идут по возрастанию (как их назначает add_book),
+        иначе - через словарь id -> строка
+
+        Год, который нельзя хранить числом без потерь (не цифры, ведущий ноль), хранится строкой в отдельном словаре.
+        Класс повторяет ту часть интерфейса словаря id -> книга, которой пользуется JsonStorage.
+    """
+    deleted_code = 255
+    raw_year = 0xFFFF
+
+    def __init__(self, book_list: list[Book] = ()) -> None:
+        """ Инициализация каталога.
+
+            :param book_list: список книг
+        """
+        self.ids = array("I")
+        self.years = array("H")
+        self.statuses = array("B")
+        self.titles = []
+        self.authors = []
+        self.raw_years = {}
+        self.status_codes = {status: code for code, status in enumerate(STATUSES)}
+        self.status_names = list(STATUSES)
+        self.row_index = None
+        self.deleted = 0
+        for book in book_list:
+            self[book.id] = book
+
+    def __len__(self) -> int:
+        return len(self.ids) - self.deleted
+
+    def get_row(self, book_id: int) -> int | None:
+        """  Номер строки книги с id. None - если книги нет. """
+        if self.row_index is not None:
+            return self.row_index.get(book_id)
+        row = bisect_left(self.ids, book_id)
+        if row < len(self.ids) and self.ids[row] == book_id and self.statuses[row] != self.deleted_code:
+            return row
+        return None
+
+    def get_status_code(self, status: str) -> int:
+        """  Код статуса. Неизвестные статусы добавляются в таблицу. """
+        code = self.status_codes.get(status)
+        if code is None:
+            code = len(self.status_names)
+            if code >= self.deleted_code:
+                raise ValueError("Слишком много разных статусов книг")
+            self.status_codes[status] = code
+            self.status_names.append(status)
+        return code
+
+    def set_row(self, row: int, book: Book) -> None:
+        """  Запись полей книги в строку колонок. """
+        self.titles[row] = sys.intern(book.title)
+        self.authors[row] = sys.intern(book.author)
+        self.statuses[row] = self.get_status_code(book.status)
+        self.raw_years.pop(row, None)
+        year = str(book.year)
+        if year.isdigit() and str(int(year)) == year and int(year) < self.raw_year:
+            self.years[row] = int(year)
+        else:
+            self.years[row] = self.raw_year
+            self.raw_years[row] = book.year
+
+    def make_book(self, row: int) -> Book:
+        """  Создание объекта книги по строке колонок. """
+        year = self.years[row]
+        return Book(
+            self.ids[row],
+            self.titles[row],
+            self.authors[row],
+            self.raw_years[row] if year == self.raw_year else str(year),
+            self.status_names[self.statuses[row]],
+        )
+
+    def get_value(self, book_id: int, field: str) -> str | None:
+        """  Значение поля книги строкой без создания объекта книги. None - если книги нет. """
+        row = self.get_row(book_id)
+        return None if row is None else self.get_row_value(row, field)
+
+    def get_row_value(self, row: int, field: str) -> str:
+        """  Значение поля строкой по номеру строки колонок. """
+        match field:
+            case "title":
+                return self.titles[row]
+            case "author":
+                return self.authors[row]
+            case "status":
+                return self.status_names[self.statuses[row]]
+            case "year":
+                year = self.years[row]
+                return str(self.raw_years[row]) if year == self.raw_year else str(year)
+        return str(self.ids[row])
+
+    def iter_values(self, field: str) -> Iterator[tuple[int, str]]:
+        """  Пары (id, значение поля строкой) неудалённых книг в порядке добавления. """
+        if field in ("title", "author"):
+            column = self.titles if field == "title" else self.authors
+            return ((self.ids[row], column[row]) for row in self.iter_rows())
+        return ((self.ids[row], self.get_row_value(row, field)) for row in self.iter_rows())
+
+    def __contains__(self, book_id: int) -> bool:
+        return self.get_row(book_id) is not None
+
+    def __getitem__(self, book_id: int) -> Book:
+        row = self.get_row(book_id)
+        if row is None:
+            raise KeyError(book_id)
+        return self.make_book(row)
+
+    def get(self, book_id: int, default: Book | None = None) -> Book | None:
+        row = self.get_row(book_id)
+        return default if row is None else self.make_book(row)
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        row = self.get_row(book_id)
+        if row is not None:
+            self.set_row(row, book)
+            return
+
+        # Новая книга добавляется в конец. Если id нарушает порядок возрастания - переходим на словарь
+        if self.row_index is None and self.ids and book_id <= self.ids[-1]:
+            self.row_index = {self.ids[row]: row for row in range(len(self.ids))
+                              if self.statuses[row] != self.deleted_code}
+        row = len(self.ids)
+        self.ids.append(book_id)
+        self.years.append(0)
+        self.statuses.append(0)
+        self.titles.append("")
+        self.authors.append("")
+        self.set_row(row, book)
+        if self.row_index is not None:
+            self.row_index[book_id] = row
+
+    def pop(self, book_id: int, default: Book | None = None) -> Book | None:
+        row = self.get_row(book_id)
+        if row is None:
+            return default
+        book = self.make_book(row)
+
+        self.statuses[row] = self.deleted_code
+        self.titles[row] = self.authors[row] = ""
+        self.raw_years.pop(row, None)
+        if self.row_index is not None:
+            del self.row_index[book_id]
+        self.deleted += 1
+        self.trim_tail()
+        if self.deleted * 2 > len(self.ids):
+            self.compact()
+        return book
+
+    def trim_tail(self) -> None:
+        """  Удаление помеченных строк с конца колонок, чтобы id снова добавленной последней книги
+        не нарушал порядок возрастания. """
+        while self.ids and self.statuses[-1] == self.deleted_code:
+            for column in (self.ids, self.years, self.statuses, self.titles, self.authors):
+                column.pop()
+            self.deleted -= 1
+
+    def compact(self) -> None:
+        """  Перестроение колонок без удалённых строк. """
+        book_list = list(self.values())
+        self.__init__()
+        for book in book_list:
+            self[book.id] = book
+
+    def iter_rows(self, reverse: bool = False) -> Iterator[int]:
+        """  Номера строк неудалённых книг в порядке добавления. """
+        rows = range(len(self.ids) - 1, -1, -1) if reverse else range(len(self.ids))
+        return (row for row in rows if self.statuses[row] != self.deleted_code)
+
+    def __iter__(self) -> Iterator[int]:
+        return (self.ids[row] for row in self.iter_rows())
+
+    def __reversed__(self) -> Iterator[int]:
+        return (self.ids[row] for row in self.iter_rows(reverse=True))
+
+    def values(self) -> Iterator[Book]:
+        return (self.make_book(row) for row in self.iter_rows())
@@ -1,6 +1,7 @@
-import time
-from typing import TYPE_CHECKING, Union, Optional, Dict
+import sys
+from typing import TYPE_CHECKING, Union, Optional, Dict, Any
 
+from sorted_index import SORTED_FIELDS
 from validators import validate_form_fields
 
 if TYPE_CHECKING:
@@ -8,6 +9,9 @@ if TYPE_CHECKING:
     from main import Router
     from book_helpers import Book
 
+# Переход на следующий экран: (slug страницы, kwargs для её render). None - завершение работы приложения
+Transition = Optional[tuple[str, Dict[str, Any]]]
+
 
 class BasePage:
     """ Базовый класс для наследуемых страниц.
@@ -17,63 +21,115 @@ class BasePage:
         - Определить в нем необходимые атрибуты (`title`, `page_links`).
         - Зарегистрировать страницу в роутере (Router) в main.py
 
+        Страница не вызывает другие страницы сама: render и process_user_input возвращают переход на следующий экран
+        (Transition, обычно через self.router.redirect_to), а роутер выполняет его в своём цикле.
+
         Атрибуты:
             router: экземпляр роутера
+            slug: slug страницы, назначается роутером при регистрации
             title: заголовок страницы, выводится в меню
             page_links: список slug страниц, зарегистрированных в роутере
     """
     def __init__(self, router: 'Router') -> None:
         self.router = router
+        self.slug = ""
         self.title = "Page title"
         self.page_links = []
 
-    def render(self, **kwargs) -> None:
+    def render(self, **kwargs) -> Transition:
         """ Рендерит контент страницы, обрабатываетввод и направляет пользователя на другие страницы. Порядок работы:
             - Выводит контент страницы
             - Выводит меню страницы
             - Запрашивает ввод пользователя
-            - Обрабатывает ввод пользователя
+            - Обрабатывает ввод пользователя и возвращает переход на следующий экран
 
             Аргументы:
                 **kwargs: доп. параметры  для дочерней страницы
         """
+        self.print_messages()
         self.get_page_content(**kwargs)
         self.print_menu()
-        input_string = input("\n-Ваш ввод: ")
-        self.process_user_input(input_string, **kwargs)
+        input_string = self.read_input("\n-Ваш ввод: ")
+        return self.process_user_input(input_string, **kwargs)
+
+    def read_input(self, prompt: str) -> str:
+        """ Запрашивает ввод пользователя. Отдельный метод, чтобы замеры не учитывали время ожидания ввода. """
+        return input(prompt)
 
     def get_page_content(self, **kwargs) -> None:
         """ Выводит контент и список действий на странице. """
         print(self.title)
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
         """  Обрабатывает ввод пользователя. Вызывается в дочерних классах, чтобы перемещаться по меню. Т.е.:
             - Если в дочерней странице при обработке ввода не нашлось совпадений по действиям, можно вызвать этот метод для
             перебора по self.page_links.
             - Если в self.page_links таких ссылок нет, остаёмся на текущей странице.
         """
         if input_string in self.router.screens:
-            self.router.redirect_to(input_string)
+            return self.router.redirect_to(input_string)
         else:
-            print("\n--- Некорректный ввод ---")
-            time.sleep(1)
-            self.render(**kwargs)
+            self.router.flash("\n--- Некорректный ввод ---")
+            return self.router.redirect_to(self.slug, **kwargs)
+
+    def print_messages(self) -> None:
+        """ Печатает сообщения, накопленные роутером с прошлого экрана (например, об успешном добавлении книги). """
+        if self.router.messages:
+            self.print_lines(self.router.messages)
+            self.router.messages.clear()
 
     def print_menu(self) -> None:
         """ Печатает меню страницы в формате: slug - page title. Если у страницы есть НЕпустой self.page_links, то
         вконце каждой страницы печатает его."""
         if self.page_links:
-            print("\n------")
-            print("Выберите slug страницы, на которую хотите перейти:")
-            for slug in self.page_links:
-                print(f"{slug} - {self.router.screens[slug].title}")
+            lines = ["\n------", "Выберите slug страницы, на которую хотите перейти:"]
+            lines.extend(f"{slug} - {self.router.screens[slug].title}" for slug in self.page_links)
+            self.print_lines(lines)
 
     @staticmethod
     def print_header(text: str) -> None:
         """ Печатает красивую шапку страницы. """
-        print("\n---------------------------------------")
-        print(text)
-        print("---------------------------------------\n")
+        print(f"\n---------------------------------------\n{text}\n---------------------------------------\n")
+
+    @staticmethod
+    def print_lines(lines: list[str]) -> None:
+        """ Печатает строки одной буферизованной записью вместо print на каждую строку. """
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def get_page_number(input_string: str, page: int) -> int | None:
+        """ Номер страницы списка по вводу пользователя: '>' - следующая, '<' - предыдущая, 'p<N>' - страница N.
+        None - если ввод не относится к переключению страниц.
+
+            :param input_string: ввод пользователя
+            :param page: номер текущей страницы
+        """
+        match input_string:
+            case ">":
+                return page + 1
+            case "<":
+                return max(page - 1, 1)
+        if input_string.startswith("p") and input_string[1:].isdigit() and int(input_string[1:]) > 0:
+            return int(input_string[1:])
+        return None
+
+    @staticmethod
+    def get_book_page_lines(book_list: list['Book'], page: int, has_next: bool) -> list[str]:
+        """ Строки страницы списка книг с подсказками по переключению страниц.
+
+            :param book_list: книги текущей страницы
+            :param page: номер текущей страницы
+            :param has_next: есть ли следующая страница
+        """
+        lines = [repr(item) for item in book_list]
+        lines.append(f"\n[Страница {page}]")
+        if page > 1:
+            lines.append("< - Предыдущая страница")
+        if has_next:
+            lines.append("> - Следующая страница")
+        if page > 1 or has_next:
+            lines.append("p<N> - Перейти на страницу N")
+        return lines
 
 
 class HomePage(BasePage):
@@ -86,6 +142,7 @@ class HomePage(BasePage):
             "c",  # slug for CatalogPage
             "s",  # slug for SearchPage
             "n",  # slug for AddBookPage
+            "i",  # slug for StatsPage
             "q",  # slug for Exit
         ]
 
@@ -107,68 +164,178 @@ class CatalogPage(BasePage):
             "h",  # slug for HomePage
         ]
 
-    def get_page_content(self) -> None:
+    def get_page_content(self, page: int = 1) -> None:
+        """ Выводит одну страницу каталога. Из хранилища читаются только книги этой страницы. """
         self.print_header(f"[{self.title}]")
 
-        book_list = self.router.book_tools.get_book_list()
-        if not book_list:
+        book_list, has_next = self.router.book_tools.get_page(page, self.router.page_size)
+        if not book_list and page == 1:
             print("В вашей библиотеке нет книг. Добавьте книги на странице создания книги")
+        elif not book_list:
+            self.print_lines([f"На странице {page} нет книг", "p1 - Перейти на первую страницу"])
         else:
-            print("Введите id книги, к которой хотите перейти:")
-            for item in self.router.book_tools.get_book_list():
-                print(item)
+            self.print_lines(["Введите id книги, к которой хотите перейти:",
+                              *self.get_book_page_lines(book_list, page, has_next)])
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
-        """ Если пользователь ввёл id книги, то перебирает список книг и проверяет есть ли книга с таким id.
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
+        """ Если пользователь ввёл команду переключения страницы - показывает нужную страницу каталога.
+            Если пользователь ввёл id книги, то проверяет есть ли книга с таким id.
             Если есть - переводит пользователя на страницу книги.
             Если ввод пользователя - не id или такой книги нет, то передаём ввод в обработку родительскому классу.
         """
+        page = self.get_page_number(input_string, kwargs.get("page", 1))
+        if page is not None:
+            return self.router.redirect_to('c', page=page)
+
         result_search = self.router.book_tools.search_books(input_string, ['id'], strong=True)
 
         if result_search:
-            self.router.redirect_to('b', book_object=result_search[0])
+            return self.router.redirect_to('b', book_object=result_search[0])
         else:
-            super().process_user_input(input_string, **kwargs)
+            return super().process_user_input(input_string, **kwargs)
 
 
-class SearchPage(BasePage):
+class StatsPage(BasePage):
+    """ Статистика библиотеки: количество книг всего и по статусам. Счётчики ведёт BookTools, каталог не
+    перебирается. """
+
     def __init__(self, router: 'Router') -> None:
         super().__init__(router)
-        self.title = "Поиск книг"
+        self.title = "Статистика"
         self.page_links = [
-            "s",  # slug for Search item
+            "v",  # slug for IssuedBooksPage
             "c",  # slug for CatalogPage
+            "h",  # slug for HomePage
         ]
 
     def get_page_content(self, **kwargs) -> None:
         self.print_header(f"[{self.title}]")
-        print("Введите текст для поиска книг по полям: title | author | year: ")
+        status_counts = self.router.book_tools.get_status_counts()
+        self.print_lines([f"Всего книг: {sum(status_counts.values())}",
+                          *(f"{status}: {count}" for status, count in status_counts.items())])
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
-        """ Если есть результаты поиска - показывает ссылки на них.
-            Если нет - предложение повторить поиск.
-        """
-        self.print_header(f"Результаты поиска: [{input_string}]")
 
-        # Поиск книг
-        result_search = self.router.book_tools.search_books(input_string, ['title', 'author', 'year'])
+class IssuedBooksPage(BasePage):
+    """ Список выданных книг постранично. Книги берутся из индекса статусов, а не перебором каталога. """
+
+    def __init__(self, router: 'Router') -> None:
+        super().__init__(router)
+        self.title = "Выданные книги"
+        self.status = "Выдана"
+        self.page_links = [
+            "i",  # slug for StatsPage
+            "c",  # slug for CatalogPage
+            "h",  # slug for HomePage
+        ]
+
+    def get_page_content(self, page: int = 1) -> None:
+        self.print_header(f"[{self.title}]")
+        book_list = self.router.book_tools.get_books_by_status(self.status)
+        page_size = self.router.page_size
+        page_books = book_list[(page - 1) * page_size:page * page_size]
+        if page_books:
+            self.print_lines([f"Выдано книг: {len(book_list)}. Введите id книги, к которой хотите перейти:",
+                              *self.get_book_page_lines(page_books, page, len(book_list) > page * page_size)])
+        elif book_list:
+            self.print_lines([f"На странице {page} нет книг", "p1 - Перейти на первую страницу"])
+        else:
+            print("Выданных книг нет.")
+
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
+        """ Переключает страницы списка или переводит на страницу книги по id. """
+        page = self.get_page_number(input_string, kwargs.get("page", 1))
+        if page is not None:
+            return self.router.redirect_to(self.slug, page=page)
+
+        result_search = self.router.book_tools.search_books(input_string, ['id'], strong=True)
         if result_search:
-            print("Введите номер книги, к которой хотите перейти:")
-            for item in result_search:
-                print(item)
+            return self.router.redirect_to('b', book_object=result_search[0])
+        return super().process_user_input(input_string, **kwargs)
+
+
+class SearchPage(BasePage):
+    """ Страница поиска книг. Результаты поиска выводятся постранично. """
+    def __init__(self, router: 'Router') -> None:
+        super().__init__(router)
+        self.title = "Поиск книг"
+        self.page_links = [
+            "s",  # slug for Search item
+            "c",  # slug for CatalogPage
+        ]
+
+    def get_page_content(self, **kwargs) -> None:
+        """ Без запроса - выводит форму поиска, с запросом (kwargs: query, result_search, page) - страницу
+        результатов поиска. """
+        if "query" not in kwargs:
+            self.print_header(f"[{self.title}]")
+            self.print_lines([
+                "Введите текст для поиска книг по полям: title | author | year",
+                "Диапазон значений поля: year:1900..1950, author:А..В (границу можно не указывать: year:1900..)",
+                "Год или начало строки: year:1917, author:Тол, title:Война",
+                "Поиск с опечатками по названию и автору, по убыванию сходства: ~Талстой",
+            ])
+            return
+
+        # Страница результатов поиска, строки формируются только для книг текущей страницы
+        self.print_header(f"Результаты поиска: [{kwargs['query']}]")
+        result_search, page, page_size = kwargs["result_search"], kwargs["page"], self.router.page_size
+        book_list = result_search[(page - 1) * page_size:page * page_size]
+        if book_list:
+            self.print_lines([f"Найдено книг: {len(result_search)}. Введите номер книги, к которой хотите перейти:",
+                              *self.get_book_page_lines(book_list, page, len(result_search) > page * page_size)])
+        elif result_search:
+            self.print_lines([f"На странице {page} нет книг", "p1 - Перейти на первую страницу"])
         else:
             print("Пусто! Таких книг не найдено, попробуйте другой поиск.")
 
-        # Показываем меню, чтобы можно было искать заново
-        self.print_menu()
-        input_string = input("\n-Ваш ввод: ")
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
+        """ Если запроса ещё нет - ищет книги и показывает первую страницу результатов.
+            На странице результатов переключает страницы или переводит на страницу книги.
+        """
+        if "query" not in kwargs:
+            result_search = self.find_books(input_string)
+            if result_search is None:
+                self.router.flash("\n--- Некорректный ввод: укажите хотя бы одну границу, границы года должны быть "
+                                  "числами ---")
+                return self.router.redirect_to('s')
+            return self.router.redirect_to('s', query=input_string, result_search=result_search, page=1)
+
+        page = self.get_page_number(input_string, kwargs["page"])
+        if page is not None:
+            return self.router.redirect_to('s', **{**kwargs, "page": page})
 
         # Если переход по существующему id - редирект на книгу, если нет - передаём в родительский обработчик
         result_search = self.router.book_tools.search_books(input_string, ['id'], strong=True)
         if result_search:
-            self.router.redirect_to('b', book_object=result_search[0])
+            return self.router.redirect_to('b', book_object=result_search[0])
         else:
-            super().process_user_input(input_string, **kwargs)
+            return super().process_user_input(input_string, **kwargs)
+
+    def find_books(self, input_string: str) -> Union[list['Book'], None]:
+        """ Поиск книг по вводу пользователя:
+            - поле:от..до - значение поля year / author / title в диапазоне, через отсортированный индекс
+            - поле:значение - год равен значению, автор или название начинается со значения
+            - ~запрос - нечёткий поиск по названию и автору с допуском опечаток, лучшие совпадения первыми
+            - иначе - поиск по вхождению в название, автора, год
+            None - если не указана ни одна граница или границы года заданы не числами.
+        """
+        if input_string.startswith("~"):
+            return self.router.book_tools.search_fuzzy(input_string[1:])
+
+        field, separator, value = input_string.partition(":")
+        if not separator or field not in SORTED_FIELDS:
+            return self.router.book_tools.search_books(input_string, ['title', 'author', 'year'])
+
+        low, separator, high = (bound.strip() for bound in value.partition(".."))
+        if not separator:
+            high = low
+        low, high = low or None, high or None
+        # "author:" или "title:.." без границ вывели бы весь каталог
+        if low is None and high is None:
+            return None
+        if field == "year" and not all(bound is None or bound.isdecimal() for bound in (low, high)):
+            return None
+        return self.router.book_tools.search_range(field, low, high)
 
 
 class BookPage(BasePage):
@@ -194,14 +361,14 @@ class BookPage(BasePage):
         print("u - Поменять статус")  # slug for UpdateBookPage
         print("r - Удалить книгу")  # slug for RemoveBookPage
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
         match input_string:
             case "u":
-                self.router.redirect_to('u', book_object=kwargs['book_object'])
+                return self.router.redirect_to('u', book_object=kwargs['book_object'])
             case "r":
-                self.router.redirect_to('r', book_object=kwargs['book_object'])
+                return self.router.redirect_to('r', book_object=kwargs['book_object'])
             case _:
-                super().process_user_input(input_string, **kwargs)
+                return super().process_user_input(input_string, **kwargs)
 
 
 class AddBookPage(BasePage):
@@ -220,7 +387,12 @@ class AddBookPage(BasePage):
         self.temp_author = ""
         self.temp_year = ""
 
-    def get_page_content(self) -> None:
+    def render(self, **kwargs) -> Transition:
+        """ У формы нет меню: ввод запрашивается в цикле формы, переход возвращается после добавления книги. """
+        self.print_messages()
+        return self.get_page_content()
+
+    def get_page_content(self) -> Transition:
         """ Пользователь находится в цикле до тех пор, пока все данные не будут заполнены и не пройдут валидацию. """
         self.print_header(f"[{self.title}]")
 
@@ -230,14 +402,18 @@ class AddBookPage(BasePage):
             "year": "Введите год издания:",
         }
 
-        # Цикл формы
+        # Цикл формы. Переход возвращается сразу после добавления книги: временные переменные к этому моменту уже
+        # очищены, и цикл иначе запросил бы поле заново
         for field, value in form_fields.items():
             while not getattr(self, f"temp_{field}", None):
                 print(value)
-                input_string = input("\n-Ваш ввод: ")
-                self.process_user_input(input_string, field=field)
+                input_string = self.read_input("\n-Ваш ввод: ")
+                transition = self.process_user_input(input_string, field=field)
+                if transition is not None:
+                    return transition
+        return None
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
         field = kwargs['field']
 
         # Валидация ввода
@@ -253,13 +429,14 @@ class AddBookPage(BasePage):
 
             # Добавляем книгу
             self.router.book_tools.add_book(self.temp_title, self.temp_author, self.temp_year)
+            self.router.flash("Книга успешно добавлена!")
 
             # Очищаем временные переменные
             if not self.router.test_mode:
                 self.temp_title, self.temp_author, self.temp_year = "", "", ""
 
             # Редирект на каталог
-            self.router.redirect_to('c')
+            return self.router.redirect_to('c')
 
 
 class UpdateBookPage(BasePage):
@@ -279,16 +456,18 @@ class UpdateBookPage(BasePage):
         print("1. В наличии")
         print("2. Выдана")
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
         match input_string:
             case "1":
                 self.router.book_tools.update_book(kwargs['book_object'], "status", "В наличии")
-                self.router.redirect_to('b', book_object=kwargs['book_object'])
+                self.router.flash("Книга успешно обновлена!")
+                return self.router.redirect_to('b', book_object=kwargs['book_object'])
             case "2":
                 self.router.book_tools.update_book(kwargs['book_object'], "status", "Выдана")
-                self.router.redirect_to('b', book_object=kwargs['book_object'])
-            # case _:
-            #     super().process_user_input(input_string, **kwargs)
+                self.router.flash("Книга успешно обновлена!")
+                return self.router.redirect_to('b', book_object=kwargs['book_object'])
+            case _:
+                return super().process_user_input(input_string, **kwargs)
 
 
 class RemoveBookPage(BasePage):
@@ -303,22 +482,28 @@ class RemoveBookPage(BasePage):
         print("1. Да")
         print("2. Нет")
 
-    def process_user_input(self, input_string: str, **kwargs) -> None:
+    def process_user_input(self, input_string: str, **kwargs) -> Transition:
         match input_string:
             case "1":
                 self.router.book_tools.remove_book(kwargs['book_object'].id)
-                self.router.redirect_to('c')
+                self.router.flash("Книга успешно удалена!")
+                return self.router.redirect_to('c')
             case _:
-                self.router.redirect_to('c')
+                return self.router.redirect_to('c')
 
 
 class ExitPage(BasePage):
-    """  Выход из приложения. Перед выходом сохраняет актуальный список книг. """
+    """  Выход из приложения. Перед выходом сохраняет актуальный список книг и завершает цикл роутера.
+        Если включены замеры - выводит сводку задержек операций за сессию.
+    """
     def __init__(self, router: 'Router') -> None:
         super().__init__(router)
         self.title = "Выход"
 
-    def render(self) -> None:
+    def render(self, **kwargs) -> Transition:
         self.router.book_tools.save_book_list()
+        if self.router.instrumentation is not None:
+            self.print_header("Задержки операций за сессию, мс")
+            self.print_lines(self.router.instrumentation.get_summary_lines())
         self.print_header("Всего доброго! Приходите ещё!")
-        exit()
+        return None
@@ -0,0 +1,209 @@
+from array import array
+from collections import defaultdict
+from typing import Iterable
+
+from models import Book, ColumnarCatalog
+
+
+class SearchIndex:
+    """  Инвертированный индекс для поиска книг по вхождению подстроки.
+
+        Для каждого поля хранятся исходный текст, текст в нижнем регистре (вычисляется один раз при индексации) и
+        словарь триграмма -> множество id книг. Триграммы строятся по тексту после casefold, поэтому они не зависят
+        от регистра. Поиск выбирает кандидатов пересечением множеств триграмм запроса и проверяет только их:
+        результат совпадает с полным перебором, но без обхода всего каталога.
+        Запросы короче триграммы проверяются по закэшированным строкам без повторного приведения регистра.
+
+        Компактный режим (catalog - ColumnarCatalog): тексты полей и порядок выдачи не копируются в индекс, а
+        читаются из колонок каталога, множества id триграмм заменены массивами array('I'). При удалении и изменении
+        книги её прежние триграммы не вычищаются: устаревших кандидатов отсеивает проверка по тексту из каталога,
+        а сам индекс перестраивается при следующей загрузке каталога.
+    """
+    gram_size = 3
+
+    def __init__(self, fields: tuple[str, ...] = ("title", "author", "year", "status"),
+                 catalog: ColumnarCatalog | None = None) -> None:
+        """ Инициализация пустого индекса.
+
+            :param fields: индексируемые поля книги
+            :param catalog: каталог по колонкам для компактного режима, книги добавляются в него до индексации
+        """
+        self.fields = fields
+        self.catalog = catalog
+        self.texts = {field: {} for field in fields}
+        self.folded = {field: {} for field in fields}
+        self.grams = {field: defaultdict(set if catalog is None else self.make_postings) for field in fields}
+        self.order = {}
+        self.counter = 0
+
+    @staticmethod
+    def make_postings() -> array:
+        """  Список id книг триграммы в компактном режиме. """
+        return array("I")
+
+    @classmethod
+    def get_grams(cls, text: str) -> set[str]:
+        """  Множество триграмм строки после casefold. """
+        text = text.casefold()
+        return {text[i:i + cls.gram_size] for i in range(len(text) - cls.gram_size + 1)}
+
+    def add_book(self, book: Book) -> None:
+        """  Индексация книги. Позиция книги в выдаче сохраняется при повторной индексации.
+
+            :param book: объект книги
+        """
+        if self.catalog is not None:
+            for field in self.fields:
+                for gram in self.get_grams(str(getattr(book, field)).lower()):
+                    self.grams[field][gram].append(book.id)
+            return
+
+        if book.id not in self.order:
+            self.order[book.id] = self.counter
+            self.counter += 1
+
+        for field in self.fields:
+            text = str(getattr(book, field))
+            folded = text.lower()
+            self.texts[field][book.id] = text
+            self.folded[field][book.id] = folded
+            for gram in self.get_grams(folded):
+                self.grams[field][gram].add(book.id)
+
+    def remove_book(self, book_id: int, keep_order: bool = False) -> None:
+        """  Удаление книги из индекса.
+
+            :param book_id: идентификатор книги
+            :param keep_order: если True - позиция книги в выдаче сохраняется (для переиндексации)
+        """
+        if self.catalog is not None:
+            # Книги уже нет в каталоге - её записи в индексе отсеются проверкой
+            return
+
+        for field in self.fields:
+            folded = self.folded[field].pop(book_id, None)
+            self.texts[field].pop(book_id, None)
+            if folded is None:
+                continue
+            for gram in self.get_grams(folded):
+                postings = self.grams[field][gram]
+                postings.discard(book_id)
+                if not postings:
+                    del self.grams[field][gram]
+        if not keep_order:
+            self.order.pop(book_id, None)
+
+    def update_book(self, book: Book, old_id: int | None = None) -> None:
+        """  Переиндексация книги после изменения её полей.
+
+            :param book: объект книги с новыми значениями
+            :param old_id: прежний id книги, если он изменился
+        """
+        if self.catalog is not None:
+            self.add_book(book)
+            return
+
+        if old_id is not None and old_id != book.id:
+            position = self.order.pop(old_id, None)
+            self.remove_book(old_id)
+            if position is not None:
+                self.order[book.id] = position
+        else:
+            self.remove_book(book.id, keep_order=True)
+        self.add_book(book)
+
+    def get_candidates(self, query: str, field: str) -> set[int] | None:
+        """  id книг, поле которых содержит все триграммы запроса. None - если в запросе нет ни одной триграммы.
+
+            :param query: строка поиска
+            :param field: поле поиска
+        """
+        grams = self.get_grams(query)
+        if not grams:
+            return None
+
+        postings = []
+        for gram in grams:
+            gram_ids = self.grams[field].get(gram)
+            if not gram_ids:
+                return set()
+            postings.append(gram_ids)
+        postings.sort(key=len)
+        if self.catalog is not None:
+            # Пересечение массивов обошло бы их целиком - достаточно самого короткого, остальное отсеет проверка
+            return set(postings[0])
+        return postings[0].intersection(*postings[1:])
+
+    def match_field(self, query: str, field: str, strong: bool = False) -> set[int]:
+        """  id книг, поле которых содержит запрос.
+
+            :param query: строка поиска
+            :param field: поле поиска
+            :param strong: если True - с учётом регистра, если False - без
+        """
+        if self.catalog is not None:
+            return self.match_catalog_field(query, field, strong)
+
+        if strong:
+            values = self.texts[field]
+        else:
+            values = self.folded[field]
+            query = query.lower()
+
+        candidates = self.get_candidates(query, field)
+        if candidates is None:
+            return {book_id for book_id, text in values.items() if query in text}
+        return {book_id for book_id in candidates if query in values[book_id]}
+
+    def match_catalog_field(self, query: str, field: str, strong: bool = False,
+                            book_ids: Iterable[int] | None = None) -> set[int]:
+        """  id книг, поле которых содержит запрос, с проверкой по тексту из каталога (компактный режим).
+
+            :param query: строка поиска
+            :param field: поле поиска
+            :param strong: если True - с учётом регистра, если False - без
+            :param book_ids: проверяемые id книг, по умолчанию - кандидаты по триграммам
+        """
+        if not strong:
+            query = query.lower()
+        if book_ids is None:
+            book_ids = self.get_candidates(query, field)
+            if book_ids is None:
+                # В запросе нет триграмм - проверяем колонку целиком, без поиска строки каждой книги
+                return {book_id for book_id, text in self.catalog.iter_values(field)
+                        if query in (text if strong else text.lower())}
+        result = set()
+        for book_id in book_ids:
+            text = self.catalog.get_value(book_id, field)
+            if text is not None and query in (text if strong else text.lower()):
+                result.add(book_id)
+        return result
+
+    def search(self, query: str, search_fields: list[str], strong: bool = False) -> list[int]:
+        """  Поиск id книг с той же семантикой, что и перебор в BookTools.search_books:
+            - strong=False: вхождение запроса без учёта регистра хотя бы в одно из полей
+            - strong=True: вхождение запроса с учётом регистра во все поля
+
+            :param query: строка поиска
+            :param search_fields: список полей поиска (должны быть проиндексированы)
+            :param strong: строгий режим поиска
+        """
+        if not search_fields:
+            # all() по пустому списку полей - истина, any() - ложь
+            result = set(self.catalog if self.catalog is not None else self.order) if strong else set()
+        elif strong:
+            result = self.match_field(query, search_fields[0], strong=True)
+            for field in search_fields[1:]:
+                if self.catalog is not None:
+                    result = self.match_catalog_field(query, field, strong=True, book_ids=result)
+                    continue
+                texts = self.texts[field]
+                result = {book_id for book_id in result if query in texts[book_id]}
+        else:
+            result = set()
+            for field in search_fields:
+                result |= self.match_field(query, field)
+
+        if self.catalog is not None:
+            return sorted(result, key=self.catalog.get_row)
+        return sorted(result, key=self.order.__getitem__)
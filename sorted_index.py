@@ -0,0 +1,78 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable
+
+from models import Book
+
+SORTED_FIELDS = ("year", "author", "title")
+# Символ больше любого другого: строки, начинающиеся с префикса, лежат в диапазоне [префикс, префикс + MAX_CHAR]
+MAX_CHAR = "\U0010ffff"
+
+
+def get_sort_key(field: str, value) -> int | str | None:
+    """  Ключ сортировки значения поля: год - числом, строки - после casefold. None - год не число, книга не
+    попадает в индекс года.
+
+        :param field: поле книги
+        :param value: значение поля
+    """
+    value = str(value)
+    if field == "year":
+        return int(value) if value.isdecimal() else None
+    return value.casefold()
+
+
+def get_bounds(field: str, low=None, high=None) -> tuple:
+    """  Границы ключей для запроса диапазона [low, high]. Для строк верхняя граница включает все строки,
+    начинающиеся с high, поэтому поиск по префиксу - это диапазон [префикс, префикс]. None - граница не задана.
+
+        :param field: поле книги
+        :param low: нижняя граница
+        :param high: верхняя граница
+    """
+    low_key = None if low is None else get_sort_key(field, low)
+    high_key = None if high is None else get_sort_key(field, high)
+    if field != "year" and high_key is not None:
+        high_key += MAX_CHAR
+    return low_key, high_key
+
+
+class SortedIndex:
+    """  Отсортированный индекс по одному полю: список пар (ключ, id) в порядке возрастания ключа. Запрос диапазона
+        находит границы двоичным поиском и возвращает id книг между ними - O(log N + k). Добавление и удаление -
+        двоичный поиск и сдвиг списка.
+    """
+    def __init__(self, field: str, book_list: Iterable[Book] = ()) -> None:
+        """ Инициализация индекса, книги сортируются один раз.
+
+            :param field: индексируемое поле: year, author или title
+            :param book_list: книги каталога
+        """
+        self.field = field
+        self.entries = sorted(entry for entry in map(self.get_entry, book_list) if entry[0] is not None)
+
+    def get_entry(self, book: Book) -> tuple:
+        return get_sort_key(self.field, getattr(book, self.field)), book.id
+
+    def add_book(self, book: Book) -> None:
+        entry = self.get_entry(book)
+        if entry[0] is not None:
+            insort(self.entries, entry)
+
+    def remove_book(self, book: Book) -> None:
+        """  Удаление книги из индекса. Книга должна иметь значения полей, с которыми она индексировалась. """
+        entry = self.get_entry(book)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+
+    def get_range(self, low=None, high=None) -> list[int]:
+        """  id книг с ключом в диапазоне [low, high] в порядке ключа, см. get_bounds().
+
+            :param low: нижняя граница, None - без границы
+            :param high: верхняя граница, None - без границы
+        """
+        low_key, high_key = get_bounds(self.field, low, high)
+        start = 0 if low_key is None else bisect_left(self.entries, (low_key,))
+        # (ключ, inf) больше любой пары с этим ключом
+        end = len(self.entries) if high_key is None else bisect_right(self.entries, (high_key, float("inf")))
+        return [book_id for key, book_id in self.entries[start:end]]
@@ -0,0 +1,1296 @@
+import gzip
+import io
+import json
+import lzma
+import os
+import sqlite3
+import threading
+from bisect import bisect_right, insort
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TextIO
+
+from binary_snapshot import BinarySnapshot, write_binary_snapshot
+from file_lock import SharedFileState
+from fuzzy_index import FuzzyIndex
+from models import Book, ColumnarCatalog
+from search_index import SearchIndex
+from sorted_index import SORTED_FIELDS, SortedIndex, get_bounds
+
+# Сжатие файла данных по расширению: .gz - gzip, .xz и .lzma - lzma
+COMPRESSIONS = (".gz", ".xz", ".lzma")
+# Уровень gzip: размер почти как на уровне 9, запись в несколько раз быстрее
+GZIP_LEVEL = 6
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+def get_compression(file_path: str) -> str:
+    """  Сжатие файла по расширению: ".gz", ".xz", ".lzma" или пустая строка - без сжатия. """
+    extension = os.path.splitext(file_path)[1].lower()
+    return extension if extension in COMPRESSIONS else ""
+
+
+@contextmanager
+def open_data_file(file_path: str, mode: str = "r", compression: str | None = None) -> Iterator[TextIO]:
+    """  Открытие файла данных как текстового файла UTF-8 с прозрачным сжатием. Данные сжимаются и распаковываются
+    потоково, по мере записи и чтения.
+
+    При чтении сжатие определяется по сигнатуре файла, поэтому несжатый data.json читается как раньше при любом
+    расширении. При записи сжатие выбирается по расширению file_path, а записанный файл сбрасывается на диск (fsync).
+
+        :param file_path: путь к файлу
+        :param mode: "r" - чтение, "w" - запись
+        :param compression: сжатие при записи, если имя файла временное; по умолчанию - по расширению file_path
+    """
+    with open(file_path, mode + "b") as binary_file:
+        if mode == "r":
+            signature = binary_file.peek(len(XZ_MAGIC))[:len(XZ_MAGIC)]
+            if signature.startswith(GZIP_MAGIC):
+                compression = ".gz"
+            elif signature == XZ_MAGIC:
+                compression = ".xz"
+            else:
+                # У формата .lzma нет сигнатуры - он определяется только по расширению
+                compression = ".lzma" if get_compression(file_path) == ".lzma" else ""
+        elif compression is None:
+            compression = get_compression(file_path)
+
+        match compression:
+            case ".gz":
+                stream = gzip.GzipFile(filename="", mode=mode + "b", compresslevel=GZIP_LEVEL, fileobj=binary_file)
+            case ".xz":
+                stream = lzma.LZMAFile(binary_file, mode + "b")
+            case ".lzma":
+                stream = lzma.LZMAFile(binary_file, mode + "b",
+                                       format=lzma.FORMAT_ALONE if mode == "w" else lzma.FORMAT_AUTO)
+            case _:
+                stream = binary_file
+
+        with io.TextIOWrapper(stream, encoding="utf-8") as text_file:
+            yield text_file
+            if mode == "w":
+                text_file.flush()
+                # Закрытие сжатого потока дописывает конец архива, файл при этом остаётся открытым
+                if stream is not binary_file:
+                    stream.close()
+                binary_file.flush()
+                os.fsync(binary_file.fileno())
+
+
+def iter_json_array(json_file: TextIO, chunk_size: int = 1 << 16) -> Iterator:
+    """  Потоковый разбор JSON-массива верхнего уровня: элементы отдаются по одному по мере чтения файла.
+    В памяти одновременно находится только текущий фрагмент файла, а не весь текст и весь список.
+
+        :param json_file: открытый текстовый файл
+        :param chunk_size: размер читаемого фрагмента в символах
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+
+    def next_char() -> str:
+        """ Следующий непробельный символ без его потребления. Пустая строка - конец файла. """
+        nonlocal buffer, position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            chunk = json_file.read(chunk_size)
+            if not chunk:
+                return ""
+            buffer, position = chunk, 0
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Ожидался JSON-массив", buffer, position)
+    position += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                item, end = None, None
+            # Элемент оборван концом фрагмента (число может продолжаться: "1." + "5") - дочитываем файл
+            if end is None or end == len(buffer) or buffer[end] not in ",] \t\r\n":
+                chunk = json_file.read(chunk_size)
+                if chunk:
+                    buffer, position = buffer[position:] + chunk, 0
+                    continue
+                if end is None:
+                    raise json.JSONDecodeError("Некорректный элемент JSON-массива", buffer, position)
+            break
+        position = end
+        yield item
+
+        match next_char():
+            case ",":
+                position += 1
+            case "]":
+                return
+            case _:
+                raise json.JSONDecodeError("Ожидалась ',' или ']'", buffer, position)
+
+
+class BaseStorage:
+    """  Интерфейс хранилища книг, на которое опирается BookTools.
+
+        Чтобы добавить новое хранилище нужно:
+        - Наследовать класс от BaseStorage
+        - Определить методы загрузки, чтения и изменения книг
+        - Методы поиска и постраничного чтения по умолчанию работают перебором get_books(), их стоит
+        переопределить, если хранилище умеет выполнять такие запросы эффективнее
+
+        Методы:
+        - :load(): открытие хранилища / загрузка данных
+        - :read_books(): чтение всех книг с диска
+        - :get_books(): список всех книг каталога
+        - :iter_books(): книги каталога по одной, по мере готовности
+        - :is_changed(): изменено ли хранилище извне с момента загрузки
+        - :get_book(): получение книги по id
+        - :count(): количество книг
+        - :get_page(): получение среза книг каталога
+        - :search(): поиск книг по вхождению
+        - :get_range(): книги со значением поля year / author / title в диапазоне, в порядке значения
+        - :get_prefix(): книги, у которых author / title начинается с префикса
+        - :fuzzy_search(): нечёткий поиск по названию и автору с допуском опечаток, по убыванию сходства
+        - :add_book(): добавление книги с назначением id
+        - :add_books(): массовое добавление книг с назначением id подряд
+        - :remove_book(): удаление книги
+        - :update_book(): обновление поля книги
+        - :save(): сохранение всех изменений
+        - :save_changes(): сохранение только изменённых книг в режиме отложенной записи
+        - :deferred_writes(): отложенная запись - изменения сохраняются один раз, при выходе из блока или вызове save()
+    """
+    deferred = False
+    # Количество загрузок хранилища: по нему BookTools узнаёт, что каталог перечитан
+    load_count = 0
+    # Индекс нечёткого поиска строится при первом запросе, хранилище обновляет его при изменении книг
+    fuzzy_index = None
+
+    def load(self) -> None:
+        raise NotImplementedError
+
+    def read_books(self) -> list[Book]:
+        raise NotImplementedError
+
+    def get_books(self) -> list[Book]:
+        raise NotImplementedError
+
+    def iter_books(self) -> Iterator[Book]:
+        return iter(self.get_books())
+
+    def is_changed(self) -> bool:
+        return False
+
+    def get_book(self, book_id: int) -> Book | None:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        return len(self.get_books())
+
+    def get_page(self, offset: int, limit: int) -> list[Book]:
+        """  Срез книг каталога.
+
+            :param offset: количество пропускаемых книг
+            :param limit: максимальное количество книг
+        """
+        return self.get_books()[offset:offset + limit]
+
+    def search(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book]:
+        """  Поиск книг полным перебором.
+
+            :param query: строка поиска
+            :param search_fields: список полей поиска
+            :param strong: если True - то ищем точное совпадение, если False - то вхождение
+        """
+        return self.filter_books(self.get_books(), query, search_fields, strong)
+
+    def get_range(self, field: str, low=None, high=None) -> list[Book]:
+        """  Книги, у которых значение поля в диапазоне [low, high], в порядке значения (см. sorted_index.get_bounds).
+        По умолчанию - сортировкой всего каталога.
+
+            :param field: поле: year, author или title
+            :param low: нижняя граница, None - без границы
+            :param high: верхняя граница, None - без границы
+        """
+        if field not in SORTED_FIELDS:
+            raise ValueError(f"Поиск по диапазону доступен для полей: {', '.join(SORTED_FIELDS)}")
+        books = {book.id: book for book in self.iter_books()}
+        return [books[book_id] for book_id in SortedIndex(field, books.values()).get_range(low, high)]
+
+    def get_prefix(self, field: str, prefix: str) -> list[Book]:
+        """  Книги, у которых значение поля начинается с prefix без учёта регистра, в порядке значения.
+
+            :param field: поле: author или title
+            :param prefix: начало строки
+        """
+        return self.get_range(field, prefix, prefix)
+
+    def get_fuzzy_index(self) -> FuzzyIndex:
+        """  Индекс нечёткого поиска, при первом обращении строится по всему каталогу. """
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyIndex(self.iter_books())
+        return self.fuzzy_index
+
+    def fuzzy_search(self, query: str, limit: int = 20) -> list[Book]:
+        """  Нечёткий поиск по словам названия и автора с допуском опечаток. Книги по убыванию сходства с запросом.
+
+            :param query: строка поиска
+            :param limit: максимальное количество книг
+        """
+        result = (self.get_book(book_id) for book_id, score in self.get_fuzzy_index().search(query, limit))
+        return [book for book in result if book is not None]
+
+    @staticmethod
+    def filter_books(books: Iterable[Book], query: str, search_fields: list[str], strong: bool = False) -> list[Book]:
+        """  Отбор книг, подходящих под запрос.
+
+            :param books: проверяемые книги
+            :param query: строка поиска
+            :param search_fields: список полей поиска
+            :param strong: если True - то ищем точное совпадение, если False - то вхождение
+        """
+        result = []
+        for item in books:
+            if strong:
+                if all(query in str(getattr(item, field)) for field in search_fields):
+                    result.append(item)
+            else:
+                if any(query.lower() in str(getattr(item, field)).lower() for field in search_fields):
+                    result.append(item)
+        return result
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        raise NotImplementedError
+
+    def add_books(self, book_values: Iterable[tuple[str, str, str, str]]) -> int:
+        """  Массовое добавление книг. Возвращает количество добавленных книг.
+
+            :param book_values: данные книг: (название, автор, год, статус)
+        """
+        count = 0
+        for title, author, year, status in book_values:
+            book = self.add_book(title, author, year)
+            if status != book.status:
+                self.update_book(book, "status", status)
+            count += 1
+        return count
+
+    def remove_book(self, book_id: int) -> None:
+        raise NotImplementedError
+
+    def update_book(self, book_object: Book, field: str, value: str) -> None:
+        raise NotImplementedError
+
+    def save(self) -> None:
+        pass
+
+    def save_changes(self, changes: dict[int, Book | None]) -> None:
+        """  Сохранение изменённых книг в режиме отложенной записи. По умолчанию - сохранение всех изменений.
+
+            :param changes: id -> книга с текущими значениями полей, None - книга удалена
+        """
+        self.save()
+
+    @contextmanager
+    def deferred_writes(self) -> Iterator[None]:
+        """  Блок массовых изменений: add_book / remove_book / update_book не пишут на диск после каждой операции,
+        все изменения сохраняются одним вызовом save() при выходе из блока. Внутри блока save() можно вызывать
+        для промежуточного сохранения.
+        """
+        self.deferred = True
+        try:
+            yield
+        finally:
+            self.deferred = False
+            self.save()
+
+
+class JsonStorage(BaseStorage):
+    """  Хранилище в JSON-файле. Весь каталог держится в памяти: словарь id -> книга и индекс поиска SearchIndex.
+
+        Режим журнала (journal=True): изменения не перезаписывают файл данных, а дописываются строками JSON в
+        <имя>.journal. При загрузке журнал применяется поверх снимка. Журнал сжимается в новый снимок
+        в фоне, когда в нём накапливается compact_threshold записей, и при сохранении (выход из приложения).
+
+        Загрузка ленивая: файл разбирается потоково по мере надобности. Первую страницу каталога можно вывести,
+        прочитав только её книги; поиск, изменения и подсчёт дочитывают файл до конца.
+        Если есть несжатый журнал, файл загружается сразу целиком, чтобы применить журнал.
+
+        Режим columnar=True: каталог хранится в ColumnarCatalog, объекты книг создаются по запросу, индекс поиска
+        работает в компактном режиме и читает тексты полей из колонок каталога.
+
+        Режим shared=True: с файлом работают несколько процессов. Каждое изменение выполняется под блокировкой
+        файла <имя>.lock (см. file_lock.SharedFileState): если другой процесс записал файл после загрузки, каталог
+        сначала перечитывается, затем изменение применяется и сразу сохраняется. id книг выдаются общим счётчиком
+        и не повторяются между процессами. В блоке deferred_writes() блокировка держится до сохранения.
+
+        Файл данных может быть сжат: data.json.gz - gzip, data.json.xz и data.json.lzma - lzma (см. open_data_file).
+        Режим compact=True: снимок пишется без отступов и пробелов между элементами, файл в несколько раз меньше.
+        Оба варианта читаются потоково, как и несжатый data.json с отступами. Журнал не сжимается.
+    """
+    def __init__(self, file_path: str = "data.json", journal: bool = False, compact_threshold: int = 1000,
+                 columnar: bool = False, shared: bool = False, compact: bool = False) -> None:
+        """ Инициализация хранилища.
+
+            :param file_path: путь к файлу данных
+            :param journal: если True - изменения пишутся в журнал
+            :param compact_threshold: количество записей журнала, после которого он сжимается в фоне
+            :param columnar: если True - каталог хранится по колонкам (ColumnarCatalog)
+            :param shared: если True - файл используется несколькими процессами
+            :param compact: если True - снимок пишется компактным JSON без отступов
+        """
+        if shared and journal:
+            raise ValueError("Режим shared несовместим с режимом журнала")
+        self.file_path = file_path
+        self.shared_state = SharedFileState(f"{file_path}.lock") if shared else None
+        # Версия файла данных на момент загрузки или последней записи этим процессом (режим shared)
+        self.version = 0
+        self.shared_writing = False
+        self.columnar = columnar
+        self.compact = compact
+        self.journal_file = f"{os.path.splitext(file_path)[0]}.journal"
+        self.compacting_journal_file = f"{self.journal_file}.compacting"
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.journal_records = 0
+        self.compaction_thread = None
+        # storage_lock - файлы журнала, подмена снимка и отпечаток файлов; держится недолго, поэтому is_changed()
+        # не ждёт записи снимка. snapshot_lock - запись снимка целиком, чтобы два сохранения не писали файл сразу
+        self.storage_lock = threading.RLock()
+        self.snapshot_lock = threading.RLock()
+        # Номер последнего скопированного для записи снимка и номер снимка, подменившего файл данных
+        self.snapshot_generation = 0
+        self.replaced_generation = 0
+        self.file_signature = None
+        self.set_books([])
+
+    def load(self) -> None:
+        """  Загрузка каталога в память с запоминанием отпечатка файлов. В режиме shared - под блокировкой, чтобы
+        запомнить версию загруженного файла.
+        """
+        if self.shared_state is not None and not self.shared_state.is_locked():
+            with self.shared_state.locked():
+                self.load()
+            return
+        self.check_data_file(self.file_path)
+        self.load_count += 1
+
+        # Отпечаток снимаем до чтения, чтобы не пропустить запись, случившуюся во время загрузки
+        self.file_signature = self.get_storage_signature()
+        if self.has_journal():
+            self.set_books(self.read_books())
+        else:
+            self.set_books([])
+            self.pending = self.iter_file_books()
+
+        # Если прошлое сжатие журнала прервалось - сразу сохраняем полный снимок
+        if self.journal and os.path.exists(self.compacting_journal_file):
+            self.compact_journal()
+        # Без режима журнала оставшийся от прошлой сессии журнал сразу переносим в снимок и удаляем:
+        # иначе его устаревшие записи применятся поверх следующих сохранений
+        elif not self.journal and self.pending is None and self.has_journal():
+            self.save()
+        if self.shared_state is not None and self.shared_state.is_locked():
+            self.version = self.shared_state.state["version"]
+
+    def has_journal(self) -> bool:
+        """  Есть ли на диске журнал или прерванный при сжатии журнал. """
+        return os.path.exists(self.journal_file) or os.path.exists(self.compacting_journal_file)
+
+    def set_books(self, book_list: list[Book]) -> None:
+        """  Замена каталога с перестроением индексов.
+
+            :param book_list: новый список книг
+        """
+        self.books = ColumnarCatalog(book_list) if self.columnar else {item.id: item for item in book_list}
+        self.catalog_cache = None
+        self.pending = None
+        # Отсортированные индексы строятся при первом запросе диапазона, до этого они не занимают память
+        self.sorted_indexes = {}
+        self.fuzzy_index = None
+        self.search_index = SearchIndex(catalog=self.books if self.columnar else None)
+        for item in book_list:
+            self.search_index.add_book(item)
+
+    def load_next(self) -> Book | None:
+        """  Загрузка следующей книги из файла в каталог и индексы. None - если файл дочитан. """
+        if self.pending is None:
+            return None
+        book = next(self.pending, None)
+        if book is None:
+            self.pending = None
+            return None
+        self.books[book.id] = book
+        self.catalog_cache = None
+        self.search_index.add_book(book)
+        return book
+
+    def load_until(self, count: int) -> None:
+        """  Дочитывание файла, пока в каталоге не будет count книг или файл не закончится.
+
+            :param count: необходимое количество книг
+        """
+        while len(self.books) < count and self.load_next():
+            pass
+
+    def ensure_loaded(self) -> None:
+        """  Дочитывание файла до конца. """
+        while self.load_next():
+            pass
+
+    @staticmethod
+    def check_data_file(file_path: str = "data.json") -> None:
+        """  Проверка наличия файла. Если нет - создаем его с пустым списком.
+
+            :param file_path: путь к файлу
+         """
+        if not os.path.exists(file_path):
+            with open_data_file(file_path, "w") as file:
+                json.dump([], file)
+            # print(f"Создан файл данных: {file_path}")  # debug
+
+    @staticmethod
+    def get_file_signature(file_path: str) -> tuple[int, int] | None:
+        """  Отпечаток файла (время изменения, размер) для проверки внешних изменений. None - если файла нет.
+
+            :param file_path: путь к файлу
+        """
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_storage_signature(self) -> tuple:
+        """  Отпечатки файла данных и файлов журнала. """
+        return tuple(self.get_file_signature(file_path)
+                     for file_path in (self.file_path, self.journal_file, self.compacting_journal_file))
+
+    def is_changed(self) -> bool:
+        with self.storage_lock:
+            if self.get_storage_signature() != self.file_signature:
+                return True
+        return self.shared_state is not None and self.shared_state.read()["version"] != self.version
+
+    @contextmanager
+    def shared_write(self) -> Iterator[None]:
+        """  Блок изменения в режиме shared: берёт блокировку файла и перечитывает каталог, если файл изменён другим
+        процессом. Блокировка отпускается в конце блока, в режиме отложенной записи - после сохранения.
+        Без режима shared ничего не делает.
+        """
+        if self.shared_state is None or self.shared_writing:
+            yield
+            return
+        if not self.shared_state.is_locked():
+            state = self.shared_state.acquire()
+            if state["version"] != self.version or self.get_storage_signature() != self.file_signature:
+                self.load()
+        self.shared_writing = True
+        try:
+            yield
+        finally:
+            self.shared_writing = False
+            if not self.deferred:
+                self.shared_state.release()
+
+    def allocate_ids(self, count: int) -> int:
+        """  Выдача count id подряд, возвращает первый. В режиме shared - из общего счётчика процессов,
+        вызывается внутри shared_write().
+
+            :param count: количество id
+        """
+        last_id = next(reversed(self.books), 0)
+        if self.shared_state is not None:
+            state = self.shared_state.state
+            last_id = max(last_id, state["last_id"])
+            state["last_id"] = last_id + count
+        return last_id + 1
+
+    def iter_file_books(self) -> Iterator[Book]:
+        """  Потоковое чтение книг из снимка без применения журнала. """
+        with open_data_file(self.file_path) as json_file:
+            for item in iter_json_array(json_file):
+                yield Book(**item)
+
+    def read_books(self) -> list[Book]:
+        """  Чтение списка книг из файла данных с применением журнала изменений, если он есть. """
+        if not self.has_journal():
+            return list(self.iter_file_books())
+
+        with open_data_file(self.file_path) as json_file:
+            json_content = {item["id"]: item for item in iter_json_array(json_file)}
+
+        for file_path in (self.compacting_journal_file, self.journal_file):
+            for record in self.read_journal(file_path):
+                self.apply_journal_record(json_content, record)
+        return [Book(**item) for item in json_content.values()]
+
+    @staticmethod
+    def read_journal(file_path: str) -> Iterator[dict]:
+        """  Чтение записей журнала. Недописанная при сбое последняя строка пропускается.
+
+            :param file_path: путь к файлу журнала
+        """
+        if not os.path.exists(file_path):
+            return
+        with open(file_path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+    @staticmethod
+    def apply_journal_record(json_content: dict[int, dict], record: dict) -> None:
+        """  Применение записи журнала к словарю id -> данные книги.
+
+            :param json_content: словарь книг
+            :param record: запись журнала: add / put (книга целиком) / update / remove
+        """
+        match record["op"]:
+            case "add" | "put":
+                json_content[record["book"]["id"]] = dict(record["book"])
+            case "remove":
+                json_content.pop(record["id"], None)
+            case "update":
+                item = json_content.get(record["id"])
+                if item is None:
+                    return
+                if record["field"] == "id":
+                    json_content.pop(record["id"])
+                    json_content[record["value"]] = item
+                item[record["field"]] = record["value"]
+
+    def get_books(self) -> list[Book]:
+        """  Список книг каталога в порядке добавления. Список кэшируется до следующего изменения каталога,
+        поэтому изменять его напрямую нельзя.
+        """
+        self.ensure_loaded()
+        if self.catalog_cache is None:
+            self.catalog_cache = list(self.books.values())
+        return self.catalog_cache
+
+    def iter_books(self) -> Iterator[Book]:
+        """  Книги каталога по одной: сначала уже загруженные, затем дочитываемые из файла. """
+        if self.pending is None:
+            yield from self.get_books()
+            return
+        yield from list(self.books.values())
+        while book := self.load_next():
+            yield book
+
+    def get_book(self, book_id: int) -> Book | None:
+        while book_id not in self.books and self.load_next():
+            pass
+        return self.books.get(book_id)
+
+    def count(self) -> int:
+        self.ensure_loaded()
+        return len(self.books)
+
+    def get_page(self, offset: int, limit: int) -> list[Book]:
+        """  Срез книг каталога. Файл дочитывается только до конца запрошенного среза.
+
+            :param offset: количество пропускаемых книг
+            :param limit: максимальное количество книг
+        """
+        self.load_until(offset + limit)
+        if self.pending is None:
+            return self.get_books()[offset:offset + limit]
+        return list(islice(self.books.values(), offset, offset + limit))
+
+    def search(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book]:
+        """  Поиск книг через инвертированный индекс. Если среди полей есть непроиндексированные - перебором.
+
+            :param query: строка поиска
+            :param search_fields: список полей поиска
+            :param strong: если True - то ищем точное совпадение, если False - то вхождение
+        """
+        self.ensure_loaded()
+        if all(field in self.search_index.fields for field in search_fields):
+            return [self.books[book_id] for book_id in self.search_index.search(query, search_fields, strong)]
+        return super().search(query, search_fields, strong)
+
+    def get_sorted_index(self, field: str) -> SortedIndex:
+        """  Отсортированный индекс поля, при первом обращении строится по всему каталогу. """
+        self.ensure_loaded()
+        if field not in self.sorted_indexes:
+            self.sorted_indexes[field] = SortedIndex(field, self.books.values())
+        return self.sorted_indexes[field]
+
+    def get_range(self, field: str, low=None, high=None) -> list[Book]:
+        """  Книги со значением поля в диапазоне [low, high] через отсортированный индекс - O(log N + k).
+
+            :param field: поле: year, author или title
+            :param low: нижняя граница, None - без границы
+            :param high: верхняя граница, None - без границы
+        """
+        if field not in SORTED_FIELDS:
+            return super().get_range(field, low, high)
+        return [self.books[book_id] for book_id in self.get_sorted_index(field).get_range(low, high)]
+
+    def get_fuzzy_index(self) -> FuzzyIndex:
+        self.ensure_loaded()
+        return super().get_fuzzy_index()
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        with self.shared_write():
+            self.ensure_loaded()
+            book = Book(self.allocate_ids(1), title, author, year)
+            self.books[book.id] = book
+            self.catalog_cache = None
+            self.search_index.add_book(book)
+            for index in self.sorted_indexes.values():
+                index.add_book(book)
+            if self.fuzzy_index is not None:
+                self.fuzzy_index.add_book(book)
+            if self.deferred:
+                pass
+            elif self.journal:
+                self.append_journal({"op": "add", "book": book.to_dict()})
+            else:
+                self.save()
+        return book
+
+    def add_books(self, book_values: Iterable[tuple[str, str, str, str]]) -> int:
+        """  Массовое добавление книг: id назначаются подряд, изменения записываются одним снимком или одной
+        дозаписью журнала на всю пачку.
+
+            :param book_values: данные книг: (название, автор, год, статус)
+        """
+        book_values = list(book_values)
+        with self.shared_write():
+            self.ensure_loaded()
+            first_id = self.allocate_ids(len(book_values))
+            records = []
+            for book_id, (title, author, year, status) in enumerate(book_values, start=first_id):
+                book = Book(book_id, title, author, year, status)
+                self.books[book_id] = book
+                self.search_index.add_book(book)
+                for index in self.sorted_indexes.values():
+                    index.add_book(book)
+                if self.fuzzy_index is not None:
+                    self.fuzzy_index.add_book(book)
+                if self.journal and not self.deferred:
+                    records.append({"op": "add", "book": book.to_dict()})
+            self.catalog_cache = None
+
+            if self.deferred:
+                pass
+            elif self.journal:
+                self.append_journal(*records)
+            else:
+                self.save()
+        return len(book_values)
+
+    def remove_book(self, book_id: int) -> None:
+        with self.shared_write():
+            self.ensure_loaded()
+            book = self.books.pop(book_id, None)
+            self.catalog_cache = None
+            self.search_index.remove_book(book_id)
+            if book is not None:
+                for index in self.sorted_indexes.values():
+                    index.remove_book(book)
+            if self.fuzzy_index is not None:
+                self.fuzzy_index.remove_book(book_id)
+            if self.deferred:
+                pass
+            elif self.journal:
+                self.append_journal({"op": "remove", "id": book_id})
+            else:
+                self.save()
+
+    def update_book(self, book_object: Book, field: str, value: str) -> None:
+        with self.shared_write():
+            self.ensure_loaded()
+            if self.shared_state is not None:
+                # Каталог мог быть перечитан: берём значения полей книги, записанные другими процессами
+                stored = self.books.get(book_object.id)
+                if stored is None:
+                    # Книга удалена другим процессом
+                    return
+                for stored_field, stored_value in stored.to_dict().items():
+                    setattr(book_object, stored_field, stored_value)
+
+            old_id = book_object.id
+            # Прежние значения полей нужны, чтобы найти книгу в отсортированных индексах
+            old_book = Book(**book_object.to_dict()) if self.sorted_indexes else None
+            # Кэш списка каталога хранит объекты книг: если обновляется другой объект (в ColumnarCatalog книга -
+            # всегда копия строки), в кэше остались бы прежние значения полей
+            if field == "id" or self.books.get(old_id) is not book_object:
+                self.catalog_cache = None
+            if field == "id":
+                # Смена id - переносим книгу в индексе под новый ключ
+                self.books.pop(old_id, None)
+                self.books[value] = book_object
+            setattr(book_object, field, value)
+            # Записываем изменения обратно в каталог (для ColumnarCatalog книга - это копия строки)
+            self.books[book_object.id] = book_object
+            self.search_index.update_book(book_object, old_id)
+            for index_field, index in self.sorted_indexes.items():
+                if field in ("id", index_field):
+                    index.remove_book(old_book)
+                    index.add_book(book_object)
+            if self.fuzzy_index is not None and field in ("id", *self.fuzzy_index.fields):
+                self.fuzzy_index.update_book(book_object, old_id)
+            if self.journal and not self.deferred:
+                self.append_journal({"op": "update", "id": old_id, "field": field, "value": value})
+            elif self.shared_state is not None and not self.deferred:
+                # Несохранённое обновление перезаписал бы другой процесс - в режиме shared сохраняем сразу
+                self.save()
+
+    def save(self) -> None:
+        """  Сохранение списка книг в JSON-файл. Полная перезапись. В режиме журнала - сжатие журнала в снимок.
+        Без режима журнала снимок уже содержит записи журнала прошлых сессий, поэтому журнал удаляется.
+        В режиме shared запись увеличивает версию файла.
+        """
+        self.ensure_loaded()
+        if self.journal:
+            self.compact_journal()
+            return
+
+        with self.shared_write(), self.snapshot_lock:
+            # Снимок пишется без storage_lock: проверка внешних изменений из других потоков не ждёт записи файла.
+            # Журнал, дописанный во время записи, содержит более новые изменения, чем снимок, и не удаляется
+            with self.storage_lock:
+                generation = self.next_snapshot_generation()
+                journal_signatures = {file_path: self.get_file_signature(file_path)
+                                      for file_path in (self.compacting_journal_file, self.journal_file)}
+            self.write_snapshot([item.to_dict() for item in self.books.values()], self.file_path, self.compact,
+                                replace=lambda temp_path, _: self.replace_snapshot(temp_path, generation,
+                                                                                   journal_signatures))
+            if self.shared_state is not None:
+                self.shared_state.state["version"] += 1
+                self.version = self.shared_state.state["version"]
+
+    def save_changes(self, changes: dict[int, Book | None]) -> None:
+        """  Сохранение изменённых книг дозаписью в журнал, без перезаписи файла данных: книга записывается целиком
+        (put), удалённая - записью remove. Журнал сжимается в снимок при накоплении compact_threshold записей и при
+        save(); без режима журнала он применяется к снимку при следующей загрузке.
+
+            :param changes: id -> книга с текущими значениями полей, None - книга удалена
+        """
+        if self.shared_state is not None:
+            self.save()
+            return
+        self.append_journal(*({"op": "remove", "id": book_id} if book is None else {"op": "put", "book": book.to_dict()}
+                              for book_id, book in changes.items()))
+
+    @staticmethod
+    def write_snapshot(json_content: Iterable[dict], file_path: str = "data.json", compact: bool = False,
+                       chunk_size: int = 10_000, replace: Callable[[str, str], None] = os.replace) -> None:
+        """  Атомарная запись снимка: данные пишутся во временный файл, который затем подменяет основной.
+        При сбое во время записи прежний файл остаётся целым. Сжатие выбирается по расширению file_path.
+
+        Данные кодируются пачками по chunk_size книг и склеиваются в тот же текст, что дал бы json.dump всего списка,
+        поэтому данные можно передавать генератором, не собирая их в памяти.
+
+            :param json_content: данные книг
+            :param file_path: путь к файлу
+            :param compact: если True - без отступов и пробелов, иначе с отступом 4, как раньше
+            :param chunk_size: количество книг в одной пачке
+            :param replace: подмена основного файла временным: replace(temp_path, file_path)
+        """
+        temp_path = f"{file_path}.tmp"
+        items = iter(json_content)
+        with open_data_file(temp_path, "w", get_compression(file_path)) as json_file:
+            json_file.write("[")
+            empty = True
+            while chunk := list(islice(items, chunk_size)):
+                # Текст пачки без скобок массива: "{...},{...}" или "\n    {...},\n    {...}"
+                if compact:
+                    text = json.dumps(chunk, separators=(",", ":"), ensure_ascii=False)[1:-1]
+                else:
+                    text = json.dumps(chunk, indent=4, ensure_ascii=False)[1:-2]
+                json_file.write(("" if empty else ",") + text)
+                empty = False
+            json_file.write("]" if empty or compact else "\n]")
+        replace(temp_path, file_path)
+
+    def append_journal(self, *records: dict) -> None:
+        """  Дозапись изменений в журнал одной записью на диск. При накоплении compact_threshold записей запускает
+        сжатие в фоне.
+
+            :param records: записи журнала
+        """
+        if not records:
+            return
+        with self.storage_lock:
+            with open(self.journal_file, "a", encoding="utf-8") as journal_file:
+                journal_file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            self.journal_records += len(records)
+            self.file_signature = self.get_storage_signature()
+
+        if self.journal_records >= self.compact_threshold:
+            self.compact_journal(background=True)
+
+    def compact_journal(self, background: bool = False) -> None:
+        """  Сжатие журнала в новый снимок файла данных.
+
+            Текущий журнал переименовывается в <имя>.journal.compacting, новые изменения пишутся в чистый журнал.
+            После атомарной записи снимка переименованный журнал удаляется. Если сбой случится раньше,
+            при запуске будут применены оба журнала - записи журнала идемпотентны.
+
+            :param background: если True - снимок пишется в фоновом потоке
+        """
+        if self.compaction_thread and self.compaction_thread.is_alive():
+            if background:
+                return
+            self.compaction_thread.join()
+
+        with self.storage_lock:
+            if os.path.exists(self.journal_file) and not os.path.exists(self.compacting_journal_file):
+                os.replace(self.journal_file, self.compacting_journal_file)
+            # Копируем данные книг, чтобы фоновая запись не видела изменений, сделанных после сжатия
+            json_content = [item.to_dict() for item in self.books.values()]
+            self.journal_records = 0
+            generation = self.next_snapshot_generation()
+            journal_signatures = {self.compacting_journal_file: self.get_file_signature(self.compacting_journal_file)}
+            if not background:
+                # Снимок включает в себя и текущий журнал, если прервалось сжатие прошлого и он не переименован
+                journal_signatures[self.journal_file] = self.get_file_signature(self.journal_file)
+
+        if not background:
+            self.finish_compaction(json_content, generation, journal_signatures)
+            return
+        self.compaction_thread = threading.Thread(target=self.finish_compaction,
+                                                  args=(json_content, generation, journal_signatures))
+        self.compaction_thread.start()
+
+    def finish_compaction(self, json_content: list[dict], generation: int,
+                          journal_signatures: dict[str, tuple[int, int] | None]) -> None:
+        """  Запись снимка и удаление перенесённых в него журналов.
+
+            :param json_content: список данных книг на момент сжатия
+            :param generation: номер снимка (next_snapshot_generation)
+            :param journal_signatures: перенесённые в снимок журналы: путь -> отпечаток на момент сжатия
+        """
+        with self.snapshot_lock:
+            self.write_snapshot(json_content, self.file_path, self.compact,
+                                replace=lambda temp_path, _: self.replace_snapshot(temp_path, generation,
+                                                                                   journal_signatures))
+
+    def next_snapshot_generation(self) -> int:
+        """  Номер нового снимка. Вызывается под storage_lock при копировании данных книг для записи. """
+        self.snapshot_generation += 1
+        return self.snapshot_generation
+
+    def replace_snapshot(self, temp_path: str, generation: int,
+                         journal_signatures: dict[str, tuple[int, int] | None]) -> None:
+        """  Подмена файла данных записанным снимком. Удаление перенесённых в снимок журналов и новый отпечаток
+        файлов - под той же блокировкой, что и подмена: иначе is_changed() между ними принял бы свою запись за
+        внешнее изменение, и перезагрузка потеряла бы несохранённые изменения. Снимок, скопированный раньше уже
+        записанного (фоновое сжатие закончилось после сохранения), отбрасывается.
+
+            :param temp_path: временный файл снимка
+            :param generation: номер снимка
+            :param journal_signatures: перенесённые в снимок журналы: путь -> отпечаток на момент копирования
+                данных; журнал удаляется, только если в него с тех пор ничего не дописано
+        """
+        with self.storage_lock:
+            if generation < self.replaced_generation:
+                os.remove(temp_path)
+                return
+            os.replace(temp_path, self.file_path)
+            self.replaced_generation = generation
+            for file_path, signature in journal_signatures.items():
+                if signature is not None and self.get_file_signature(file_path) == signature:
+                    os.remove(file_path)
+            self.file_signature = self.get_storage_signature()
+
+
+class SqliteStorage(BaseStorage):
+    """  Хранилище в базе SQLite. Каталог не загружается в память целиком: получение книги, постраничное чтение и
+        поиск выполняются запросами по индексам.
+
+        - id - первичный ключ, на title, author, year построены индексы
+        - постраничное чтение запоминает id первых книг уже показанных страниц и читает их повторно и следующие
+        за ними страницы по первичному ключу, без пропуска строк через OFFSET
+        - для поиска по вхождению используется полнотекстовая таблица FTS5 с триграммным токенизатором, в которой
+        хранится текст полей после casefold. Она отбирает кандидатов, а точная проверка выполняется с той же
+        семантикой, что и поиск перебором
+    """
+    fields = ("title", "author", "year", "status")
+
+    def __init__(self, file_path: str = "data.db") -> None:
+        """ Инициализация хранилища.
+
+            :param file_path: путь к файлу базы данных
+        """
+        self.file_path = file_path
+        self.connection = None
+        self.page_starts = {}
+        self.data_version = None
+
+    def load(self) -> None:
+        """  Открытие базы данных и создание таблиц и индексов, если их нет. """
+        self.fuzzy_index = None
+        self.load_count += 1
+        self.connection = sqlite3.connect(self.file_path, check_same_thread=False)
+        # casefold() для индексов по названию и автору без учёта регистра (lower() SQLite работает только с ASCII)
+        self.connection.create_function("casefold", 1, str.casefold, deterministic=True)
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS books (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    year TEXT NOT NULL,
+                    status TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS books_title ON books (title);
+                CREATE INDEX IF NOT EXISTS books_author ON books (author);
+                CREATE INDEX IF NOT EXISTS books_year ON books (year);
+                CREATE INDEX IF NOT EXISTS books_year_number ON books (CAST(year AS INTEGER));
+                CREATE INDEX IF NOT EXISTS books_author_folded ON books (casefold(author));
+                CREATE INDEX IF NOT EXISTS books_title_folded ON books (casefold(title));
+                CREATE VIRTUAL TABLE IF NOT EXISTS books_search
+                    USING fts5(title, author, year, status, tokenize = 'trigram case_sensitive 1');
+            """)
+
+    def get_books_by_query(self, sql: str, parameters: tuple = ()) -> Iterator[Book]:
+        """  Книги из результата SQL-запроса, выбирающего поля в порядке id, title, author, year, status. """
+        for row in self.connection.execute(sql, parameters):
+            yield Book(*row)
+
+    def read_books(self) -> list[Book]:
+        return list(self.get_books_by_query("SELECT id, title, author, year, status FROM books ORDER BY id"))
+
+    def get_books(self) -> list[Book]:
+        return self.read_books()
+
+    def iter_books(self) -> Iterator[Book]:
+        """  Книги по одной прямо из курсора, без загрузки всего каталога в память. """
+        return self.get_books_by_query("SELECT id, title, author, year, status FROM books ORDER BY id")
+
+    def get_book(self, book_id: int) -> Book | None:
+        return next(self.get_books_by_query(
+            "SELECT id, title, author, year, status FROM books WHERE id = ?", (book_id,)), None)
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM books").fetchone()[0]
+
+    def get_page(self, offset: int, limit: int) -> list[Book]:
+        """  Срез книг каталога. Если известен id первой книги среза - чтение по первичному ключу за O(limit).
+
+            :param offset: количество пропускаемых книг
+            :param limit: максимальное количество книг
+        """
+        # Изменения базы другими соединениями сбрасывают запомненные границы страниц
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self.data_version:
+            self.page_starts.clear()
+            self.data_version = data_version
+
+        select = "SELECT id, title, author, year, status FROM books"
+        start_id = self.page_starts.get(offset)
+        if start_id is None:
+            book_list = list(self.get_books_by_query(f"{select} ORDER BY id LIMIT ? OFFSET ?", (limit + 1, offset)))
+        else:
+            book_list = list(self.get_books_by_query(f"{select} WHERE id >= ? ORDER BY id LIMIT ?",
+                                                     (start_id, limit + 1)))
+
+        if book_list:
+            self.page_starts[offset] = book_list[0].id
+        if len(book_list) > limit:
+            self.page_starts[offset + limit] = book_list[limit].id
+        return book_list[:limit]
+
+    def get_range(self, field: str, low=None, high=None) -> list[Book]:
+        """  Книги со значением поля в диапазоне [low, high] по индексу выражения: CAST(year AS INTEGER) или
+        casefold(author / title).
+
+            :param field: поле: year, author или title
+            :param low: нижняя граница, None - без границы
+            :param high: верхняя граница, None - без границы
+        """
+        if field not in SORTED_FIELDS:
+            return super().get_range(field, low, high)
+
+        expression = "CAST(year AS INTEGER)" if field == "year" else f"casefold({field})"
+        # Год, который не является числом, в индекс года не попадает
+        conditions = ["year != '' AND year NOT GLOB '*[^0-9]*'"] if field == "year" else []
+        parameters = []
+        for operator, key in zip((">=", "<="), get_bounds(field, low, high)):
+            if key is not None:
+                conditions.append(f"{expression} {operator} ?")
+                parameters.append(key)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return list(self.get_books_by_query(
+            f"SELECT id, title, author, year, status FROM books {where} ORDER BY {expression}, id",
+            tuple(parameters)))
+
+    @staticmethod
+    def get_glob_pattern(query: str) -> str:
+        """  Шаблон GLOB для поиска вхождения строки после casefold. Спецсимволы GLOB экранируются. """
+        escaped = "".join(f"[{char}]" if char in "*?[" else char for char in query.casefold())
+        return f"*{escaped}*"
+
+    def search(self, query: str, search_fields: list[str], strong: bool = False) -> list[Book]:
+        """  Поиск книг: кандидаты отбираются по триграммному индексу, затем проверяются точно.
+
+            :param query: строка поиска
+            :param search_fields: список полей поиска
+            :param strong: если True - то ищем точное совпадение, если False - то вхождение
+        """
+        if not all(field in self.fields for field in search_fields):
+            return super().search(query, search_fields, strong)
+        if not search_fields:
+            # all() по пустому списку полей - истина, any() - ложь
+            return self.get_books() if strong else []
+
+        candidates = self.get_books_by_query(
+            "SELECT id, title, author, year, status FROM books "
+            f"WHERE id IN ({self.get_search_query(search_fields, strong)}) ORDER BY id",
+            (self.get_glob_pattern(query),) * len(search_fields),
+        )
+        return self.filter_books(candidates, query, search_fields, strong)
+
+    @staticmethod
+    def get_search_query(search_fields: list[str], strong: bool = False) -> str:
+        """  Запрос rowid кандидатов из books_search. Условия по нескольким полям через OR FTS5 не может выполнить
+        по индексу и перебирает всю таблицу, поэтому при поиске по вхождению каждое поле ищется отдельным
+        запросом, а результаты объединяются через UNION. Условия через AND индекс выполняет сам.
+
+            :param search_fields: список полей поиска
+            :param strong: если True - книга должна подходить по всем полям, если False - по любому
+        """
+        if strong:
+            conditions = " AND ".join(f"{field} GLOB ?" for field in search_fields)
+            return f"SELECT rowid FROM books_search WHERE {conditions}"
+        return " UNION ".join(f"SELECT rowid FROM books_search WHERE {field} GLOB ?" for field in search_fields)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """  Транзакция одной операции изменения. В блоке deferred_writes() операции выполняются внутри одной общей
+        транзакции, которая фиксируется при save(); ошибка откатывает только свою операцию.
+        """
+        if not self.deferred:
+            with self.connection:
+                yield
+            return
+
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        self.connection.execute("SAVEPOINT operation")
+        try:
+            yield
+        except Exception:
+            self.connection.execute("ROLLBACK TO operation")
+            raise
+        finally:
+            self.connection.execute("RELEASE operation")
+
+    def save(self) -> None:
+        """  Фиксация открытой транзакции отложенной записи. Вне deferred_writes() изменения уже сохранены. """
+        if self.connection is not None and self.connection.in_transaction:
+            self.connection.commit()
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        with self.transaction():
+            last_id = self.connection.execute("SELECT max(id) FROM books").fetchone()[0] or 0
+            book = Book(last_id + 1, title, author, year)
+            self.insert_book(book)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add_book(book)
+        return book
+
+    def add_books(self, book_values: Iterable[tuple[str, str, str, str]]) -> int:
+        """  Массовое добавление книг одним запросом executemany на таблицу, id назначаются подряд.
+
+            :param book_values: данные книг: (название, автор, год, статус)
+        """
+        with self.transaction():
+            first_id = self.connection.execute("SELECT max(id) FROM books").fetchone()[0] or 0
+            rows = [(book_id, *values) for book_id, values in enumerate(book_values, start=first_id + 1)]
+            self.connection.executemany(
+                "INSERT INTO books (id, title, author, year, status) VALUES (?, ?, ?, ?, ?)", rows)
+            self.connection.executemany(
+                "INSERT INTO books_search (rowid, title, author, year, status) VALUES (?, ?, ?, ?, ?)",
+                ((book_id, *(value.casefold() for value in values)) for book_id, *values in rows))
+        if self.fuzzy_index is not None:
+            for row in rows:
+                self.fuzzy_index.add_book(Book(*row))
+        return len(rows)
+
+    def insert_book(self, book: Book) -> None:
+        """  Вставка книги в таблицу и в поисковый индекс. """
+        values = tuple(str(getattr(book, field)) for field in self.fields)
+        self.connection.execute(
+            "INSERT INTO books (id, title, author, year, status) VALUES (?, ?, ?, ?, ?)", (book.id, *values))
+        self.connection.execute(
+            "INSERT INTO books_search (rowid, title, author, year, status) VALUES (?, ?, ?, ?, ?)",
+            (book.id, *(value.casefold() for value in values)))
+
+    def remove_book(self, book_id: int) -> None:
+        self.page_starts.clear()
+        with self.transaction():
+            self.connection.execute("DELETE FROM books WHERE id = ?", (book_id,))
+            self.connection.execute("DELETE FROM books_search WHERE rowid = ?", (book_id,))
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.remove_book(book_id)
+
+    def update_book(self, book_object: Book, field: str, value: str) -> None:
+        old_id = book_object.id
+        setattr(book_object, field, value)
+        if field == "id":
+            self.page_starts.clear()
+        with self.transaction():
+            self.connection.execute("DELETE FROM books WHERE id = ?", (old_id,))
+            self.connection.execute("DELETE FROM books_search WHERE rowid = ?", (old_id,))
+            self.insert_book(book_object)
+        if self.fuzzy_index is not None and field in ("id", *self.fuzzy_index.fields):
+            self.fuzzy_index.update_book(book_object, old_id)
+
+
+class BinaryStorage(BaseStorage):
+    """  Хранилище в бинарном снимке каталога (binary_snapshot.py), открытом через mmap. Загрузка не разбирает
+        файл: читается только заголовок, поэтому приложение отвечает сразу после запуска. get_book() и постраничное
+        чтение декодируют только нужные записи, поиск перебирает записи снимка.
+
+        Изменения хранятся поверх снимка в памяти: изменённые и добавленные книги и номера удалённых записей.
+        save() записывает новый снимок и открывает его.
+    """
+    def __init__(self, file_path: str = "data.bin") -> None:
+        """ Инициализация хранилища.
+
+            :param file_path: путь к файлу снимка
+        """
+        self.file_path = file_path
+        self.snapshot = None
+        self.file_signature = None
+        self.reset_changes()
+
+    def reset_changes(self) -> None:
+        # Изменённые книги снимка: id -> книга; добавленные книги в порядке добавления; номера удалённых записей
+        self.changed = {}
+        self.added = {}
+        self.removed = set()
+        self.removed_positions = []
+
+    def load(self) -> None:
+        """  Открытие снимка. Если файла нет - создаётся пустой снимок. Несохранённые изменения теряются. """
+        self.load_count += 1
+        self.fuzzy_index = None
+        if not os.path.exists(self.file_path):
+            write_binary_snapshot([], self.file_path)
+        self.open_snapshot()
+
+    def open_snapshot(self) -> None:
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.file_signature = JsonStorage.get_file_signature(self.file_path)
+        self.snapshot = BinarySnapshot(self.file_path)
+        self.reset_changes()
+
+    def read_books(self) -> list[Book]:
+        with BinarySnapshot(self.file_path) as snapshot:
+            return list(snapshot)
+
+    def is_changed(self) -> bool:
+        return JsonStorage.get_file_signature(self.file_path) != self.file_signature
+
+    def get_snapshot_book(self, position: int) -> Book:
+        """  Книга снимка с учётом изменений. """
+        book = self.snapshot.get(position)
+        return self.changed.get(book.id, book)
+
+    def get_books(self) -> list[Book]:
+        return list(self.iter_books())
+
+    def iter_books(self) -> Iterator[Book]:
+        """  Книги каталога: записи снимка с учётом изменений, затем добавленные. """
+        for position in range(len(self.snapshot)):
+            if position not in self.removed:
+                yield self.get_snapshot_book(position)
+        yield from list(self.added.values())
+
+    def get_book(self, book_id: int) -> Book | None:
+        if book_id in self.added:
+            return self.added[book_id]
+        position = self.snapshot.find(book_id)
+        if position is None or position in self.removed:
+            return None
+        return self.changed.get(book_id) or self.snapshot.get(position)
+
+    def count(self) -> int:
+        return len(self.snapshot) - len(self.removed) + len(self.added)
+
+    def get_page(self, offset: int, limit: int) -> list[Book]:
+        """  Срез книг каталога. Декодируются только записи среза.
+
+            :param offset: количество пропускаемых книг
+            :param limit: максимальное количество книг
+        """
+        result = []
+        snapshot_count = len(self.snapshot) - len(self.removed)
+        if offset < snapshot_count:
+            # Номер записи, перед которой offset неудалённых записей
+            position = offset
+            while (next_position := offset + bisect_right(self.removed_positions, position)) != position:
+                position = next_position
+            while position < len(self.snapshot) and len(result) < limit:
+                if position not in self.removed:
+                    result.append(self.get_snapshot_book(position))
+                position += 1
+        added_offset = max(offset - snapshot_count, 0)
+        result += islice(self.added.values(), added_offset, added_offset + limit - len(result))
+        return result
+
+    def next_id(self) -> int:
+        return max(self.snapshot.get_max_id(), max(self.added, default=0)) + 1
+
+    def add_book(self, title: str, author: str, year: str) -> Book:
+        book = Book(self.next_id(), title, author, year)
+        self.added[book.id] = book
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add_book(book)
+        if not self.deferred:
+            self.save()
+        return book
+
+    def discard_book(self, book_id: int) -> None:
+        """  Удаление книги из каталога в памяти. """
+        if self.added.pop(book_id, None) is not None:
+            return
+        position = self.snapshot.find(book_id)
+        if position is not None and position not in self.removed:
+            self.removed.add(position)
+            insort(self.removed_positions, position)
+            self.changed.pop(book_id, None)
+
+    def remove_book(self, book_id: int) -> None:
+        self.discard_book(book_id)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.remove_book(book_id)
+        if not self.deferred:
+            self.save()
+
+    def update_book(self, book_object: Book, field: str, value: str) -> None:
+        old_id = book_object.id
+        setattr(book_object, field, value)
+        if field == "id":
+            # Смена id - книга переносится в конец каталога, как в JsonStorage
+            self.discard_book(old_id)
+            self.added[book_object.id] = book_object
+        elif old_id in self.added:
+            self.added[old_id] = book_object
+        else:
+            self.changed[old_id] = book_object
+        if self.fuzzy_index is not None and field in ("id", *self.fuzzy_index.fields):
+            self.fuzzy_index.update_book(book_object, old_id)
+
+    def save(self) -> None:
+        """  Запись нового снимка с изменениями и его открытие. Без изменений файл не перезаписывается. """
+        if not (self.changed or self.added or self.removed):
+            return
+        write_binary_snapshot(self.iter_books(), self.file_path)
+        self.open_snapshot()
@@ -1,5 +1,7 @@
+import contextlib
 import os
 import unittest
+from unittest import mock
 
 from book_helpers import BookTools
 from main import Router
@@ -16,7 +18,9 @@ class TestAddBook(unittest.TestCase):
         self.page = AddBookPage(self.mock_router)
 
     def tearDown(self):
-        # Возвращаем файл обратно
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
         if os.path.exists("./data_test.json"):
             os.rename("./data_test.json", "./data.json")
 
@@ -83,3 +87,17 @@ class TestAddBook(unittest.TestCase):
 
 
 
+
+    def test_form_in_router_loop(self):
+        # Вне тестового режима форма очищается после добавления: цикл роутера уходит в каталог,
+        # а следующее открытие формы добавляет новую книгу, а не повторяет прошлую
+        self.mock_router.test_mode = False
+        inputs = iter(["n", "Valid Title", "Valid Author", "1867", "h",
+                       "n", "Other Title", "Other Author", "1900", "h", "q"])
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                mock.patch("builtins.input", lambda prompt="": next(inputs)):
+            self.mock_router.run("h")
+
+        self.assertIsNone(next(inputs, None))
+        self.assertEqual([(book.title, book.year) for book in self.mock_router.book_tools.get_book_list()],
+                         [("Valid Title", "1867"), ("Other Title", "1900")])
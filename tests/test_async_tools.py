@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from async_tools import AsyncBookTools
+from storage import JsonStorage, SqliteStorage
+
+
+class TestAsyncTools(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_file(self):
+        with open(self.file_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    async def run_clients(self, book_tools, clients=20, books_per_client=10):
+        # Клиенты одновременно добавляют книги и ищут добавленные другими
+        async def client(number):
+            for i in range(books_per_client):
+                book = await book_tools.add_book(f"Книга {number}-{i}", f"Автор {number}", "2000")
+                result = await book_tools.search_books(book.title, ["title"], strong=True)
+                self.assertEqual([item.id for item in result], [book.id])
+                if i % 2:
+                    await book_tools.update_book(book, "status", "Выдана")
+
+        await asyncio.gather(*(client(number) for number in range(clients)))
+        self.assertEqual(await book_tools.get_status_counts(),
+                         {"В наличии": clients * books_per_client // 2, "Выдана": clients * books_per_client // 2})
+
+    async def test_json_debounced_save(self):
+        book_tools = await AsyncBookTools.open(storage=JsonStorage(self.file_path), save_delay=0.05)
+        await self.run_clients(book_tools)
+        # Изменения ещё не сохранены - сохранение отложено до паузы
+        self.assertEqual(self.read_file(), [])
+
+        await asyncio.sleep(0.2)
+        self.assertEqual(len(self.read_file()), 200)
+        self.assertEqual(book_tools.saves, 1)
+
+        await book_tools.remove_book(1)
+        await book_tools.close()
+        self.assertEqual(len(self.read_file()), 199)
+        self.assertEqual(book_tools.saves, 2)
+
+    async def test_max_save_delay(self):
+        # При непрерывных изменениях сохранение не откладывается дольше max_save_delay
+        book_tools = await AsyncBookTools.open(storage=JsonStorage(self.file_path), save_delay=0.05,
+                                               max_save_delay=0.1)
+        for i in range(10):
+            await book_tools.add_book(f"Книга {i}", "Автор", "2000")
+            await asyncio.sleep(0.03)
+        self.assertGreaterEqual(book_tools.saves, 1)
+        await book_tools.close()
+        self.assertEqual(len(self.read_file()), 10)
+
+    async def test_reads_during_save(self):
+        # Пока снимок пишется в потоке работы с диском, страницы каталога отдаются без ожидания сохранения
+        book_tools = await AsyncBookTools.open(storage=JsonStorage(self.file_path), save_delay=10)
+        await book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+        write_snapshot = book_tools.storage.write_snapshot
+
+        def slow_write_snapshot(*args, **kwargs):
+            time.sleep(0.5)
+            write_snapshot(*args, **kwargs)
+
+        with mock.patch.object(book_tools.storage, "write_snapshot", slow_write_snapshot):
+            save_task = asyncio.create_task(book_tools.save())
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            books, _ = await book_tools.get_page(1, 10)
+            self.assertLess(time.perf_counter() - start, 0.3)
+            self.assertEqual([book.title for book in books], ["Война и мир"])
+            await save_task
+
+        # Своё сохранение не считается внешним изменением и не перезагружает каталог
+        load_count = book_tools.storage.load_count
+        await book_tools.get_catalog()
+        self.assertEqual(book_tools.storage.load_count, load_count)
+        await book_tools.close()
+
+    async def test_sqlite_storage(self):
+        storage = SqliteStorage(os.path.join(self.temp_dir.name, "data.db"))
+        book_tools = await AsyncBookTools.open(storage=storage, save_delay=0.01)
+        await self.run_clients(book_tools, clients=5)
+        self.assertEqual(len(await book_tools.get_catalog()), 50)
+        await book_tools.close()
+
+        # Изменения зафиксированы в базе
+        reopened = SqliteStorage(storage.file_path)
+        reopened.load()
+        self.assertEqual(reopened.count(), 50)
+        reopened.connection.close()
+        storage.connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
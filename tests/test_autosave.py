@@ -0,0 +1,195 @@
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from unittest import mock
+
+from book_helpers import BookTools
+from storage import JsonStorage, SqliteStorage
+
+
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        # Файл данных создаётся во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.json")
+        book_tools = BookTools(storage=JsonStorage(self.file_path))
+        for number in range(1, 4):
+            book_tools.add_book(f"Книга {number}", "Автор", "2000")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_snapshot(self):
+        with open(self.file_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def load_catalog(self, storage_class=JsonStorage, file_path=None):
+        # Каталог, который увидит следующий запуск приложения
+        storage = storage_class(file_path or self.file_path)
+        storage.load()
+        return {book.id: book.to_dict() for book in storage.get_books()}
+
+    def test_flush_after_changes(self):
+        # После autosave_every изменений дописываются только изменённые книги, снимок не перезаписывается
+        book_tools = BookTools(storage=JsonStorage(self.file_path), autosave_every=3)
+        snapshot = self.read_snapshot()
+        book_tools.update_book(book_tools.get_book(1), "status", "Выдана")
+        book_tools.update_book(book_tools.get_book(2), "status", "Выдана")
+        self.assertEqual(book_tools.autosaver.saves, 0)
+        book_tools.add_book("Новая книга", "Автор", "2024")
+        self.assertEqual(book_tools.autosaver.saves, 1)
+        self.assertEqual(book_tools.changes, 0)
+
+        self.assertEqual(self.read_snapshot(), snapshot)
+        with open(book_tools.storage.journal_file, "r", encoding="utf-8") as journal_file:
+            records = [json.loads(line) for line in journal_file]
+        self.assertEqual([(record["op"], record["book"]["id"]) for record in records],
+                         [("put", 1), ("put", 2), ("put", 4)])
+
+        catalog = self.load_catalog()
+        self.assertEqual(catalog[1]["status"], "Выдана")
+        self.assertEqual(catalog[4]["title"], "Новая книга")
+        book_tools.autosaver.stop()
+
+    def test_flush_on_timer(self):
+        # Фоновый поток сохраняет изменения без новых действий пользователя
+        book_tools = BookTools(storage=JsonStorage(self.file_path), autosave_interval=0.05)
+        book_tools.update_book(book_tools.get_book(3), "status", "Выдана")
+        deadline = time.monotonic() + 5
+        while book_tools.autosaver.saves == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        book_tools.autosaver.stop()
+        self.assertEqual(self.load_catalog()[3]["status"], "Выдана")
+
+    def test_timer_survives_errors(self):
+        # Любая ошибка сохранения выводится в stderr и не останавливает фоновый поток
+        book_tools = BookTools(storage=JsonStorage(self.file_path), autosave_interval=0.05)
+        flush_changes = book_tools.flush_changes
+        errors = [RuntimeError("сбой"), OSError("диск")]
+
+        def failing_flush_changes():
+            if errors:
+                raise errors.pop(0)
+            return flush_changes()
+
+        book_tools.update_book(book_tools.get_book(3), "status", "Выдана")
+        with mock.patch.object(book_tools, "flush_changes", failing_flush_changes), \
+                mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            deadline = time.monotonic() + 5
+            while book_tools.autosaver.saves == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertTrue(book_tools.autosaver.thread.is_alive())
+        book_tools.autosaver.stop()
+        self.assertIn("RuntimeError", stderr.getvalue())
+        self.assertIsInstance(book_tools.autosaver.last_error, OSError)
+        self.assertEqual(self.load_catalog()[3]["status"], "Выдана")
+
+    def test_removed_and_renumbered_books(self):
+        # Удаление и смена id сохраняются записями remove и put
+        book_tools = BookTools(storage=JsonStorage(self.file_path), autosave_every=100)
+        book_tools.remove_book(1)
+        book_tools.update_book(book_tools.get_book(2), "id", 20)
+        book_tools.flush_changes()
+        self.assertEqual(sorted(self.load_catalog()), [3, 20])
+
+        # Полное сохранение переносит изменения в снимок и удаляет журнал
+        book_tools.save_book_list()
+        self.assertFalse(os.path.exists(book_tools.storage.journal_file))
+        self.assertEqual(sorted(item["id"] for item in self.read_snapshot()), [3, 20])
+        book_tools.autosaver.stop()
+
+    def test_own_compaction_is_not_external_change(self):
+        # Фоновое сжатие журнала обновляет отпечаток вместе с подменой data.json: проверка изменений сразу после
+        # подмены не видит внешнего изменения и не перезагружает каталог с потерей несохранённых изменений
+        book_tools = BookTools(storage=JsonStorage(self.file_path, compact_threshold=2), autosave_every=1)
+        storage = book_tools.storage
+        write_snapshot = storage.write_snapshot
+        seen_changes = []
+
+        def checked_write_snapshot(json_content, file_path, compact=False, chunk_size=10_000, replace=os.replace):
+            def checked_replace(temp_path, target_path):
+                replace(temp_path, target_path)
+                seen_changes.append(storage.is_changed())
+            write_snapshot(json_content, file_path, compact, chunk_size, checked_replace)
+
+        with mock.patch.object(storage, "write_snapshot", checked_write_snapshot):
+            book_tools.update_book(book_tools.get_book(1), "status", "Выдана")
+            book_tools.update_book(book_tools.get_book(2), "status", "Выдана")
+            storage.compaction_thread.join()
+        self.assertEqual(seen_changes, [False])
+        self.assertFalse(os.path.exists(storage.journal_file))
+
+        load_count = storage.load_count
+        book_tools.check_changes()
+        self.assertEqual(storage.load_count, load_count)
+        self.assertEqual(self.load_catalog()[2]["status"], "Выдана")
+        book_tools.autosaver.stop()
+
+    def test_sqlite_autosave(self):
+        # SqliteStorage копит изменения в одной транзакции и фиксирует её при автосохранении
+        db_path = os.path.join(self.temp_dir.name, "data.db")
+        book_tools = BookTools(storage=SqliteStorage(db_path), autosave_every=2)
+        book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+        self.assertEqual(self.load_catalog(SqliteStorage, db_path), {})
+        book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+        self.assertEqual(len(self.load_catalog(SqliteStorage, db_path)), 2)
+        book_tools.autosaver.stop()
+
+    def test_flush_on_signal(self):
+        # SIGTERM и Ctrl+C сохраняют изменения, после чего процесс завершается как обычно
+        script = textwrap.dedent(f"""
+            import os, signal, sys
+            sys.path.insert(0, {os.getcwd()!r})
+            from book_helpers import BookTools
+            from storage import JsonStorage
+
+            book_tools = BookTools(storage=JsonStorage({self.file_path!r}), autosave_interval=60)
+            book_tools.update_book(book_tools.get_book(int(sys.argv[2])), "status", "Выдана")
+            os.kill(os.getpid(), getattr(signal, sys.argv[1]))
+        """)
+        process = subprocess.run([sys.executable, "-c", script, "SIGTERM", "1"], capture_output=True)
+        self.assertEqual(process.returncode, -signal.SIGTERM)
+        process = subprocess.run([sys.executable, "-c", script, "SIGINT", "2"], capture_output=True, text=True)
+        self.assertIn("KeyboardInterrupt", process.stderr)
+
+        catalog = self.load_catalog()
+        self.assertEqual(catalog[1]["status"], "Выдана")
+        self.assertEqual(catalog[2]["status"], "Выдана")
+
+    def test_signal_during_change(self):
+        # Сигнал посреди изменения обрабатывается после него: изменение сохраняется целиком
+        script = textwrap.dedent(f"""
+            import os, signal, sys
+            sys.path.insert(0, {os.getcwd()!r})
+            from book_helpers import BookTools
+            from storage import JsonStorage
+
+            book_tools = BookTools(storage=JsonStorage({self.file_path!r}), autosave_interval=60)
+            update_book = book_tools.storage.update_book
+
+            def interrupted_update_book(book_object, field, value):
+                update_book(book_object, field, value)
+                os.kill(os.getpid(), getattr(signal, sys.argv[1]))
+
+            book_tools.storage.update_book = interrupted_update_book
+            book_tools.update_book(book_tools.get_book(int(sys.argv[2])), "status", "Выдана")
+        """)
+        process = subprocess.run([sys.executable, "-c", script, "SIGTERM", "1"], capture_output=True)
+        self.assertEqual(process.returncode, -signal.SIGTERM)
+        process = subprocess.run([sys.executable, "-c", script, "SIGINT", "2"], capture_output=True, text=True)
+        self.assertIn("KeyboardInterrupt", process.stderr)
+
+        catalog = self.load_catalog()
+        self.assertEqual(catalog[1]["status"], "Выдана")
+        self.assertEqual(catalog[2]["status"], "Выдана")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from batch import BatchRunner, iter_commands
+from book_helpers import BookTools
+from storage import JsonStorage, SqliteStorage
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.json")
+        self.book_tools = BookTools(storage=JsonStorage(self.file_path))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_batch(self, text, file_format="jsonl", **kwargs):
+        return BatchRunner(self.book_tools, **kwargs).run(iter_commands(io.StringIO(text), file_format))
+
+    def test_commands_and_errors(self):
+        commands = [
+            {"op": "add", "title": "Valid Title", "author": "Valid Author", "year": "2023"},
+            {"op": "add", "title": "Va", "author": "Valid Author", "year": "2023"},
+            {"op": "update", "id": 1, "field": "status", "value": "Выдана"},
+            {"op": "update", "id": 1, "field": "status", "value": "Потеряна"},
+            {"op": "remove", "id": 7},
+            {"op": "search", "query": "valid"},
+            {"op": "unknown"},
+        ]
+        text = "\n".join(json.dumps(command, ensure_ascii=False) for command in commands) + "\n{not json\n"
+        output = io.StringIO()
+        report = self.run_batch(text, output=output)
+
+        # Проверяем что ошибочные команды пропущены и попали в отчёт с номерами строк
+        self.assertEqual(report.operations, 3)
+        self.assertEqual([line_number for line_number, error in report.errors], [2, 4, 5, 7, 8])
+        self.assertEqual(output.getvalue(), "[6] Найдено книг: 1\n  1. Valid Title, Valid Author, 2023, Выдана\n")
+
+        # Проверяем что изменения сохранены
+        self.assertEqual([(book.id, book.status) for book in BookTools(storage=JsonStorage(self.file_path)).book_list],
+                         [(1, "Выдана")])
+
+    def test_invalid_value_types(self):
+        # null, списки и объекты в командах - ошибка команды, а не строка "None" или TypeError
+        commands = [
+            {"op": "add", "title": "Valid Title", "author": None, "year": "2023"},
+            {"op": "add", "title": ["Valid", "Title"], "author": "Valid Author", "year": "2023"},
+            {"op": "search", "query": "valid", "fields": [["title"], {"author": 1}]},
+            {"op": "update", "id": None, "field": "status", "value": "Выдана"},
+            {"op": "add", "title": "Valid Title", "author": "Valid Author", "year": 2023},
+        ]
+        text = "\n".join(json.dumps(command) for command in commands)
+        report = self.run_batch(text)
+        self.assertEqual(report.operations, 1)
+        self.assertEqual(report.errors, [(1, "значение author должно быть строкой или числом"),
+                                         (2, "значение title должно быть строкой или числом"),
+                                         (3, "поля поиска должны быть списком из: id, title, author, year, status"),
+                                         (4, "значение id должно быть строкой или числом")])
+
+    def test_writes_coalesced(self):
+        text = "".join(json.dumps({"op": "add", "title": f"Title {number}", "author": "Valid Author",
+                                   "year": "2000"}) + "\n" for number in range(100))
+
+        # Проверяем что пакет сохраняется один раз, а с save_every - каждые N команд и в конце
+        with mock.patch.object(self.book_tools.storage, "write_snapshot") as write_snapshot:
+            self.run_batch(text)
+        self.assertEqual(write_snapshot.call_count, 1)
+        with mock.patch.object(self.book_tools.storage, "write_snapshot") as write_snapshot:
+            self.run_batch(text, save_every=30)
+        self.assertEqual(write_snapshot.call_count, 4)
+        self.assertEqual(self.book_tools.storage.count(), 200)
+
+    def test_csv_with_sqlite(self):
+        self.book_tools = BookTools(storage=SqliteStorage(os.path.join(self.temp_dir.name, "data.db")))
+        text = ("op,id,title,author,year,field,value,query,fields\n"
+                "add,,Мастер и Маргарита,Михаил Булгаков,1967,,,,\n"
+                "add,,Собачье сердце,Михаил Булгаков,1925,,,,\n"
+                "update,2,,,,year,1987,,\n"
+                "search,,,,,,,булгаков,title;author\n")
+        output = io.StringIO()
+        report = self.run_batch(text, file_format="csv", output=output)
+        self.book_tools.storage.connection.close()
+
+        self.assertEqual((report.operations, report.errors), (4, []))
+        self.assertIn("[5] Найдено книг: 2", output.getvalue())
+        self.assertIn("2. Собачье сердце, Михаил Булгаков, 1987, В наличии", output.getvalue())
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.catalog import make_books, write_catalog
+from benchmarks.suite import compare_results, run_size
+from storage import JsonStorage
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_catalog_is_reproducible(self):
+        # Один и тот же seed даёт один и тот же каталог, в нём есть и кириллица, и латиница
+        books = make_books(500, seed=7)
+        self.assertEqual([book.to_dict() for book in books], [book.to_dict() for book in make_books(500, seed=7)])
+        self.assertNotEqual([book.title for book in books], [book.title for book in make_books(500, seed=8)])
+        authors = " ".join(book.author for book in books)
+        self.assertRegex(authors, "[а-яА-Я]")
+        self.assertRegex(authors, "[a-zA-Z]")
+
+    def test_written_catalog_loads(self):
+        # Файл .json генератора читается хранилищем как data.json
+        file_path = os.path.join(self.temp_dir.name, "catalog.json")
+        write_catalog(file_path, 100, seed=3)
+        storage = JsonStorage(file_path)
+        storage.load()
+        self.assertEqual([book.to_dict() for book in storage.get_books()],
+                         [book.to_dict() for book in make_books(100, seed=3)])
+
+    def test_run_size(self):
+        # Замерены все операции
+        results = run_size("json", 200, 2, 0, False, self.temp_dir.name)
+        self.assertEqual(set(results), {"get_book_list", "save_book_list", "search_books[strong]", "search_books",
+                                        "search_books[id]", "add_book", "update_book", "remove_book"})
+        for timing in results.values():
+            self.assertEqual(timing["runs"], 2)
+            self.assertLessEqual(timing["min_ms"], timing["median_ms"])
+
+    def test_compare_results(self):
+        # Регрессия - замедление больше порога, заметное в миллисекундах
+        baseline = {"results": [{"size": 1000, "operation": "add_book", "median_ms": 10.0},
+                                {"size": 1000, "operation": "search_books", "median_ms": 0.01},
+                                {"size": 1000, "operation": "remove_book", "median_ms": 10.0}]}
+        current = {"results": [{"size": 1000, "operation": "add_book", "median_ms": 13.0},
+                               {"size": 1000, "operation": "search_books", "median_ms": 0.02},
+                               {"size": 1000, "operation": "remove_book", "median_ms": 11.0},
+                               {"size": 10000, "operation": "add_book", "median_ms": 100.0}]}
+        rows = {row["operation"]: row for row in compare_results(baseline, current, threshold=0.2)}
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(rows["add_book"]["regression"])
+        self.assertFalse(rows["search_books"]["regression"])
+        self.assertFalse(rows["remove_book"]["regression"])
+        self.assertAlmostEqual(rows["add_book"]["ratio"], 1.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+from binary_snapshot import BinarySnapshot, write_binary_snapshot
+from book_helpers import BookTools
+from main import run_convert
+from models import Book
+from storage import BinaryStorage, JsonStorage
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        # Файлы создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.bin")
+        self.book_list = [Book(book_id, f"Книга {book_id}", "Лев Толстой" if book_id % 2 else "Jane Austen",
+                               str(1800 + book_id)) for book_id in range(1, 11)]
+        write_binary_snapshot(self.book_list, self.file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        # Книги читаются из снимка без потерь, включая значения не строкового типа
+        books = [Book(7, "Война и мир", "Лев Толстой", "1867"), Book(3, "Ёж", "", 2024, "Выдана"),
+                 Book(5, "Old Book", None, ["1", 2], "Списана")]
+        write_binary_snapshot(books, self.file_path)
+        with BinarySnapshot(self.file_path) as snapshot:
+            self.assertEqual([book.to_dict() for book in snapshot], [book.to_dict() for book in books])
+            self.assertEqual(snapshot.get_book(3).year, 2024)
+            self.assertIsNone(snapshot.get_book(4))
+            self.assertEqual(snapshot.get_max_id(), 7)
+
+        with self.assertRaises(ValueError):
+            write_binary_snapshot([Book("1", "Книга", "Автор", "2000")], self.file_path)
+        with open(self.file_path, "w", encoding="utf-8") as json_file:
+            json.dump([], json_file)
+        with self.assertRaises(ValueError):
+            BinarySnapshot(self.file_path)
+
+    def test_storage_changes(self):
+        # Изменения хранятся поверх снимка и учитываются при постраничном чтении
+        storage = BinaryStorage(self.file_path)
+        storage.load()
+        storage.deferred = True
+        storage.remove_book(2)
+        storage.remove_book(5)
+        storage.update_book(storage.get_book(3), "status", "Выдана")
+        storage.update_book(storage.get_book(4), "id", 40)
+        new_book = storage.add_book("Новая книга", "Автор", "2024")
+        self.assertEqual(new_book.id, 41)
+
+        expected = [1, 3, 6, 7, 8, 9, 10, 40, 41]
+        self.assertEqual([book.id for book in storage.get_books()], expected)
+        self.assertEqual(storage.count(), len(expected))
+        for offset in range(len(expected) + 1):
+            self.assertEqual([book.id for book in storage.get_page(offset, 3)], expected[offset:offset + 3])
+        self.assertIsNone(storage.get_book(2))
+        self.assertIsNone(storage.get_book(4))
+        self.assertEqual(storage.get_book(3).status, "Выдана")
+
+        # Без сохранения файл не меняется, после сохранения изменения видит новое хранилище
+        self.assertEqual(len(BinaryStorage(self.file_path).read_books()), 10)
+        storage.save()
+        reloaded = BinaryStorage(self.file_path)
+        reloaded.load()
+        self.assertEqual([book.id for book in reloaded.get_books()], expected)
+        self.assertEqual(reloaded.get_book(3).status, "Выдана")
+        storage.snapshot.close()
+        reloaded.snapshot.close()
+
+    def test_book_tools(self):
+        # BookTools работает с бинарным снимком так же, как с data.json
+        book_tools = BookTools(storage=BinaryStorage(self.file_path))
+        self.assertEqual(len(book_tools.search_books("Толстой", ["author"])), 5)
+        self.assertEqual(book_tools.search_books("3", ["id"])[0].title, "Книга 3")
+        book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+        self.assertEqual(book_tools.search_books("Шолохов", ["author"])[0].id, 11)
+
+        storage = BinaryStorage(self.file_path)
+        storage.load()
+        self.assertEqual(storage.count(), 11)
+        book_tools.storage.snapshot.close()
+        storage.snapshot.close()
+
+    def test_convert(self):
+        # data.json -> снимок -> data.json без потерь
+        json_path = os.path.join(self.temp_dir.name, "data.json")
+        JsonStorage.write_snapshot((book.to_dict() for book in self.book_list), json_path)
+        with open(json_path, "rb") as json_file:
+            original = json_file.read()
+        run_convert(argparse.Namespace(source=json_path, target=self.file_path, compact=False))
+        os.remove(json_path)
+        run_convert(argparse.Namespace(source=self.file_path, target=json_path, compact=False))
+        with open(json_path, "rb") as json_file:
+            self.assertEqual(json_file.read(), original)
+
+
+if __name__ == '__main__':
+    unittest.main()
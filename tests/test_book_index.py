@@ -0,0 +1,52 @@
+import os
+import unittest
+
+from main import Router
+
+
+class TestBookIndex(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.mock_router = Router(test_mode=True)
+        self.book_tools = self.mock_router.book_tools
+
+        # Создаём книги с id 1 и 2
+        self.book_tools.add_book("Valid Title", "Valid Author", "2023")
+        self.book_tools.add_book("Other Title", "Other Author", "1999")
+
+    def tearDown(self):
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    def test_get_book(self):
+        # Проверяем получение книги по id
+        self.assertEqual(self.book_tools.get_book(2).title, "Other Title")
+
+        # Проверяем что несуществующий id возвращает None
+        self.assertIsNone(self.book_tools.get_book(30))
+
+    def test_search_by_id_is_exact(self):
+        # Проверяем что поиск по id ищет точное совпадение, а не вхождение
+        self.book_tools.update_book(self.book_tools.get_book(2), "id", 12)
+        self.assertEqual([book.id for book in self.book_tools.search_books("1", ['id'], strong=True)], [1])
+        self.assertEqual(self.book_tools.search_books("2", ['id'], strong=True), [])
+
+        # Проверяем что некорректный id не проходит валидацию
+        self.assertIsNone(self.book_tools.search_books("test", ['id'], strong=True))
+
+    def test_remove_book_updates_index(self):
+        self.book_tools.remove_book(1)
+
+        # Проверяем что книга удалена из индекса и каталога
+        self.assertIsNone(self.book_tools.get_book(1))
+        self.assertEqual([book.id for book in self.book_tools.book_list], [2])
+
+        # Проверяем что новая книга получает следующий id
+        self.book_tools.add_book("New Title", "New Author", "2000")
+        self.assertEqual(self.book_tools.get_book(3).title, "New Title")
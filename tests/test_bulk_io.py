@@ -0,0 +1,83 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from book_helpers import BookTools
+from bulk_io import import_books, export_books
+from storage import JsonStorage, SqliteStorage
+
+
+class TestBulkIO(unittest.TestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.json")
+        self.book_tools = BookTools(storage=JsonStorage(self.file_path))
+        self.book_tools.add_book("Valid Title", "Valid Author", "2023")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_import_csv_with_errors(self):
+        text = ("title,author,year,status\n"
+                "Война и мир,Лев Толстой,1867,Выдана\n"
+                "Ab,Лев Толстой,1867,\n"
+                "Анна Каренина,Лев Толстой,год,\n"
+                "Мастер и Маргарита,Михаил Булгаков,1967,Потеряна\n"
+                "Собачье сердце,Михаил Булгаков,1925,\n")
+
+        # Проверяем что пакеты сохраняются одним снимком в конце импорта
+        with mock.patch.object(self.book_tools.storage, "write_snapshot",
+                               wraps=self.book_tools.storage.write_snapshot) as write_snapshot:
+            report = import_books(self.book_tools, io.StringIO(text), "csv", chunk_size=2)
+        self.assertEqual(write_snapshot.call_count, 1)
+
+        # Проверяем что ошибки указаны по строкам, а корректные книги получили id подряд
+        self.assertEqual(report.imported, 2)
+        self.assertEqual([line_number for line_number, error in report.errors], [3, 4, 5])
+        self.assertEqual([(book.id, book.title, book.status) for book in
+                          BookTools(storage=JsonStorage(self.file_path)).book_list],
+                         [(1, "Valid Title", "В наличии"), (2, "Война и мир", "Выдана"),
+                          (3, "Собачье сердце", "В наличии")])
+
+    def test_import_null_and_nested_values(self):
+        # null, списки и объекты не превращаются в строки "None" и "[...]": запись пропускается с ошибкой поля
+        records = [{"title": "Война и мир", "author": "Лев Толстой", "year": 1867},
+                   {"title": "Анна Каренина", "author": None, "year": "1877"},
+                   {"title": ["Мастер", "Маргарита"], "author": "Михаил Булгаков", "year": "1967"},
+                   {"title": "Тихий Дон", "author": "Михаил Шолохов", "year": "1928", "status": None},
+                   {"title": "Собачье сердце", "author": {"name": "Булгаков"}, "year": "1925"}]
+        text = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        report = import_books(self.book_tools, io.StringIO(text))
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.errors, [(2, "author: значение должно быть строкой или числом"),
+                                         (3, "title: значение должно быть строкой или числом"),
+                                         (4, "status: значение должно быть строкой или числом"),
+                                         (5, "author: значение должно быть строкой или числом")])
+        self.assertEqual([(book.title, book.year) for book in self.book_tools.book_list],
+                         [("Valid Title", "2023"), ("Война и мир", "1867")])
+
+    def test_export_import_round_trip(self):
+        # Выгружаем каталог в JSON-lines и загружаем его в базу SQLite
+        self.book_tools.update_book(self.book_tools.get_book(1), "status", "Выдана")
+        output = io.StringIO()
+        self.assertEqual(export_books(self.book_tools, output), 1)
+        self.assertEqual(json.loads(output.getvalue()), self.book_tools.get_book(1).to_dict())
+
+        sqlite_tools = BookTools(storage=SqliteStorage(os.path.join(self.temp_dir.name, "data.db")))
+        sqlite_tools.add_book("Other Title", "Other Author", "1999")
+        report = import_books(sqlite_tools, io.StringIO(output.getvalue() + "[1, 2]\n"))
+        self.assertEqual((report.imported, report.errors), (1, [(2, "запись должна быть объектом JSON")]))
+
+        # Проверяем экспорт из базы в CSV
+        output = io.StringIO()
+        export_books(sqlite_tools, output, "csv")
+        sqlite_tools.storage.connection.close()
+        self.assertEqual(output.getvalue().splitlines(), [
+            "id,title,author,year,status",
+            "1,Other Title,Other Author,1999,В наличии",
+            "2,Valid Title,Valid Author,2023,Выдана",
+        ])
@@ -0,0 +1,44 @@
+import json
+import os
+import unittest
+
+from main import Router
+
+
+class TestCatalogCache(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.mock_router = Router(test_mode=True)
+        self.book_tools = self.mock_router.book_tools
+        self.book_tools.add_book("Valid Title", "Valid Author", "2023")
+
+    def tearDown(self):
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    def test_catalog_served_from_memory(self):
+        # Проверяем что повторный рендер не перечитывает файл и отдаёт тот же каталог
+        catalog = self.book_tools.get_catalog()
+        self.assertIs(self.book_tools.get_catalog(), catalog)
+        self.assertEqual([book.title for book in catalog], ["Valid Title"])
+
+        # Проверяем что добавление книги обновляет каталог
+        self.book_tools.add_book("Other Title", "Other Author", "1999")
+        self.assertEqual([book.title for book in self.book_tools.get_catalog()], ["Valid Title", "Other Title"])
+
+    def test_external_change_reloaded(self):
+        # Изменяем data.json "из другой программы"
+        with open("data.json", "w", encoding="utf-8") as json_file:
+            json.dump([{"id": 7, "title": "External Title", "author": "External Author", "year": "2000",
+                        "status": "В наличии"}], json_file)
+
+        # Проверяем что каталог перечитан, а индексы перестроены
+        self.assertEqual([book.id for book in self.book_tools.get_catalog()], [7])
+        self.assertEqual(self.book_tools.get_book(7).title, "External Title")
+        self.assertIsNone(self.book_tools.get_book(1))
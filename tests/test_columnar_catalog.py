@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from models import Book, ColumnarCatalog
+from storage import JsonStorage
+
+
+class TestColumnarCatalog(unittest.TestCase):
+    def setUp(self):
+        self.book_list = [
+            Book(1, "Война и мир", "Лев Толстой", "1867"),
+            Book(2, "Анна Каренина", "Лев Толстой", "1877", "Выдана"),
+            Book(3, "Old Book", "Unknown", "0999", "Списана"),
+        ]
+        self.catalog = ColumnarCatalog(self.book_list)
+
+    def test_repr_unchanged(self):
+        # Проверяем что книги из колонок выводятся так же, как исходные объекты
+        for book in self.book_list:
+            self.assertEqual(repr(self.catalog[book.id]), repr(book))
+            self.assertEqual(self.catalog[book.id].full_repr(), book.full_repr())
+        self.assertEqual([repr(book) for book in self.catalog.values()], [repr(book) for book in self.book_list])
+
+    def test_mutations(self):
+        # Обновление записывается обратно через catalog[id] = book
+        book = self.catalog[2]
+        book.status = "В наличии"
+        self.catalog[2] = book
+        self.assertEqual(self.catalog[2].status, "В наличии")
+
+        # Удаление и повторное добавление последнего id сохраняют поиск по id двоичным поиском
+        self.assertEqual(self.catalog.pop(3).title, "Old Book")
+        self.assertIsNone(self.catalog.pop(3))
+        self.catalog[3] = Book(3, "New Book", "Author", "2000")
+        self.assertIsNone(self.catalog.row_index)
+        self.assertEqual(list(self.catalog), [1, 2, 3])
+        self.assertEqual(next(reversed(self.catalog)), 3)
+
+        # id не по возрастанию - переход на словарь id -> строка
+        self.catalog[0] = Book(0, "Zero", "Author", "2000")
+        self.assertIsNotNone(self.catalog.row_index)
+        self.assertEqual(list(self.catalog), [1, 2, 3, 0])
+        self.assertEqual(self.catalog.get(0).title, "Zero")
+
+        # Удаление большей части книг перестраивает колонки
+        for book_id in (1, 2, 3):
+            self.catalog.pop(book_id)
+        self.assertEqual(len(self.catalog), 1)
+        self.assertEqual(len(self.catalog.ids), 1)
+        self.assertNotIn(1, self.catalog)
+
+    def test_json_storage(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.json")
+            with open(file_path, "w", encoding="utf-8") as json_file:
+                json.dump([book.to_dict() for book in self.book_list], json_file)
+
+            storage = JsonStorage(file_path, columnar=True)
+            storage.load()
+
+            # Проверяем изменения и сохранение каталога, хранящегося по колонкам
+            storage.update_book(storage.get_book(1), "status", "Выдана")
+            storage.add_book("New Book", "Author", "2000")
+            storage.remove_book(2)
+            self.assertEqual([book.id for book in storage.search("выдана", ["status"])], [1])
+
+            with open(file_path, "r", encoding="utf-8") as json_file:
+                self.assertEqual(json.load(json_file), [
+                    {"id": 1, "title": "Война и мир", "author": "Лев Толстой", "year": "1867", "status": "Выдана"},
+                    {"id": 3, "title": "Old Book", "author": "Unknown", "year": "0999", "status": "Списана"},
+                    {"id": 4, "title": "New Book", "author": "Author", "year": "2000", "status": "В наличии"},
+                ])
+
+    def test_catalog_after_update(self):
+        # Каталог, выведенный до изменения, не остаётся в кэше со старыми значениями полей
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.json")
+            JsonStorage.write_snapshot([book.to_dict() for book in self.book_list], file_path)
+            book_tools = BookTools(storage=JsonStorage(file_path, columnar=True))
+            self.assertEqual(book_tools.get_page(1, 10)[0][0].status, "В наличии")
+
+            book_tools.update_book(book_tools.get_book(1), "status", "Выдана")
+            book_tools.update_book(book_tools.get_book(3), "title", "New Title")
+            books, _ = book_tools.get_page(1, 10)
+            self.assertEqual([(book.title, book.status) for book in books],
+                             [("Война и мир", "Выдана"), ("Анна Каренина", "Выдана"), ("New Title", "Списана")])
+            self.assertEqual(book_tools.get_status_counts()["Выдана"], 2)
+            self.assertEqual([book.id for book in book_tools.get_books_by_status("Выдана")], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
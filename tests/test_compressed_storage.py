@@ -0,0 +1,97 @@
+import argparse
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from main import run_convert
+from storage import JsonStorage, open_data_file
+
+
+class TestCompressedStorage(unittest.TestCase):
+    def setUp(self):
+        # Файлы создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.json_content = [{"id": book_id, "title": f"Книга {book_id}", "author": "Лев Толстой", "year": "1867",
+                              "status": "В наличии"} for book_id in range(1, 51)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_path(self, file_name):
+        return os.path.join(self.temp_dir.name, file_name)
+
+    def write_file(self, file_name):
+        file_path = self.get_path(file_name)
+        JsonStorage.write_snapshot(self.json_content, file_path)
+        return file_path
+
+    def test_codecs(self):
+        # Снимок пишется со сжатием по расширению и читается потоково
+        plain_path = self.get_path("plain.json")
+        JsonStorage.write_snapshot(self.json_content, plain_path)
+        with open(plain_path, "r", encoding="utf-8") as json_file:
+            plain_text = json_file.read()
+        self.assertEqual(plain_text, json.dumps(self.json_content, indent=4, ensure_ascii=False))
+
+        for file_name, decompress in (("data.json.gz", gzip.decompress), ("data.json.xz", lzma.decompress),
+                                      ("data.json.lzma", lzma.decompress), ("data.json", bytes)):
+            for compact in (False, True):
+                file_path = self.get_path(file_name)
+                JsonStorage.write_snapshot(self.json_content, file_path, compact)
+                with open(file_path, "rb") as data_file:
+                    text = decompress(data_file.read()).decode("utf-8")
+                self.assertEqual(json.loads(text), self.json_content)
+                if compact:
+                    self.assertEqual(text, json.dumps(self.json_content, separators=(",", ":"), ensure_ascii=False))
+                else:
+                    self.assertEqual(text, plain_text)
+
+                storage = JsonStorage(file_path)
+                storage.load()
+                self.assertEqual([book.to_dict() for book in storage.get_books()], self.json_content)
+
+    def test_plain_file_with_any_name(self):
+        # Несжатый data.json читается и под именем сжатого файла, сжатый - и под именем data.json
+        shutil.copy(self.write_file("data.json"), self.get_path("old.json.gz"))
+        shutil.copy(self.write_file("data.json.xz"), self.get_path("renamed.json"))
+        for file_name in ("old.json.gz", "renamed.json"):
+            with open_data_file(self.get_path(file_name)) as json_file:
+                self.assertEqual(json.load(json_file), self.json_content)
+
+    def test_book_tools(self):
+        # Новый файл создаётся сжатым, изменения сохраняются через журнал и полной перезаписью
+        file_path = self.get_path("data.json.gz")
+        book_tools = BookTools(storage=JsonStorage(file_path, compact=True), autosave_every=100)
+        book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+        book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+        book_tools.flush_changes()
+        self.assertTrue(os.path.exists(book_tools.storage.journal_file))
+        storage = JsonStorage(file_path)
+        storage.load()
+        self.assertEqual(storage.count(), 2)
+
+        book_tools.remove_book(1)
+        book_tools.save_book_list()
+        book_tools.autosaver.stop()
+        with gzip.open(file_path, "rt", encoding="utf-8") as json_file:
+            self.assertEqual([item["title"] for item in json.load(json_file)], ["Тихий Дон"])
+
+    def test_convert(self):
+        # data.json -> компактный data.json.xz -> data.json с отступами без потерь
+        file_path = self.write_file("data.json")
+        with open(file_path, "rb") as json_file:
+            original = json_file.read()
+        run_convert(argparse.Namespace(source=file_path, target=self.get_path("data.json.xz"), compact=True))
+        os.remove(file_path)
+        run_convert(argparse.Namespace(source=self.get_path("data.json.xz"), target=file_path, compact=False))
+        with open(file_path, "rb") as json_file:
+            self.assertEqual(json_file.read(), original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from book_helpers import BookTools
+from concurrent_tools import ConcurrentBookTools, ReadWriteLock
+from storage import JsonStorage, SqliteStorage
+
+
+class TestConcurrentTools(unittest.TestCase):
+    writers = 4
+    readers = 4
+    books_per_writer = 150
+
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_stress(self, make_storage):
+        added = []
+        errors = []
+        done = threading.Event()
+
+        with ConcurrentBookTools(storage=make_storage(), flush_interval=0.01) as book_tools:
+            def write(number):
+                try:
+                    for i in range(self.books_per_writer):
+                        book = book_tools.add_book(f"Книга {number}-{i}", f"Автор {number}", "2000")
+                        if i % 3 == 0:
+                            book_tools.update_book(book, "status", "Выдана")
+                        if i % 5 == 0:
+                            book_tools.remove_book(book.id)
+                        else:
+                            added.append(book.title)
+                except Exception as error:
+                    errors.append(error)
+
+            def read():
+                try:
+                    while not done.is_set():
+                        # Книга, добавление которой уже завершилось, должна находиться поиском
+                        if added:
+                            title = added[-1]
+                            result = book_tools.search_books(title, ["title"], strong=True)
+                            self.assertEqual([book.title for book in result], [title])
+                        counts = book_tools.get_status_counts()
+                        self.assertGreaterEqual(sum(counts.values()), 0)
+                        book_tools.search_range("year", 1999, 2001)
+                        book_tools.search_fuzzy("автр")
+                        # Пауза между запросами, как у обработчика запросов сервиса
+                        time.sleep(0.001)
+                except Exception as error:
+                    errors.append(error)
+
+            reader_threads = [threading.Thread(target=read) for _ in range(self.readers)]
+            writer_threads = [threading.Thread(target=write, args=(number,)) for number in range(self.writers)]
+            for thread in reader_threads + writer_threads:
+                thread.start()
+            for thread in writer_threads:
+                thread.join()
+            done.set()
+            for thread in reader_threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            # id уникальны, счётчики статусов совпадают с каталогом
+            catalog = book_tools.get_catalog()
+            self.assertEqual(len({book.id for book in catalog}), len(catalog))
+            counts = book_tools.get_status_counts()
+            self.assertEqual(counts["Выдана"], sum(book.status == "Выдана" for book in catalog))
+
+        self.assertGreater(book_tools.saves, 1)
+
+        # После закрытия все изменения сохранены
+        storage = make_storage()
+        saved = BookTools(storage=storage).get_catalog()
+        self.assertEqual(sorted(book.title for book in saved), sorted(added))
+        self.assertEqual(len(saved), self.writers * self.books_per_writer * 4 // 5)
+        return storage
+
+    def test_json_storage(self):
+        self.run_stress(lambda: JsonStorage(os.path.join(self.temp_dir.name, "data.json")))
+
+    def test_sqlite_storage(self):
+        storage = self.run_stress(lambda: SqliteStorage(os.path.join(self.temp_dir.name, "data.db")))
+        storage.connection.close()
+
+    def test_lock_fairness(self):
+        # Ожидающий писатель не пропускает новых читателей
+        lock = ReadWriteLock()
+        order = []
+        def write():
+            with lock.write_locked():
+                order.append("write")
+
+        def read():
+            with lock.read_locked():
+                order.append("read")
+
+        with lock.read_locked():
+            writer = threading.Thread(target=write)
+            writer.start()
+            while not lock.waiting_writers:
+                pass
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(0.05)
+            self.assertEqual(order, [])
+        writer.join()
+        reader.join()
+        self.assertEqual(order, ["write", "read"])
+
+    def test_reads_during_save(self):
+        # Страница каталога из другого потока не ждёт окончания записи снимка фоновым потоком
+        storage = JsonStorage(os.path.join(self.temp_dir.name, "data.json"))
+        with ConcurrentBookTools(storage=storage, flush_interval=0.01) as book_tools:
+            write_snapshot = storage.write_snapshot
+            saving = threading.Event()
+
+            def slow_write_snapshot(*args, **kwargs):
+                saving.set()
+                time.sleep(0.5)
+                write_snapshot(*args, **kwargs)
+
+            with mock.patch.object(storage, "write_snapshot", slow_write_snapshot):
+                book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+                self.assertTrue(saving.wait(5))
+                start = time.perf_counter()
+                books, _ = book_tools.get_page(1, 10)
+                self.assertLess(time.perf_counter() - start, 0.3)
+                self.assertEqual([book.title for book in books], ["Война и мир"])
+                book_tools.close()
+            self.assertEqual(book_tools.saves, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from fuzzy_index import FuzzyIndex
+from main import Router
+from models import Book
+from screen_renders import SearchPage
+from storage import JsonStorage, SqliteStorage
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = [
+            JsonStorage(os.path.join(self.temp_dir.name, "data.json")),
+            JsonStorage(os.path.join(self.temp_dir.name, "columnar.json"), columnar=True),
+            SqliteStorage(os.path.join(self.temp_dir.name, "data.db")),
+        ]
+        self.tools_list = [BookTools(storage=storage) for storage in self.storages]
+        for book_tools in self.tools_list:
+            book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+            book_tools.add_book("Мастер и Маргарита", "Михаил Булгаков", "1967")
+            book_tools.add_book("Толстый и тонкий", "Антон Чехов", "1883")
+
+    def tearDown(self):
+        self.storages[2].connection.close()
+        self.temp_dir.cleanup()
+
+    def get_ids(self, book_list):
+        return [book.id for book in book_list]
+
+    def test_ranking(self):
+        index = FuzzyIndex([Book(1, "Война и мир", "Лев Толстой", "1867"),
+                            Book(2, "Толстый и тонкий", "Антон Чехов", "1883")])
+        # Опечатка в слове: книга с точным словом выше похожей
+        result = index.search("толстоу")
+        self.assertEqual([book_id for book_id, score in result], [1, 2])
+        self.assertGreater(result[0][1], result[1][1])
+
+        # Оценка - среднее по словам запроса, количество результатов ограничено
+        self.assertEqual(index.search("лев толстой", limit=1), [(1, 1.0)])
+        self.assertEqual(index.search("xyz"), [])
+        self.assertEqual(index.search(""), [])
+
+    def test_storages(self):
+        for book_tools in self.tools_list:
+            self.assertEqual(self.get_ids(book_tools.search_fuzzy("Булгакв")), [2])
+            self.assertEqual(self.get_ids(book_tools.search_fuzzy("лев толстый")), [1, 3])
+
+            # Индекс обновляется при изменении каталога
+            book_tools.update_book(book_tools.get_book(2), "author", "Другой Автор")
+            book_tools.remove_book(3)
+            book_tools.add_book("Анна Каренина", "Лев Толстой", "1877")
+            self.assertEqual(self.get_ids(book_tools.search_fuzzy("Булгакв")), [])
+            self.assertEqual(self.get_ids(book_tools.search_fuzzy("тонкй")), [])
+            self.assertEqual(self.get_ids(book_tools.search_fuzzy("каренино")), [3])
+
+    def test_search_page_syntax(self):
+        # Запрос с ~ - нечёткий поиск на странице поиска
+        mock_router = Router(test_mode=True, storage=self.storages[0])
+        search_page = SearchPage(mock_router)
+        self.assertEqual(self.get_ids(search_page.find_books("~Маргарото")), [2])
+        self.assertEqual(self.get_ids(search_page.find_books("Маргарото")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
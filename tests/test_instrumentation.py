@@ -0,0 +1,80 @@
+import io
+import os
+import pstats
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from instrumentation import Instrumentation, OperationStats, profile_session
+from main import Router
+from storage import JsonStorage
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        # Файл данных создаётся во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = JsonStorage(os.path.join(self.temp_dir.name, "data.json"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_operation_stats(self):
+        # Гистограмма считает вызовы, перцентиль - граница корзины, но не больше максимума
+        stats = OperationStats()
+        for duration in (0.3, 0.4, 0.4, 3.0, 30.0):
+            stats.record(duration)
+        self.assertEqual(stats.count, 5)
+        self.assertAlmostEqual(stats.total, 34.1)
+        self.assertEqual(stats.percentile(0.5), 0.5)
+        self.assertEqual(stats.percentile(0.95), 30.0)
+
+    def test_disabled_by_default(self):
+        # Без замеров методы не обёрнуты
+        router = Router(test_mode=True, storage=self.storage)
+        self.assertIsNone(router.instrumentation)
+        self.assertNotIn("search_books", vars(router.book_tools))
+        self.assertNotIn("render", vars(router.screens["h"]))
+
+    def test_router_session(self):
+        # Операции сессии записаны, время ожидания ввода не входит во время рендера
+        instrumentation = Instrumentation()
+        router = Router(test_mode=True, storage=self.storage, instrumentation=instrumentation)
+        router.book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+
+        def slow_input(prompt):
+            time.sleep(0.05)
+            return answers.pop(0)
+
+        answers = ["c", "h", "q"]
+        output = io.StringIO()
+        with redirect_stdout(output), mock.patch("builtins.input", slow_input):
+            router.run("h")
+
+        stats = instrumentation.stats
+        self.assertEqual(stats["BookTools.add_book"].count, 1)
+        self.assertEqual(stats["HomePage.render"].count, 2)
+        self.assertEqual(stats["CatalogPage.render"].count, 1)
+        self.assertEqual(stats["Router.redirect_to"].count, 3)
+        self.assertEqual(stats["input"].count, 3)
+        self.assertLess(stats["HomePage.render"].max, 40)
+        # Сводка выводится на экране выхода
+        self.assertIn("CatalogPage.render", output.getvalue())
+        self.assertIn("input", output.getvalue())
+
+    def test_profile_session(self):
+        # Профиль cProfile и отчёт tracemalloc записываются в файлы
+        profile_path = os.path.join(self.temp_dir.name, "session.prof")
+        memory_path = os.path.join(self.temp_dir.name, "memory.txt")
+        with profile_session(profile_path, memory_path):
+            sorted(str(number) for number in range(10_000))
+
+        self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+        with open(memory_path, "r", encoding="utf-8") as memory_file:
+            self.assertIn("пик", memory_file.readline())
+
+
+if __name__ == '__main__':
+    unittest.main()
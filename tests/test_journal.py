@@ -0,0 +1,75 @@
+import json
+import os
+import unittest
+
+from book_helpers import BookTools
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.book_tools = BookTools(journal=True)
+        self.book_tools.add_book("Valid Title", "Valid Author", "2023")
+        self.book_tools.add_book("Other Title", "Other Author", "1999")
+
+    def tearDown(self):
+        # Удаляем тестовые файлы и возвращаем исходный обратно
+        for file_path in ("./data.json", "./data.journal", "./data.journal.compacting"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    def test_mutations_appended_to_journal(self):
+        self.book_tools.update_book(self.book_tools.get_book(2), "status", "Выдана")
+        self.book_tools.remove_book(1)
+
+        # Проверяем что снимок не перезаписан, а изменения лежат в журнале
+        with open("data.json", "r", encoding="utf-8") as json_file:
+            self.assertEqual(json.load(json_file), [])
+        with open("data.journal", "r", encoding="utf-8") as journal_file:
+            self.assertEqual([json.loads(line)["op"] for line in journal_file], ["add", "add", "update", "remove"])
+
+        # Проверяем что при запуске журнал применяется поверх снимка
+        book_list = BookTools(journal=True).book_list
+        self.assertEqual([(book.id, book.status) for book in book_list], [(2, "Выдана")])
+
+    def test_compaction(self):
+        self.book_tools.save_book_list()
+
+        # Проверяем что журнал сжат в снимок
+        self.assertFalse(os.path.exists("data.journal"))
+        with open("data.json", "r", encoding="utf-8") as json_file:
+            self.assertEqual([item["title"] for item in json.load(json_file)], ["Valid Title", "Other Title"])
+
+    def test_stale_journal_removed_without_journal_mode(self):
+        # Сессия в режиме журнала удаляет книгу 2 и завершается без сжатия
+        self.book_tools.remove_book(2)
+
+        # Следующая сессия без журнала: новая книга получает освободившийся id 2
+        book_tools = BookTools()
+        book_tools.add_book("New Title", "New Author", "2000")
+        self.assertFalse(os.path.exists("data.journal"))
+
+        # Проверяем что устаревшая запись журнала не удаляет новую книгу при следующем запуске
+        self.assertEqual([(book.id, book.title) for book in BookTools().book_list],
+                         [(1, "Valid Title"), (2, "New Title")])
+
+    def test_background_compaction(self):
+        self.book_tools.storage.compact_threshold = 1
+        self.book_tools.remove_book(2)
+        self.book_tools.storage.compaction_thread.join()
+
+        # Проверяем что фоновое сжатие записало снимок и удалило сжатый журнал
+        self.assertFalse(os.path.exists("data.journal.compacting"))
+        self.assertEqual([book.id for book in self.book_tools.get_book_list()], [1])
+
+    def test_torn_journal_line_ignored(self):
+        # Имитируем сбой во время дозаписи журнала
+        with open("data.journal", "a", encoding="utf-8") as journal_file:
+            journal_file.write('{"op": "remove", "i')
+
+        self.assertEqual([book.id for book in self.book_tools.get_book_list()], [1, 2])
@@ -0,0 +1,45 @@
+import contextlib
+import io
+import os
+import unittest
+
+from main import Router
+from screen_renders import HomePage, RemoveBookPage
+
+
+class TestNotifications(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.mock_router = Router(test_mode=True)
+
+    def tearDown(self):
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    def test_book_tools_silent(self):
+        # Проверяем что BookTools ничего не выводит и возвращает созданную книгу
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            book = self.mock_router.book_tools.add_book("Valid Title", "Valid Author", "2023")
+            self.mock_router.book_tools.update_book(book, "status", "Выдана")
+            self.mock_router.book_tools.remove_book(book.id)
+        self.assertEqual(book.title, "Valid Title")
+        self.assertEqual(output.getvalue(), "")
+
+    def test_flash_message_shown_on_next_screen(self):
+        book = self.mock_router.book_tools.add_book("Valid Title", "Valid Author", "2023")
+        RemoveBookPage(self.mock_router).process_user_input("1", book_object=book)
+        self.assertEqual(self.mock_router.messages, ["Книга успешно удалена!"])
+
+        # Проверяем что сообщение выводится на следующем экране один раз
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            HomePage(self.mock_router).print_messages()
+            HomePage(self.mock_router).print_messages()
+        self.assertEqual(output.getvalue(), "Книга успешно удалена!\n")
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from main import Router
+from screen_renders import BasePage, CatalogPage
+from storage import SqliteStorage
+
+
+class TestPaging(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.mock_router = Router(test_mode=True, page_size=2)
+        for number in range(1, 6):
+            self.mock_router.book_tools.storage.add_book(f"Title {number}", "Valid Author", "2000")
+
+    def tearDown(self):
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    def test_get_page(self):
+        # Проверяем страницы каталога и признак следующей страницы
+        book_list, has_next = self.mock_router.book_tools.get_page(1, 2)
+        self.assertEqual(([book.id for book in book_list], has_next), ([1, 2], True))
+        book_list, has_next = self.mock_router.book_tools.get_page(3, 2)
+        self.assertEqual(([book.id for book in book_list], has_next), ([5], False))
+        self.assertEqual(self.mock_router.book_tools.get_page(4, 2), ([], False))
+
+    def test_invalid_page_size(self):
+        # Проверяем что размер страницы меньше 1 не принимается
+        for page_size in (0, -1):
+            with self.assertRaises(ValueError):
+                Router(test_mode=True, page_size=page_size)
+
+    def test_get_page_number(self):
+        # Проверяем разбор команд переключения страниц
+        self.assertEqual(BasePage.get_page_number(">", 2), 3)
+        self.assertEqual(BasePage.get_page_number("<", 2), 1)
+        self.assertEqual(BasePage.get_page_number("<", 1), 1)
+        self.assertEqual(BasePage.get_page_number("p7", 2), 7)
+        for value in ["p0", "p", "pa", "7", "c"]:
+            self.assertIsNone(BasePage.get_page_number(value, 2))
+
+    def test_catalog_page_output(self):
+        # Проверяем что каталог выводит только книги текущей страницы
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            CatalogPage(self.mock_router).get_page_content(page=2)
+        self.assertIn("3. Title 3", output.getvalue())
+        self.assertIn("4. Title 4", output.getvalue())
+        self.assertNotIn("Title 5", output.getvalue())
+        self.assertIn("[Страница 2]", output.getvalue())
+
+    def test_sqlite_page_by_primary_key(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SqliteStorage(os.path.join(temp_dir, "data.db"))
+            book_tools = BookTools(storage=storage)
+            for number in range(1, 8):
+                storage.add_book(f"Title {number}", "Valid Author", "2000")
+
+            # Проверяем что страницы, прочитанные по запомненным границам, совпадают с чтением через OFFSET
+            pages = [[book.id for book in book_tools.get_page(page, 3)[0]] for page in (1, 2, 3, 2, 1)]
+            self.assertEqual(pages, [[1, 2, 3], [4, 5, 6], [7], [4, 5, 6], [1, 2, 3]])
+            self.assertIn(3, storage.page_starts)
+
+            # Удаление сбрасывает границы страниц
+            storage.remove_book(2)
+            self.assertEqual([book.id for book in book_tools.get_page(2, 3)[0]], [5, 6, 7])
+            storage.connection.close()
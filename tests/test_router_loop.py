@@ -0,0 +1,68 @@
+import contextlib
+import os
+import sys
+import unittest
+from unittest import mock
+
+from main import Router
+
+
+class TestRouterLoop(unittest.TestCase):
+    def setUp(self):
+        # Переименовываем файл, если он существует
+        if os.path.exists("./data.json"):
+            os.rename("./data.json", "./data_test.json")
+
+        self.mock_router = Router(test_mode=True)
+
+    def tearDown(self):
+        # Удаляем тестовый файл и возвращаем исходный обратно
+        if os.path.exists("./data.json"):
+            os.remove("./data.json")
+        if os.path.exists("./data_test.json"):
+            os.rename("./data_test.json", "./data.json")
+
+    @staticmethod
+    def get_stack_depth():
+        # Глубина стека вызывающего кода - количество кадров до корня
+        frame, depth = sys._getframe(1), 0
+        while frame is not None:
+            frame, depth = frame.f_back, depth + 1
+        return depth
+
+    def run_router(self, inputs):
+        # Запускаем цикл роутера с заданным вводом, запоминая глубину стека при каждом запросе ввода
+        inputs = iter(inputs)
+        stack_depths = []
+
+        def fake_input(prompt=""):
+            stack_depths.append(self.get_stack_depth())
+            return next(inputs)
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                mock.patch("builtins.input", fake_input):
+            self.mock_router.run("h")
+        return stack_depths
+
+    def test_stack_depth_is_constant(self):
+        # 100 000 переходов между экранами, включая поиск и некорректный ввод, и выход с главной страницы:
+        # поиск -> запрос -> главная -> каталог -> некорректный ввод -> главная
+        inputs = ["s", "book", "h", "c", "x", "h"] * 16_667 + ["q"]
+        stack_depths = self.run_router(inputs)
+        self.assertEqual(len(stack_depths), len(inputs))
+
+        # Проверяем что глубина стека не растёт от экрана к экрану
+        self.assertEqual(max(stack_depths[1:]), min(stack_depths[1:]))
+
+    def test_transitions(self):
+        book = self.mock_router.book_tools.add_book("Valid Title", "Valid Author", "2023")
+
+        # Проверяем что страница возвращает переход, а не показывает следующую страницу сама
+        self.assertEqual(self.mock_router.screens["c"].process_user_input(str(book.id)),
+                         ("b", {"book_object": book}))
+        self.assertEqual(self.mock_router.screens["u"].process_user_input("x", book_object=book),
+                         ("u", {"book_object": book}))
+
+        # Проверяем что выход завершает цикл и сохраняет каталог
+        self.run_router(["q"])
+        self.assertTrue(os.path.exists("./data.json"))
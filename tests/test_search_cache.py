@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from storage import JsonStorage
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        # Файл данных создаётся во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        storage = JsonStorage(os.path.join(self.temp_dir.name, "data.json"))
+        self.book_tools = BookTools(storage=storage, cache_size=2)
+        self.book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+        self.book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_titles(self, book_list):
+        return [book.title for book in book_list]
+
+    def test_hits_and_evictions(self):
+        # Повторный запрос берётся из кэша
+        first = self.book_tools.search_books("мир", ["title"], False)
+        self.assertIs(self.book_tools.search_books("мир", ["title"], False), first)
+        stats = self.book_tools.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+        # Поля и strong входят в ключ кэша
+        self.assertEqual(self.book_tools.search_books("мир", ["author"], False), [])
+        self.assertEqual(self.book_tools.get_cache_stats()["misses"], 2)
+
+        # При переполнении вытесняется давно не использованный запрос
+        self.book_tools.search_books("мир", ["title"], False)
+        self.book_tools.search_books("дон", ["title"], False)
+        stats = self.book_tools.get_cache_stats()
+        self.assertEqual((stats["evictions"], stats["size"]), (1, 2))
+        self.book_tools.search_books("мир", ["title"], False)
+        self.assertEqual(self.book_tools.get_cache_stats()["hits"], 3)
+
+    def test_invalidated_by_mutations(self):
+        # Каждое изменение каталога сбрасывает кэш, результаты поиска остаются актуальными
+        self.assertEqual(self.get_titles(self.book_tools.search_books("толстой", ["author"], False)), ["Война и мир"])
+        self.book_tools.add_book("Анна Каренина", "Лев Толстой", "1877")
+        self.assertEqual(self.get_titles(self.book_tools.search_books("толстой", ["author"], False)),
+                         ["Война и мир", "Анна Каренина"])
+
+        self.book_tools.update_book(self.book_tools.get_book(1), "author", "Другой Автор")
+        self.assertEqual(self.get_titles(self.book_tools.search_books("толстой", ["author"], False)),
+                         ["Анна Каренина"])
+
+        self.book_tools.remove_book(3)
+        self.assertEqual(self.book_tools.search_books("толстой", ["author"], False), [])
+        self.assertEqual(self.book_tools.get_cache_stats()["generation"], 5)
+
+    def test_disabled_cache(self):
+        # При нулевом размере результаты не запоминаются
+        self.book_tools.cache_size = 0
+        self.book_tools.search_books("мир", ["title"], False)
+        self.book_tools.search_books("мир", ["title"], False)
+        stats = self.book_tools.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (0, 2, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from models import Book, ColumnarCatalog
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.book_list = [
+            Book(1, "Война и мир", "Лев Толстой", "1867"),
+            Book(2, "Анна Каренина", "Лев Толстой", "1877", "Выдана"),
+            Book(3, "Мастер и Маргарита", "Михаил Булгаков", "1967"),
+            Book(4, "Moby Dick", "Herman Melville", "1851"),
+            Book(5, "Ab", "Xy", "1"),
+        ]
+        self.index = SearchIndex()
+        for book in self.book_list:
+            self.index.add_book(book)
+
+    def linear_search(self, query, search_fields, strong=False):
+        # Исходная реализация поиска полным перебором
+        result = []
+        for item in self.book_list:
+            if strong:
+                if all(query in str(getattr(item, field)) for field in search_fields):
+                    result.append(item.id)
+            else:
+                if any(query.lower() in str(getattr(item, field)).lower() for field in search_fields):
+                    result.append(item.id)
+        return result
+
+    def test_same_results_as_linear_search(self):
+        # Проверяем что результаты индекса совпадают с полным перебором
+        queries = ["толстой", "Толстой", "ТОЛ", "лев", "18", "1", "a", "ab", "", "dick", "Мир", "не найдено", "Выдана"]
+        fields_variants = [["title"], ["author"], ["title", "author", "year"], ["year", "status"], []]
+        for query in queries:
+            for search_fields in fields_variants:
+                for strong in (False, True):
+                    self.assertEqual(self.index.search(query, search_fields, strong),
+                                     self.linear_search(query, search_fields, strong),
+                                     (query, search_fields, strong))
+
+    def test_incremental_update(self):
+        # Удаляем книгу - она пропадает из выдачи
+        self.index.remove_book(1)
+        self.book_list.pop(0)
+        self.assertEqual(self.index.search("толстой", ["author"]), [2])
+
+        # Меняем поле - старое значение больше не находится, новое находится, позиция в выдаче сохраняется
+        self.book_list[0].author = "Другой Автор"
+        self.index.update_book(self.book_list[0])
+        self.assertEqual(self.index.search("толстой", ["author"]), [])
+        self.assertEqual(self.index.search("автор", ["author"]), [2])
+        self.assertEqual(self.index.search("", ["title"]), [2, 3, 4, 5])
+
+    def test_catalog_mode(self):
+        # Компактный режим: тексты читаются из каталога по колонкам, результаты совпадают с полным перебором
+        catalog = ColumnarCatalog(self.book_list)
+        index = SearchIndex(catalog=catalog)
+        for book in self.book_list:
+            index.add_book(book)
+        self.assertEqual(index.texts["title"], {})
+
+        # Удаляем книгу и меняем поле другой - устаревшие триграммы отсеиваются проверкой по каталогу
+        catalog.pop(1)
+        index.remove_book(1)
+        self.book_list.pop(0)
+        self.book_list[0].author = "Другой Автор"
+        catalog[2] = self.book_list[0]
+        index.update_book(self.book_list[0])
+
+        for query in ["толстой", "автор", "ТОЛ", "18", "a", "", "dick", "Мир", "Выдана"]:
+            for search_fields in [["title"], ["author"], ["title", "author", "year"], ["year", "status"], []]:
+                for strong in (False, True):
+                    self.assertEqual(index.search(query, search_fields, strong),
+                                     self.linear_search(query, search_fields, strong),
+                                     (query, search_fields, strong))
@@ -0,0 +1,88 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from storage import JsonStorage
+
+
+def add_books_worker(file_path, number, count):
+    """  Процесс, добавляющий книги в общий файл и меняющий статус каждой второй. """
+    book_tools = BookTools(storage=JsonStorage(file_path, shared=True))
+    for i in range(count):
+        book = book_tools.add_book(f"Книга {number}-{i}", f"Автор {number}", "2000")
+        if i % 2:
+            book_tools.update_book(book, "status", "Выдана")
+
+
+class TestSharedStorage(unittest.TestCase):
+    def setUp(self):
+        # Файл данных создаётся во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "data.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_file(self):
+        with open(self.file_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def test_changes_merged(self):
+        # Два экземпляра хранилища с одним файлом, как два процесса
+        first = BookTools(storage=JsonStorage(self.file_path, shared=True))
+        second = BookTools(storage=JsonStorage(self.file_path, shared=True))
+
+        self.assertEqual(first.add_book("Война и мир", "Лев Толстой", "1867").id, 1)
+        # Перед записью второй экземпляр перечитывает файл и не затирает чужую книгу
+        self.assertEqual(second.add_book("Тихий Дон", "Михаил Шолохов", "1928").id, 2)
+        self.assertEqual(second.get_status_counts(), {"В наличии": 2, "Выдана": 0})
+        second.update_book(second.get_book(1), "status", "Выдана")
+
+        first.add_book("Идиот", "Фёдор Достоевский", "1869")
+        self.assertEqual([(item["id"], item["status"]) for item in self.read_file()],
+                         [(1, "Выдана"), (2, "В наличии"), (3, "В наличии")])
+
+        # Изменения другого процесса видны при чтении, счётчики статусов перестраиваются
+        self.assertEqual([book.id for book in second.get_catalog()], [1, 2, 3])
+        self.assertEqual(second.get_status_counts(), {"В наличии": 2, "Выдана": 1})
+
+        # id не повторяются после удаления
+        first.remove_book(3)
+        self.assertEqual(second.add_book("Анна Каренина", "Лев Толстой", "1877").id, 4)
+        self.assertEqual([item["id"] for item in self.read_file()], [1, 2, 4])
+
+    def test_deferred_writes_hold_lock(self):
+        storage = JsonStorage(self.file_path, shared=True)
+        book_tools = BookTools(storage=storage)
+        with storage.deferred_writes():
+            book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+            self.assertTrue(storage.shared_state.is_locked())
+            self.assertEqual(self.read_file(), [])
+        self.assertFalse(storage.shared_state.is_locked())
+        self.assertEqual(len(self.read_file()), 1)
+
+    def test_processes(self):
+        # Несколько процессов одновременно пишут в один файл: ни одна книга не теряется, id не повторяются
+        processes, count = 4, 30
+        workers = [multiprocessing.Process(target=add_books_worker, args=(self.file_path, number, count))
+                   for number in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        json_content = self.read_file()
+        self.assertEqual(sorted(item["id"] for item in json_content), list(range(1, processes * count + 1)))
+        self.assertEqual(sum(item["status"] == "Выдана" for item in json_content), processes * count // 2)
+
+    def test_journal_rejected(self):
+        with self.assertRaises(ValueError):
+            JsonStorage(self.file_path, shared=True, journal=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
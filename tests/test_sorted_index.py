@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from main import Router
+from screen_renders import SearchPage
+from storage import JsonStorage, SqliteStorage
+
+
+class TestSortedIndex(unittest.TestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = [
+            JsonStorage(os.path.join(self.temp_dir.name, "data.json")),
+            JsonStorage(os.path.join(self.temp_dir.name, "columnar.json"), columnar=True),
+            SqliteStorage(os.path.join(self.temp_dir.name, "data.db")),
+        ]
+        self.tools_list = [BookTools(storage=storage) for storage in self.storages]
+        for book_tools in self.tools_list:
+            book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+            book_tools.add_book("Мастер и Маргарита", "Михаил Булгаков", "1967")
+            book_tools.add_book("Хаджи-Мурат", "Лев Толстой", "1912")
+            book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+
+    def tearDown(self):
+        self.storages[2].connection.close()
+        self.temp_dir.cleanup()
+
+    def get_ids(self, book_list):
+        return [book.id for book in book_list]
+
+    def test_range_and_prefix(self):
+        for book_tools in self.tools_list:
+            # Диапазон годов с включёнными границами, в порядке года
+            self.assertEqual(self.get_ids(book_tools.search_range("year", 1900, 1967)), [3, 4, 2])
+            self.assertEqual(self.get_ids(book_tools.search_range("year", high="1900")), [1])
+            self.assertEqual(self.get_ids(book_tools.search_range("year", 1968)), [])
+
+            # Префикс и диапазон строк без учёта регистра, верхняя граница включает строки, начинающиеся с неё
+            self.assertEqual(self.get_ids(book_tools.search_prefix("author", "лев т")), [1, 3])
+            self.assertEqual(self.get_ids(book_tools.search_range("author", "М", "мИХАИЛ Б")), [2])
+            self.assertEqual(self.get_ids(book_tools.search_range("title", "Т", "Х")), [4, 3])
+
+    def test_index_updated_by_mutations(self):
+        for book_tools in self.tools_list:
+            # Строим индексы до изменений, чтобы проверить их обновление
+            self.assertEqual(len(book_tools.search_range("year")), 4)
+            book_tools.search_prefix("author", "")
+
+            book_tools.update_book(book_tools.get_book(2), "year", "1940")
+            book_tools.update_book(book_tools.get_book(4), "id", 10)
+            book_tools.remove_book(3)
+            book_tools.add_book("Анна Каренина", "Лев Толстой", "1877")
+
+            self.assertEqual(self.get_ids(book_tools.search_range("year", 1900, 1950)), [10, 2])
+            self.assertEqual(self.get_ids(book_tools.search_prefix("author", "Лев")), [1, 11])
+            self.assertEqual(self.get_ids(book_tools.search_prefix("author", "михаил ш")), [10])
+
+    def test_search_page_syntax(self):
+        # Проверяем разбор запросов поиска на странице поиска
+        mock_router = Router(test_mode=True, storage=self.storages[0])
+        search_page = SearchPage(mock_router)
+        self.assertEqual(self.get_ids(search_page.find_books("year:1900..1950")), [3, 4])
+        self.assertEqual(self.get_ids(search_page.find_books("year:1900..")), [3, 4, 2])
+        self.assertEqual(self.get_ids(search_page.find_books("year:1867")), [1])
+        self.assertEqual(self.get_ids(search_page.find_books("author:Лев")), [1, 3])
+        self.assertIsNone(search_page.find_books("year:19x0..1950"))
+        for input_string in ("author:", "title: ", "year:..", "author: .. "):
+            self.assertIsNone(search_page.find_books(input_string))
+
+        # Без поля или с неизвестным полем - обычный поиск по вхождению
+        self.assertEqual(self.get_ids(search_page.find_books("дон")), [4])
+        self.assertEqual(self.get_ids(search_page.find_books("status:1")), [])
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from book_helpers import BookTools
+from storage import SqliteStorage
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        # База данных создаётся во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "data.db")
+
+        self.book_tools = BookTools(storage=SqliteStorage(self.db_path))
+        self.book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+        self.book_tools.add_book("Анна Каренина", "Лев Толстой", "1877")
+        self.book_tools.add_book("Moby Dick", "Herman Melville", "1851")
+
+    def tearDown(self):
+        self.book_tools.storage.connection.close()
+        self.temp_dir.cleanup()
+
+    def test_get_book_and_page(self):
+        # Проверяем получение книги по id и постраничное чтение
+        self.assertEqual(self.book_tools.get_book(2).title, "Анна Каренина")
+        self.assertIsNone(self.book_tools.get_book(30))
+        self.assertEqual([book.id for book in self.book_tools.storage.get_page(1, 5)], [2, 3])
+        self.assertEqual(self.book_tools.storage.count(), 3)
+
+    def test_search(self):
+        # Проверяем поиск по вхождению без учёта регистра и строгий поиск
+        self.assertEqual([book.id for book in self.book_tools.search_books("толстой", ['author'])], [1, 2])
+        self.assertEqual([book.id for book in self.book_tools.search_books("ДИК", ['title'])], [])
+        self.assertEqual([book.id for book in self.book_tools.search_books("dick", ['title', 'year'])], [3])
+        self.assertEqual([book.id for book in self.book_tools.search_books("18", ['year'])], [1, 2, 3])
+        self.assertEqual(self.book_tools.search_books("толстой", ['author'], strong=True), [])
+        self.assertEqual([book.id for book in self.book_tools.search_books("3", ['id'], strong=True)], [3])
+
+        # Спецсимволы GLOB ищутся как обычные символы
+        self.assertEqual(self.book_tools.search_books("*", ['title']), [])
+
+    def test_search_uses_index(self):
+        # Проверяем что поиск по нескольким полям выполняется по триграммному индексу, а не перебором таблицы
+        storage = self.book_tools.storage
+        for strong in (False, True):
+            sql = storage.get_search_query(['title', 'author', 'year'], strong)
+            plan = storage.connection.execute(f"EXPLAIN QUERY PLAN {sql}", ("*abc*",) * 3).fetchall()
+            scans = [row[3] for row in plan if row[3].startswith("SCAN books_search")]
+            self.assertTrue(scans)
+            self.assertFalse([scan for scan in scans if scan.endswith("INDEX 0:")], plan)
+
+    def test_mutations_persisted(self):
+        self.book_tools.update_book(self.book_tools.get_book(1), "status", "Выдана")
+        self.book_tools.remove_book(2)
+
+        # Проверяем что изменения сохранены в базе данных
+        book_tools = BookTools(storage=SqliteStorage(self.db_path))
+        self.assertEqual([(book.id, book.status) for book in book_tools.get_book_list()],
+                         [(1, "Выдана"), (3, "В наличии")])
+        self.assertEqual([book.id for book in book_tools.search_books("толстой", ['author'])], [1])
+        book_tools.storage.connection.close()
@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from book_helpers import BookTools
+from main import Router
+from storage import JsonStorage, SqliteStorage
+
+
+class TestStatusIndex(unittest.TestCase):
+    def setUp(self):
+        # Файлы данных создаются во временной папке
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = [
+            JsonStorage(os.path.join(self.temp_dir.name, "data.json")),
+            JsonStorage(os.path.join(self.temp_dir.name, "columnar.json"), columnar=True),
+            SqliteStorage(os.path.join(self.temp_dir.name, "data.db")),
+        ]
+        self.tools_list = [BookTools(storage=storage) for storage in self.storages]
+        for book_tools in self.tools_list:
+            book_tools.add_book("Война и мир", "Лев Толстой", "1867")
+            book_tools.add_book("Мастер и Маргарита", "Михаил Булгаков", "1967")
+            book_tools.add_book("Тихий Дон", "Михаил Шолохов", "1928")
+
+    def tearDown(self):
+        self.storages[2].connection.close()
+        self.temp_dir.cleanup()
+
+    def get_ids(self, book_list):
+        return [book.id for book in book_list]
+
+    def test_counters_updated(self):
+        for book_tools in self.tools_list:
+            self.assertEqual(book_tools.get_status_counts(), {"В наличии": 3, "Выдана": 0})
+
+            # Каталог перебирается только при построении индекса
+            with mock.patch.object(book_tools.storage, "iter_books") as iter_books:
+                book_tools.update_book(book_tools.get_book(1), "status", "Выдана")
+                book_tools.update_book(book_tools.get_book(3), "status", "Выдана")
+                book_tools.update_book(book_tools.get_book(3), "id", 10)
+                book_tools.remove_book(2)
+                book_tools.add_book("Анна Каренина", "Лев Толстой", "1877")
+                self.assertEqual(book_tools.get_status_counts(), {"В наличии": 1, "Выдана": 2})
+                self.assertEqual(self.get_ids(book_tools.get_books_by_status("Выдана")), [1, 10])
+                iter_books.assert_not_called()
+
+            # Массовое добавление перестраивает индекс
+            book_tools.add_books([("Идиот", "Фёдор Достоевский", "1869", "Выдана")])
+            self.assertEqual(book_tools.get_status_counts(), {"В наличии": 1, "Выдана": 3})
+
+    def test_stats_pages(self):
+        mock_router = Router(test_mode=True, storage=self.storages[0])
+        book_tools = mock_router.book_tools
+        book_tools.update_book(book_tools.get_book(2), "status", "Выдана")
+
+        output = io.StringIO()
+        with redirect_stdout(output), mock.patch("builtins.input", return_value="v"):
+            transition = mock_router.screens["i"].render()
+        self.assertIn("Всего книг: 3\nВ наличии: 2\nВыдана: 1", output.getvalue())
+        self.assertEqual(transition, ("v", {}))
+
+        # В списке выданных книг ввод id переводит на страницу книги
+        output = io.StringIO()
+        with redirect_stdout(output), mock.patch("builtins.input", return_value="2"):
+            screen_slug, kwargs = mock_router.screens["v"].render()
+        self.assertIn("Выдано книг: 1", output.getvalue())
+        self.assertIn("Мастер и Маргарита", output.getvalue())
+        self.assertEqual((screen_slug, kwargs["book_object"].id), ("b", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from storage import JsonStorage, iter_json_array
+
+
+class TestStreamingLoader(unittest.TestCase):
+    def test_iter_json_array(self):
+        # Проверяем разбор при любых границах фрагментов, в том числе посреди чисел и строк
+        data = [{"id": 1, "title": "Война и мир"}, 12345, "строка, с запятой ]", [1, [2]], None, 1.5e3]
+        text = json.dumps(data, ensure_ascii=False, indent=4)
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), data, chunk_size)
+
+        # Пустой массив и массив из пробелов
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ \n ] "), 1)), [])
+
+    def test_invalid_json(self):
+        # Проверяем что некорректный файл вызывает ошибку разбора
+        for text in ("", "{}", "[1, 2", "[1 2]", '[{"id": ]'):
+            with self.assertRaises(json.JSONDecodeError, msg=text):
+                list(iter_json_array(io.StringIO(text), 2))
+
+    def test_lazy_loading(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.json")
+            with open(file_path, "w", encoding="utf-8") as json_file:
+                json.dump([{"id": book_id, "title": f"Title {book_id}", "author": "Author", "year": "2000"}
+                           for book_id in range(1, 101)], json_file)
+
+            storage = JsonStorage(file_path)
+            storage.load()
+
+            # Первая страница загружает только свои книги
+            self.assertEqual([book.id for book in storage.get_page(0, 10)], list(range(1, 11)))
+            self.assertEqual(len(storage.books), 10)
+
+            # Получение книги дочитывает файл только до неё
+            self.assertEqual(storage.get_book(15).title, "Title 15")
+            self.assertEqual(len(storage.books), 15)
+
+            # Поиск и подсчёт дочитывают файл до конца
+            self.assertEqual([book.id for book in storage.search("Title 100", ["title"])], [100])
+            self.assertEqual(storage.count(), 100)
+            self.assertIsNone(storage.pending)
@@ -0,0 +1,47 @@
+import unittest
+from datetime import date
+
+from validators import FormValidator, validate_form_fields
+
+
+class TestValidators(unittest.TestCase):
+    def test_validate(self):
+        # Проверяем правила полей и тексты ошибок
+        self.assertEqual(validate_form_fields("title", "Valid Title"), (True, ""))
+        self.assertEqual(validate_form_fields("author", "Va"),
+                         (False, "\n--- Некорректный ввод: строка должна быть больше 2-х символов ---\n"))
+        self.assertFalse(validate_form_fields("id", "0")[0])
+        self.assertTrue(validate_form_fields("id", "12")[0])
+        self.assertTrue(validate_form_fields("status", "")[0])
+
+        # Символы, которые isdigit() считает цифрами, но int() не разбирает, - ошибка ввода, а не исключение
+        self.assertFalse(validate_form_fields("year", "²")[0])
+        self.assertFalse(validate_form_fields("id", "-1")[0])
+
+    def test_year_limit(self):
+        # По умолчанию максимальный год - текущий, его можно задать явно
+        current_year = date.today().year
+        self.assertTrue(validate_form_fields("year", str(current_year))[0])
+        self.assertFalse(validate_form_fields("year", str(current_year + 1))[0])
+
+        validator = FormValidator(max_year=1999)
+        self.assertTrue(validator.validate("year", "1999")[0])
+        self.assertEqual(validator.validate("year", "2000"),
+                         (False, "\n--- Некорректный ввод: год должен быть числом больше нуля, меньше 2000 ---\n"))
+
+    def test_validate_columns(self):
+        # Проверяем что маски ошибок по колонкам совпадают с проверкой по одному значению
+        columns = {
+            "title": ["Valid Title", "Ab", "", "Abc"],
+            "year": ["1999", "19x9", "3000", "0"],
+            "status": ["a", "b", "c", "d"],
+        }
+        validator = FormValidator(max_year=2024)
+        masks = validator.validate_columns(columns)
+        self.assertEqual(masks, {
+            "title": [False, True, True, False],
+            "year": [False, True, True, False],
+            "status": [False, False, False, False],
+        })
+        for field, values in columns.items():
+            self.assertEqual(masks[field], [not validator.validate(field, value)[0] for value in values])
@@ -1,24 +1,97 @@
-def validate_form_fields(field: str, value: str) -> tuple[bool, str]:
-    """  Валидация полей формы.
+from datetime import date
+from typing import Callable, Sequence
 
-        :param field: поле формы
-        :param value: проверяемое значение
+ID_ERROR = "\n--- Некорректный ввод: ID должен быть числом > 0 ---\n"
+TEXT_ERROR = "\n--- Некорректный ввод: строка должна быть больше 2-х символов ---\n"
+
+
+class FormValidator:
+    """  Валидатор полей формы по схеме: таблица поле -> (проверка, текст ошибки) собирается один раз при создании,
+        проверка значения - один поиск в словаре и один вызов функции, без цепочки сравнений названия поля.
+
+        - id: число > 0
+        - title, author: строка больше 2-х символов
+        - year: число от 0 до max_year, по умолчанию max_year - текущий год
+        - остальные поля не проверяются
+
+        Методы:
+        - :validate(): проверка одного значения
+        - :validate_column(): проверка колонки значений одного поля, возвращает маску ошибок по строкам
+        - :validate_columns(): проверка нескольких колонок, возвращает маски ошибок по полям
+    """
+    def __init__(self, max_year: int | None = None) -> None:
+        """ Инициализация и сборка таблицы правил.
+
+            :param max_year: максимальный год издания, по умолчанию - текущий год
+        """
+        self.max_year = date.today().year if max_year is None else max_year
+        self.rules = self.compile_rules()
+
+    def compile_rules(self) -> dict[str, tuple[Callable[[str], bool], str]]:
+        """  Таблица правил: поле -> (функция проверки значения, текст ошибки). Число разбирается не больше
+        одного раза: isdecimal() отсекает всё, что int() не разберёт.
         """
-    error = ""
+        max_year = self.max_year
+        year_error = f"\n--- Некорректный ввод: год должен быть числом больше нуля, меньше {max_year + 1} ---\n"
+
+        def check_id(value: str) -> bool:
+            return value.isdecimal() and int(value) > 0
 
-    if field == "id":
-        if not value.isdigit() or int(value) <= 0:
-            error = "\n--- Некорректный ввод: ID должен быть числом > 0 ---\n"
-            return False, error
+        def check_text(value: str) -> bool:
+            return len(value) >= 3
 
-    if field == "title" or field == "author":
-        if len(value) < 3:
-            error = "\n--- Некорректный ввод: строка должна быть больше 2-х символов ---\n"
-            return False, error
+        def check_year(value: str) -> bool:
+            return value.isdecimal() and int(value) <= max_year
+
+        return {
+            "id": (check_id, ID_ERROR),
+            "title": (check_text, TEXT_ERROR),
+            "author": (check_text, TEXT_ERROR),
+            "year": (check_year, year_error),
+        }
+
+    def validate(self, field: str, value: str) -> tuple[bool, str]:
+        """  Проверка одного значения. Возвращает (успех, текст ошибки).
+
+            :param field: поле формы
+            :param value: проверяемое значение
+        """
+        rule = self.rules.get(field)
+        if rule is None or rule[0](value):
+            return True, ""
+        return False, rule[1]
 
-    if field == "year":
-        if not value.isdigit() or int(value) < 0 or int(value) > 2024:
-            error = "\n--- Некорректный ввод: год должен быть числом больше нуля, меньше 2025 ---\n"
-            return False, error
+    def validate_column(self, field: str, values: Sequence[str]) -> list[bool]:
+        """  Проверка колонки значений одного поля. Возвращает маску ошибок: True - значение в строке некорректно.
 
-    return True, error
+            :param field: поле формы
+            :param values: значения поля по строкам
+        """
+        rule = self.rules.get(field)
+        if rule is None:
+            return [False] * len(values)
+        return [not valid for valid in map(rule[0], values)]
+
+    def validate_columns(self, columns: dict[str, Sequence[str]]) -> dict[str, list[bool]]:
+        """  Проверка нескольких колонок одинаковой длины. Возвращает маски ошибок по полям.
+
+            :param columns: поле -> значения поля по строкам
+        """
+        return {field: self.validate_column(field, values) for field, values in columns.items()}
+
+    def get_error(self, field: str) -> str:
+        """  Текст ошибки поля. """
+        rule = self.rules.get(field)
+        return rule[1] if rule else ""
+
+
+form_validator = FormValidator()
+
+
+def validate_form_fields(field: str, value: str) -> tuple[bool, str]:
+    """  Валидация полей формы.
+
+        :param field: поле формы
+        :param value: проверяемое значение
+        """
+    return form_validator.validate(field, value)